@@ -80,7 +80,7 @@ setup(
         'beautifulsoup4',
         'lxml',
         'numpy>=1.17',
-        'scipy',
+        'scipy>=1.9',
         'dask',
         'distributed',
         'networkx',
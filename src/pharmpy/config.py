@@ -2,6 +2,7 @@
 """
 
 import configparser
+import importlib
 import os
 from abc import ABC
 from pathlib import Path
@@ -50,6 +51,9 @@ def read_configuration():
 
 config_file = read_configuration()
 
+# NOTE All configuration objects keyed on the module and name of their class
+_configurations = {}
+
 
 class ConfigItem:
     def __init__(self, default, description, cls=None):
@@ -87,6 +91,8 @@ class Configuration(ABC):
     module: str
 
     def __init__(self):
+        cls = type(self)
+        _configurations[(cls.__module__, cls.__qualname__)] = self
         if user_config_file_enabled() and self.module in config_file.keys():
             for key, value in config_file[self.module].items():
                 setattr(self, key, value)
@@ -98,6 +104,33 @@ class Configuration(ABC):
         return settings
 
 
+def get_configuration_snapshot():
+    """Get the current options of all configurations
+
+    The snapshot can be used to give another process, e.g. a worker process, the same
+    configuration as this process, including options that were set at runtime.
+    """
+    return {key: vars(conf).copy() for key, conf in _configurations.items()}
+
+
+def set_configuration_snapshot(snapshot):
+    """Set the options of all configurations from a snapshot
+
+    See :func:`get_configuration_snapshot`. Configurations that cannot be found in
+    this process are skipped.
+    """
+    for (module, name), options in snapshot.items():
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            continue
+        conf = _configurations.get((module, name))
+        if conf is None:
+            continue
+        vars(conf).clear()
+        vars(conf).update(options)
+
+
 class ConfigurationContext:
     """Context to temporarily set configuration options"""
 
@@ -2,3 +2,6 @@ from pharmpy.internals.module.lazy import LazyImport
 
 stats = LazyImport('stats', globals(), 'scipy.stats')
 linalg = LazyImport('linalg', globals(), 'scipy.linalg')
+optimize = LazyImport('optimize', globals(), 'scipy.optimize')
+integrate = LazyImport('integrate', globals(), 'scipy.integrate')
+sparse = LazyImport('sparse', globals(), 'scipy.sparse')
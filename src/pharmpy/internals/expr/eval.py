@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import Mapping, Set
+from typing import Callable, Mapping, Sequence, Set
 
 from pharmpy.deps import numpy as np
 from pharmpy.deps import sympy
@@ -34,13 +34,23 @@ def _free_symbols(expr: sympy.Expr) -> Set[sympy.Symbol]:
 def _lambdify_canonical(expr: sympy.Expr):
     fs = _free_symbols(expr)
     ordered_symbols = sorted(fs, key=str)
+    fn = lambdify_with_arguments(expr, ordered_symbols)
+    return ordered_symbols, fn
+
+
+def lambdify_with_arguments(
+    expr: sympy.Expr, arguments: Sequence[sympy.Symbol]
+) -> Callable[..., np.ndarray]:
+    """Compile expression into a numpy function taking arguments in the given order
+
+    Symbols of arguments that are not part of expr are accepted and ignored.
+    """
     # NOTE Substitution allows to use cse. Otherwise weird things happen with
     # symbols that look like function eval (e.g. ETA(1), THETA(3), OMEGA(1,1)).
-    ordered_substitutes = [sympy.Symbol(f'__tmp{i}') for i in range(len(ordered_symbols))]
+    ordered_substitutes = [sympy.Symbol(f'__tmp{i}') for i in range(len(arguments))]
     substituted_expr = subs(
         expr,
-        dict(zip(ordered_symbols, ordered_substitutes)),
+        dict(zip(arguments, ordered_substitutes)),
         simultaneous=True,
     )
-    fn = sympy.lambdify(ordered_substitutes, substituted_expr, modules='numpy', cse=True)
-    return ordered_symbols, fn
+    return sympy.lambdify(ordered_substitutes, substituted_expr, modules='numpy', cse=True)
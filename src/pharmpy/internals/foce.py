@@ -0,0 +1,197 @@
+"""FOCE with interaction estimation of models that are cheap to evaluate
+
+The FOCE with interaction objective function value (without the constant term,
+as reported by NONMEM) is calculated for all individuals at once with numpy and
+minimized with scipy. The conditional modes of the ETAs are found with
+simultaneous Newton steps for all individuals using the expected information.
+
+A model is estimated by subclassing Objective with the model function of the
+observations given the ETAs, see Objective._individual.
+"""
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+from pharmpy.deps import numpy as np
+from pharmpy.deps.scipy import optimize
+
+MAX_NEWTON_ITERATIONS = 100
+MAX_STEP_HALVINGS = 30
+PRECISION_LOSS = 2
+
+
+def minimize(objective: Objective) -> Optional[Tuple[optimize.OptimizeResult, bool]]:
+    """Minimize an objective function starting from its initial estimates
+
+    Returns the result of the minimization and whether it was successful or None
+    if no finite objective function value was found.
+    """
+    res = optimize.minimize(objective, objective.x0, method='BFGS')
+    # NOTE BFGS reports a precision loss when the gradient is as small as the rounding
+    # errors of the objective function value allow
+    success = res.success or res.status == PRECISION_LOSS
+    if not success and np.isfinite(res.fun):
+        res = optimize.minimize(objective, res.x, method='Nelder-Mead')
+        success = res.success
+    if not np.isfinite(res.fun):
+        return None
+    return res, bool(success)
+
+
+class Objective:
+    """Objective function value as a function of the transformed free parameters
+
+    Free parameters are transformed to be unconstrained within their bounds and
+    variances to be positive. Raises ValueError if an initial estimate is not
+    within its bounds.
+
+    Subclasses implement _omega and _individual and set ids and eta_names.
+
+    Parameters
+    ----------
+    parameters : Parameters
+        All parameters of the model
+    variances : set
+        Names of the variance parameters
+    nids : int
+        Number of individuals
+    netas : int
+        Number of ETAs
+    free : set
+        Names of the parameters to estimate. Default is all parameters that are not fixed
+    """
+
+    def __init__(self, parameters, variances, nids: int, netas: int, free=None):
+        self.parameter_names = list(parameters.names)
+        self._values = np.array([float(p.init) for p in parameters], dtype=np.float64)
+        self._free = np.array(
+            [not p.fix and (free is None or p.name in free) for p in parameters], dtype=bool
+        )
+        self._transforms = []
+        for p, is_free in zip(parameters, self._free):
+            if not is_free:
+                continue
+            lower, upper = float(p.lower), float(p.upper)
+            if p.name in variances:
+                lower, upper = max(lower, 0.0), np.inf
+            if not lower < float(p.init) < upper:
+                raise ValueError(f'Initial estimate of {p.name} is not within its bounds')
+            self._transforms.append((lower, upper))
+        self.x0 = np.array(
+            [
+                _to_unconstrained(value, lower, upper)
+                for value, (lower, upper) in zip(self._values[self._free], self._transforms)
+            ]
+        )
+        self._nids = nids
+        self._netas = netas
+        self._eta = np.zeros((nids, netas))
+        self.evaluations = 0
+
+    def parameter_values(self, x):
+        values = self._values.copy()
+        values[self._free] = [
+            _from_unconstrained(u, lower, upper) for u, (lower, upper) in zip(x, self._transforms)
+        ]
+        return values
+
+    def __call__(self, x):
+        with np.errstate(all='ignore'):
+            ofv, _, _ = self.evaluate(self.parameter_values(x))
+        return ofv if np.isfinite(ofv) else np.inf
+
+    def evaluate(self, values):
+        """Objective function value, conditional modes of the ETAs and individual
+        objective function values"""
+        self.evaluations += 1
+        omega = self._omega(values)
+        if omega is None:
+            return np.inf, None, None
+        try:
+            np.linalg.cholesky(omega)
+        except np.linalg.LinAlgError:
+            return np.inf, None, None
+        omega_inv = np.linalg.inv(omega)
+
+        eta = self._initial_etas()
+        ofv_i, grad, info = self._posterior(values, eta, omega_inv)
+        active = np.full(self._nids, self._netas > 0)
+        for _ in range(MAX_NEWTON_ITERATIONS):
+            if not active.any():
+                break
+            try:
+                step = np.linalg.solve(info + omega_inv, grad[..., np.newaxis])[..., 0] / 2
+            except np.linalg.LinAlgError:
+                return np.inf, None, None
+            # NOTE Individuals with a negligible step are at their mode
+            active &= np.max(np.abs(step), axis=1) >= 1e-10
+            if not active.any():
+                break
+            step[~active] = 0
+            # NOTE Halve the step for individuals where the objective gets worse
+            t = np.ones(self._nids)
+            for _ in range(MAX_STEP_HALVINGS):
+                new_eta = eta - t[:, np.newaxis] * step
+                new = self._posterior(values, new_eta, omega_inv)
+                # NOTE Allow for rounding errors in the objective close to the mode
+                worse = active & ~(new[0] <= ofv_i + 1e-12 * np.abs(ofv_i))
+                if not worse.any():
+                    break
+                t[worse] /= 2
+            better = active & ~worse
+            eta[better] = new_eta[better]
+            ofv_i[better] = new[0][better]
+            grad[better] = new[1][better]
+            info[better] = new[2][better]
+            active &= ~worse
+
+        sign, logdet = np.linalg.slogdet(info + omega_inv)
+        if np.any(sign <= 0):
+            return np.inf, None, None
+        iofv = ofv_i + logdet + np.linalg.slogdet(omega)[1]
+        ofv = float(np.sum(iofv))
+        if np.isfinite(ofv):
+            self._eta = eta
+        return ofv, eta, iofv
+
+    def _initial_etas(self):
+        # NOTE Start from the modes of the previous evaluation as the parameters of
+        # consecutive evaluations are close
+        return self._eta.copy()
+
+    def _posterior(self, values, eta, omega_inv):
+        ofv_i, grad, info = self._individual(values, eta)
+        ofv_i = ofv_i + np.einsum('nk,kl,nl->n', eta, omega_inv, eta)
+        grad = grad + 2 * eta @ omega_inv
+        return ofv_i, grad, info
+
+    def _omega(self, values):
+        """Covariance matrix of the ETAs given the parameter values or None if the
+        values are not valid"""
+        raise NotImplementedError()
+
+    def _individual(self, values, eta):
+        """-2 log likelihood of the observations of each individual, its gradient
+        with respect to the ETAs and the expected information given the ETAs"""
+        raise NotImplementedError()
+
+
+def _to_unconstrained(x: float, lower: float, upper: float) -> float:
+    if np.isfinite(lower) and np.isfinite(upper):
+        p = (x - lower) / (upper - lower)
+        return float(np.log(p / (1 - p)))
+    elif np.isfinite(lower):
+        return float(np.log(x - lower))
+    elif np.isfinite(upper):
+        return float(np.log(upper - x))
+    return x
+
+
+def _from_unconstrained(u: float, lower: float, upper: float) -> float:
+    if np.isfinite(lower) and np.isfinite(upper):
+        return lower + (upper - lower) / (1 + np.exp(-u))
+    elif np.isfinite(lower):
+        return lower + np.exp(u)
+    elif np.isfinite(upper):
+        return upper - np.exp(u)
+    return u
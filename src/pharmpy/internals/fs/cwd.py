@@ -1,5 +1,9 @@
 import os
+import threading
 from contextlib import AbstractContextManager
+from pathlib import Path
+
+_thread = threading.local()
 
 
 class chdir(AbstractContextManager):
@@ -17,3 +21,29 @@ class chdir(AbstractContextManager):
 
     def __exit__(self, *excinfo):
         os.chdir(self._old_cwd.pop())
+
+
+class task_directory(AbstractContextManager):
+    """Thread-safe context manager to set the working directory of the current thread
+
+    Only :func:`working_directory` is affected, not the working directory of the
+    process.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._old_path = []
+
+    def __enter__(self):
+        self._old_path.append(getattr(_thread, 'path', None))
+        _thread.path = self.path
+
+    def __exit__(self, *excinfo):
+        _thread.path = self._old_path.pop()
+
+
+def working_directory() -> Path:
+    """Working directory of the current thread as set by :class:`task_directory` or
+    else the current working directory of the process"""
+    path = getattr(_thread, 'path', None)
+    return Path.cwd() if path is None else Path(path)
@@ -96,8 +96,14 @@ def se_delta_method(expr, values, cov):
 
 
 def is_positive_semidefinite(A):
-    """Checks whether a matrix is positive semi-definite"""
+    """Checks whether a matrix is positive semi-definite
+
+    A can also be a stack of matrices, i.e. have the shape (n, k, k), in which case
+    an array with the result for each matrix is returned.
+    """
     eigvals, _ = np.linalg.eig(A)
+    if eigvals.ndim > 1:
+        return np.all(eigvals >= 0, axis=-1)
     return all(eigvals >= 0)
 
 
@@ -119,7 +125,13 @@ def nearest_postive_semidefinite(A):
     [2] N.J. Higham, "Computing a nearest symmetric positive semidefinite
     matrix" (1988): https://doi.org/10.1016/0024-3795(88)90223-6
     [3] https://gist.github.com/fasiha/fdb5cec2054e6f1c6ae35476045a0bbd
+
+    A can also be a stack of matrices, i.e. have the shape (n, k, k), in which case
+    the nearest matrix is calculated for all of them in one go.
     """
+    if np.ndim(A) > 2:
+        return _nearest_positive_semidefinite_stack(A)
+
     # Check positive semidefinite instead of positive definite since it seems it can happen
     # that a matrix is deemed not positive semidefinite but positive definite, which causes
     # issues when validating and adjusting initial estimates
@@ -156,20 +168,51 @@ def nearest_postive_semidefinite(A):
     return A3
 
 
+def _nearest_positive_semidefinite_stack(A):
+    # NOTE Same as nearest_postive_semidefinite for each matrix of a stack
+    valid = is_positive_semidefinite(A)
+    if valid.all():
+        return A
+
+    X = A[~valid]
+    B = (X + np.swapaxes(X, -1, -2)) / 2
+    _, s, V = np.linalg.svd(B)
+
+    H = np.swapaxes(V, -1, -2) @ (s[..., np.newaxis] * V)
+    A2 = (B + H) / 2
+    A3 = (A2 + np.swapaxes(A2, -1, -2)) / 2
+
+    spacing = np.spacing(np.linalg.norm(X, axis=(-2, -1)))
+    Id = np.eye(A.shape[-1])
+    k = 1
+    invalid = ~is_positive_semidefinite(A3)
+    while invalid.any():
+        mineig = np.min(np.real(np.linalg.eigvals(A3[invalid])), axis=-1)
+        A3[invalid] += Id * (-mineig * k**2 + spacing[invalid])[:, np.newaxis, np.newaxis]
+        k += 1
+        invalid = ~is_positive_semidefinite(A3)
+
+    nearest = np.array(A, dtype=np.float64)
+    nearest[~valid] = A3
+    return nearest
+
+
 def conditional_joint_normal(mu, sigma, a):
     """Give parameters of the conditional joint normal distribution
 
-    The condition is the last len(a) values
+    The condition is the last len(a) values. sigma can also be a stack of
+    covariance matrices, i.e. have the shape (n, k, k), in which case the
+    parameters are calculated for all of them in one go.
 
     See https://en.wikipedia.org/wiki/Multivariate_normal_distribution#Conditional_distributions
     """
 
     # partition mu and sigma
     nfirst = len(mu) - len(a)
-    S11 = sigma[0:nfirst, 0:nfirst]
-    S12 = sigma[0:nfirst, nfirst:]
-    S21 = sigma[nfirst:, 0:nfirst]
-    S22 = sigma[nfirst:, nfirst:]
+    S11 = sigma[..., 0:nfirst, 0:nfirst]
+    S12 = sigma[..., 0:nfirst, nfirst:]
+    S21 = sigma[..., nfirst:, 0:nfirst]
+    S22 = sigma[..., nfirst:, nfirst:]
     M1 = mu[0:nfirst]
     M2 = mu[nfirst:]
 
@@ -184,10 +227,11 @@ def conditional_joint_normal(mu, sigma, a):
 
 def conditional_joint_normal_lambda(mu, sigma, n):
     # NOTE Same as conditional_joint_normal but for fixed mu, sigma, and len(a)
-    S11 = sigma[0:n, 0:n]
-    S12 = sigma[0:n, n:]
-    S21 = sigma[n:, 0:n]
-    S22 = sigma[n:, n:]
+    # a can be a single vector or one vector per row of a matrix
+    S11 = sigma[..., 0:n, 0:n]
+    S12 = sigma[..., 0:n, n:]
+    S21 = sigma[..., n:, 0:n]
+    S22 = sigma[..., n:, n:]
     M1 = mu[0:n]
     M2 = mu[n:]
 
@@ -197,7 +241,11 @@ def conditional_joint_normal_lambda(mu, sigma, n):
     sigma_bar = S11 - S12_at_S22_inv @ S21
 
     def _cjn_eval(a):
-        mu_bar = M1 + S12_at_S22_inv @ (a - M2)
+        if a.ndim == 1:
+            mu_bar = M1 + S12_at_S22_inv @ (a - M2)
+        else:
+            S = S12_at_S22_inv[..., np.newaxis, :, :]
+            mu_bar = M1 + (S @ (a - M2)[..., np.newaxis])[..., 0]
         return mu_bar, sigma_bar
 
     return _cjn_eval
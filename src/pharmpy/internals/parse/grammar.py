@@ -0,0 +1,111 @@
+"""Lazily built lark parsers with a persistent cache
+
+Building the LALR tables of a grammar is costly compared to parsing small
+inputs. Parsers are therefore only built when first used and the tables are
+stored on disk so that they can be reused by later Python processes. Cache
+files are keyed on the grammar, the parser options and the versions of lark,
+Pharmpy and Python so that stale tables are never used.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import appdirs
+import lark
+from lark import Lark
+
+import pharmpy
+from pharmpy.config import appname
+
+
+def grammar_cache_dir() -> Path:
+    """Directory of the persistent cache of parser tables"""
+    return Path(appdirs.user_cache_dir(appname)) / 'grammars'
+
+
+def _cache_key(path: Path, options: Dict[str, Any]) -> str:
+    h = sha256()
+    versions = (lark.__version__, pharmpy.__version__, *sys.version_info[:2])
+    h.update(repr(versions).encode('utf-8'))
+    h.update(repr(sorted(options.items())).encode('utf-8'))
+    h.update(path.name.encode('utf-8'))
+    # NOTE Grammars can import other grammars from the same directory
+    for grammar_path in sorted(path.parent.glob('*.lark')):
+        h.update(grammar_path.name.encode('utf-8'))
+        h.update(grammar_path.read_bytes())
+    return h.hexdigest()
+
+
+def load_grammar(path: Path, options: Dict[str, Any], cache_dir: Optional[Path] = None) -> Lark:
+    """Create a lark parser for a grammar file using the cache if possible
+
+    Parameters
+    ----------
+    path : Path
+        Path to grammar file
+    options : dict
+        Options to lark.Lark
+    cache_dir : Path
+        Directory of cache. Default is :func:`grammar_cache_dir`
+
+    Returns
+    -------
+    Lark
+        The parser
+    """
+    path = Path(path)
+    options = {**options, 'cache': False}
+    if cache_dir is None:
+        cache_dir = grammar_cache_dir()
+    cache_path = cache_dir / f'{path.stem}-{_cache_key(path, options)[:32]}.lark'
+
+    try:
+        with open(cache_path, 'rb') as fh:
+            return Lark.load(fh)
+    except Exception:  # NOTE A missing or broken cache file is simply replaced
+        pass
+
+    with open(path, 'r') as fh:
+        parser = Lark(fh, **options)
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as fh:
+            parser.save(fh)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # NOTE The cache is an optimization so an unwritable cache is not an error
+        pass
+
+    return parser
+
+
+class LazyGrammar:
+    """Class attribute building the parser of a grammar file on first access
+
+    Parameters
+    ----------
+    path : Path
+        Path to grammar file
+    options : dict
+        Options to lark.Lark
+    """
+
+    def __init__(self, path: Path, options: Dict[str, Any]):
+        self.path = path
+        self.options = options
+        self._parser: Optional[Lark] = None
+        self._lock = threading.Lock()
+
+    def __get__(self, instance, owner=None) -> Lark:
+        if self._parser is None:
+            with self._lock:
+                if self._parser is None:
+                    self._parser = load_grammar(self.path, self.options)
+        return self._parser
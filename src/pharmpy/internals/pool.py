@@ -0,0 +1,124 @@
+"""Pool of worker processes for CPU bound pure Python work
+
+Model transformations are pure Python and hold the GIL so that running them
+in the threads of a dask scheduler does not give any parallelism. Functions
+can instead be run in a pool of worker processes that is started on first use
+and kept alive for the rest of the session. Warnings issued by the function
+in the worker process are reissued in the calling process and the configuration
+of the calling process, including options set at runtime, is used in the worker.
+The pool is opt-in and the number of workers is set with the ``pool_workers``
+option of :mod:`pharmpy.workflows.dispatchers`. Worker processes are spawned and
+import the main module of the calling process, so scripts using the pool must
+guard their code with ``if __name__ == '__main__':``.
+
+Functions are called directly in the calling process if the pool is disabled, in
+processes that cannot have child processes, e.g. the daemonic worker processes of
+a multi-process dask cluster, and if the pool could not be started, e.g. in
+embedded interpreters.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, TypeVar
+
+from pharmpy.config import get_configuration_snapshot, set_configuration_snapshot
+
+T = TypeVar('T')
+
+_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+_registered = False
+_broken = False
+
+
+def available_cores() -> int:
+    """Number of cores available to the current process"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # NOTE Not available on Windows and macOS
+        return os.cpu_count() or 1
+
+
+def pool_size() -> int:
+    """Number of worker processes of the pool or 0 if the pool is disabled"""
+    from pharmpy.workflows.dispatchers import conf
+
+    return max(0, conf.pool_workers)
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool, _registered
+
+    if _broken or pool_size() == 0 or multiprocessing.current_process().daemon:
+        return None
+
+    with _lock:
+        if _pool is None:
+            # NOTE Forking a process running scheduler threads is not safe
+            context = multiprocessing.get_context('spawn')
+            _pool = ProcessPoolExecutor(max_workers=pool_size(), mp_context=context)
+            if not _registered:
+                atexit.register(shutdown)
+                _registered = True
+        return _pool
+
+
+def shutdown():
+    """Stop the worker processes
+
+    A new pool will be started the next time it is needed.
+    """
+    global _pool
+
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def _call(func, args, configuration):
+    # NOTE Workers are spawned and import pharmpy anew so options set at runtime in the
+    # calling process have to be applied
+    set_configuration_snapshot(configuration)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        res = func(*args)
+    return res, [(w.message, w.category) for w in caught]
+
+
+def run_in_pool(func: Callable[..., T], *args) -> T:
+    """Call a function in the process pool and wait for the result
+
+    Parameters
+    ----------
+    func : Callable
+        Function to call. It, the arguments and the result have to be picklable.
+    args
+        Arguments to func
+
+    Returns
+    -------
+    Any
+        Result of func(*args)
+    """
+    global _broken
+
+    pool = _get_pool()
+    if pool is None:
+        return func(*args)
+
+    try:
+        res, caught = pool.submit(_call, func, args, get_configuration_snapshot()).result()
+    except (BrokenProcessPool, OSError) as e:
+        warnings.warn(f'Could not use the process pool ({e}), running in the calling process')
+        _broken = True
+        shutdown()
+        return func(*args)
+    for message, category in caught:
+        warnings.warn(message, category)
+    return res
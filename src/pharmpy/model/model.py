@@ -19,6 +19,7 @@ from pathlib import Path
 
 from pharmpy.deps import pandas as pd
 from pharmpy.deps import sympy
+from pharmpy.internals.immutable import Immutable
 from pharmpy.plugins.utils import detect_model
 
 from .datainfo import ColumnInfo, DataInfo
@@ -311,6 +312,7 @@ class Model:
     @property
     def dataset(self):
         """Dataset connected to model"""
+        self._resolve_dataset()
         return self._dataset
 
     @dataset.setter
@@ -318,6 +320,12 @@ class Model:
         self._dataset = value
         self.update_datainfo()
 
+    def _resolve_dataset(self):
+        if callable(self.__dict__.get('_dataset')):
+            # NOTE The dataset is a reference to a dataset shared between processes. See
+            # pharmpy.workflows.dataset_registry
+            self._dataset = self._dataset()
+
     @property
     def initial_individual_estimates(self):
         """Initial estimates for individual parameters"""
@@ -393,8 +401,17 @@ class Model:
         self.datainfo = update_datainfo(curdi, self.dataset)
 
     def copy(self):
-        """Create a deepcopy of the model object"""
-        model_copy = copy.deepcopy(self)
+        """Create a copy of the model object
+
+        Immutable components, e.g. statements, parameters and random variables, are
+        shared between the model and its copy. All other attributes, including the
+        dataset, are deep copied.
+        """
+        model_copy = copy.copy(self)
+        memo = {}
+        for key, value in list(self.__dict__.items()):
+            if not isinstance(value, (Immutable, sympy.Basic, str)):
+                setattr(model_copy, key, copy.deepcopy(value, memo))
         try:
             model_copy.parent_model = self.name
         except AttributeError:
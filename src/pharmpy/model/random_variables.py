@@ -6,6 +6,7 @@ from itertools import chain, product
 from typing import Container, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union, overload
 
 from pharmpy.deps import numpy as np
+from pharmpy.deps import pandas as pd
 from pharmpy.deps import symengine, sympy
 from pharmpy.internals.expr.eval import eval_expr
 from pharmpy.internals.expr.parse import parse as parse_expr
@@ -632,9 +633,21 @@ class RandomVariables(CollectionsSequence, Immutable):
 
         As small changes as possible
 
-        returns a dict with the valid parameter values
+        returns a dict with the valid parameter values. If parameter_values is a DataFrame
+        with one set of parameter values per row a DataFrame is returned.
         """
         nearest = parameter_values.copy()
+        if isinstance(parameter_values, pd.DataFrame):
+            for symb_sigma, A in self._joint_covariance_matrices(parameter_values):
+                B = nearest_postive_semidefinite(A)
+                if B is not A:
+                    for row in range(symb_sigma.rows):
+                        for col in range(row + 1):
+                            elem = symb_sigma[row, col]
+                            if isinstance(elem, sympy.Symbol):
+                                nearest[elem.name] = B[:, row, col]
+            return nearest
+
         for dist in self._dists:
             if len(dist) > 1:
                 symb_sigma = dist.variance
@@ -652,7 +665,16 @@ class RandomVariables(CollectionsSequence, Immutable):
 
         Currently checks that all covariance matrices are positive semidefinite
         use_cache for using symengine cached matrices
+
+        A DataFrame with one set of parameter values per row can also be validated
+        in one go. A boolean Series with the result for each row is then returned.
         """
+        if isinstance(parameter_values, pd.DataFrame):
+            valid = np.ones(len(parameter_values), dtype=bool)
+            for _, A in self._joint_covariance_matrices(parameter_values):
+                valid &= is_positive_semidefinite(A)
+            return pd.Series(valid, index=parameter_values.index)
+
         for dist in self._dists:
             if isinstance(dist, JointNormalDistribution):
                 sigma = dist._symengine_variance
@@ -668,6 +690,26 @@ class RandomVariables(CollectionsSequence, Immutable):
                     raise TypeError("Cannot validate parameters since all are not numeric")
         return True
 
+    def _joint_covariance_matrices(self, parameter_values):
+        # Symbolic covariance matrix of each joint distribution together with a stack of the
+        # numeric matrices with one matrix per row of parameter_values
+        n = len(parameter_values)
+        datamap = {
+            sympy.Symbol(name): parameter_values[name].to_numpy(dtype=np.float64)
+            for name in parameter_values.columns
+        }
+        for dist in self._dists:
+            if isinstance(dist, JointNormalDistribution) and n > 0:
+                symb_sigma = dist.variance
+                A = np.empty((n, len(dist), len(dist)))
+                for row in range(len(dist)):
+                    for col in range(len(dist)):
+                        elem = symb_sigma[row, col]
+                        if not elem.free_symbols <= datamap.keys():
+                            raise TypeError("Cannot validate parameters since all are not numeric")
+                        A[:, row, col] = eval_expr(elem, n, datamap)
+                yield symb_sigma, A
+
     def sample(self, expr, parameters=None, samples=1, rng=None):
         """Sample from the distribution of expr
 
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, ABCMeta, abstractmethod
 from collections.abc import Sequence
-from typing import Iterable, List, Mapping, Optional, Set, Tuple, Union, overload
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union, overload
 
 import pharmpy.internals.unicode as unicode
 from pharmpy.deps import networkx as nx
@@ -1667,7 +1667,7 @@ class Infusion(Dose):
         return f'Infusion({self.amount}, {arg})'
 
 
-class Statements(Sequence):
+class Statements(Sequence, Immutable):
     """A sequence of symbolic statements describing the model
 
     Two types of statements are supported: Assignment and ODESystem.
@@ -1681,9 +1681,16 @@ class Statements(Sequence):
         A list of Statement or another Statements to populate this object
     """
 
+    # NOTE Names of attributes caching information derived from the statements. Since the
+    # statements never change these are computed at most once for each object.
+    _caches = ('_dependency_graph', '_last_assignment_index', '_full_expressions')
+
     def __init__(self, statements: Union[None, Statements, Iterable[Statement]] = None):
         if isinstance(statements, Statements):
             self._statements = statements._statements
+            for cache in self._caches:
+                if cache in statements.__dict__:
+                    setattr(self, cache, statements.__dict__[cache])
         elif statements is None:
             self._statements = ()
         else:
@@ -1866,18 +1873,28 @@ class Statements(Sequence):
         """
         return Statements(s.subs(substitutions) for s in self)
 
+    def _get_last_assignment_index(self) -> Dict[sympy.Expr, int]:
+        try:
+            return self._last_assignment_index
+        except AttributeError:
+            pass
+        index = {}
+        for i, statement in enumerate(self):
+            if isinstance(statement, Assignment):
+                index[statement.symbol] = i
+        self._last_assignment_index = index
+        return index
+
     def _lookup_last_assignment(
         self, symbol: Union[str, sympy.Symbol]
     ) -> Tuple[Optional[int], Optional[Assignment]]:
         if isinstance(symbol, str):
             symbol = sympy.Symbol(symbol)
-        ind = None
-        assignment = None
-        for i, statement in enumerate(self):
-            if isinstance(statement, Assignment):
-                if statement.symbol == symbol:
-                    ind = i
-                    assignment = statement
+        ind = self._get_last_assignment_index().get(symbol)
+        if ind is None:
+            return None, None
+        assignment = self[ind]
+        assert isinstance(assignment, Assignment)
         return ind, assignment
 
     def find_assignment(self, symbol: Union[str, sympy.Symbol]) -> Optional[Assignment]:
@@ -1965,19 +1982,32 @@ class Statements(Sequence):
         return Statements(new)
 
     def _create_dependency_graph(self):
-        """Create a graph of dependencies between statements"""
+        """Create a graph of dependencies between statements
+
+        There is an edge from each statement to all earlier statements defining
+        any of its right hand side symbols. The graph is created in one pass over
+        the statements and is cached. It must not be modified.
+        """
+        try:
+            return self._dependency_graph
+        except AttributeError:
+            pass
         graph = nx.DiGraph()
-        for i in range(len(self) - 1, -1, -1):
-            rhs = self[i].rhs_symbols
-            for j in range(i - 1, -1, -1):
-                statement = self[j]
-                if (
-                    isinstance(statement, Assignment)
-                    and statement.symbol in rhs
-                    or isinstance(statement, ODESystem)
-                    and not rhs.isdisjoint(statement.amounts)
-                ):
+        definitions: Dict[sympy.Expr, List[int]] = {}
+        odes: List[Tuple[int, Set[sympy.Expr]]] = []
+        for i, statement in enumerate(self):
+            rhs = statement.rhs_symbols
+            for symbol in rhs:
+                for j in definitions.get(symbol, ()):
                     graph.add_edge(i, j)
+            for j, amounts in odes:
+                if not rhs.isdisjoint(amounts):
+                    graph.add_edge(i, j)
+            if isinstance(statement, Assignment):
+                definitions.setdefault(statement.symbol, []).append(i)
+            elif isinstance(statement, ODESystem):
+                odes.append((i, set(statement.amounts)))
+        self._dependency_graph = graph
         return graph
 
     def direct_dependencies(self, statement):
@@ -2007,9 +2037,7 @@ class Statements(Sequence):
         g = self._create_dependency_graph()
         index = self.index(statement)
         succ = sorted(list(g.successors(index)))
-        stats = Statements()
-        stats._statements = [self[i] for i in succ]
-        return stats
+        return Statements(self[i] for i in succ)
 
     def dependencies(self, symbol_or_statement):
         """Find all dependencies of a symbol or statement
@@ -2128,15 +2156,33 @@ class Statements(Sequence):
         """
         if isinstance(expression, str):
             expression = parse_expr(expression)
+
+        try:
+            full_expressions = self._full_expressions
+        except AttributeError:
+            full_expressions = self._full_expressions = {}
+        try:
+            return full_expressions[expression]
+        except KeyError:
+            pass
+
+        original = expression
+        # NOTE Superset of the free symbols of the expression. Statements assigning other
+        # symbols would not change the expression and are skipped.
+        symbols = set(expression.free_symbols)
         for statement in reversed(self):
             if isinstance(statement, ODESystem):
                 raise ValueError(
                     "ODESystem not supported by full_expression. Use the properties before_odes "
                     "or after_odes."
                 )
-            expression = subs(
-                expression, {statement.symbol: statement.expression}, simultaneous=True
-            )
+            symbol = statement.symbol
+            if symbol in symbols or not isinstance(symbol, sympy.Symbol):
+                expression = subs(expression, {symbol: statement.expression}, simultaneous=True)
+                symbols.discard(symbol)
+                symbols.update(statement.expression.free_symbols)
+
+        full_expressions[original] = expression
         return expression
 
     def to_compartmental_system(self):
@@ -128,6 +128,7 @@ from .data import (
 )
 from .estimation import calculate_parameters_from_ucp, calculate_ucp_scale
 from .evaluation import (
+    create_model_evaluator,
     evaluate_epsilon_gradient,
     evaluate_eta_gradient,
     evaluate_expression,
@@ -181,6 +182,7 @@ from .results import (
     check_high_correlations,
     check_parameters_near_bounds,
 )
+from .simulation import evaluate_amounts
 from .units import get_unit_of
 from .update_inits import update_initial_individual_estimates, update_inits
 
@@ -225,12 +227,14 @@ __all__ = [
     'convert_model',
     'copy_model',
     'create_joint_distribution',
+    'create_model_evaluator',
     'create_report',
     'create_rng',
     'create_symbol',
     'deidentify_data',
     'drop_columns',
     'drop_dropped_columns',
+    'evaluate_amounts',
     'evaluate_epsilon_gradient',
     'evaluate_eta_gradient',
     'evaluate_expression',
@@ -608,24 +608,22 @@ def expand_additional_doses(model, flag=False):
         df['_RESETGROUP'] = df.groupby('ID')['_FLAG'].cumsum()
         df.drop('_FLAG', axis=1, inplace=True)
 
-    def fn(a):
-        if a[addl] == 0:
-            times = [a[idv]]
-            expanded = [False]
-        else:
-            length = int(a[addl])
-            times = [a[ii] * x + a[idv] for x in range(length + 1)]
-            expanded = [False] + [True] * length
-        a['_TIMES'] = times
-        a['_EXPANDED'] = expanded
-        return a
-
-    df = df.apply(fn, axis=1)
-    df = df.apply(lambda x: x.explode() if x.name in ['_TIMES', '_EXPANDED'] else x)
-    df = df.astype({'_EXPANDED': np.bool_})
-    df = df.groupby([idcol, '_RESETGROUP'], group_keys=False).apply(
-        lambda x: x.sort_values(by='_TIMES', kind='stable')
-    )
+    # NOTE Records have always been expanded one row at a time so all columns get the
+    # common type of the columns of the dataset
+    row_dtype = df.iloc[:0].to_numpy().dtype
+    if row_dtype == object:
+        df = df.astype(object).infer_objects()
+    else:
+        df = df.astype(row_dtype)
+
+    records, times, expanded = _expand_records(df[idv].to_numpy(), df[ii].to_numpy(), df[addl])
+    df = df.iloc[records].reset_index(drop=True)
+    df['_TIMES'] = times
+    df['_EXPANDED'] = expanded
+
+    group = _group_codes(df, [idcol, '_RESETGROUP'])
+    order = _sort_within_groups(group, _group_codes(df, ['_TIMES'], na_last=True), records)
+    df = df.iloc[order]
     df[idv] = df['_TIMES']
     df.drop(['_TIMES', '_RESETGROUP'], axis=1, inplace=True)
     if flag:
@@ -636,6 +634,64 @@ def expand_additional_doses(model, flag=False):
     return model
 
 
+def _expand_records(time, ii, addl):
+    # Repeat each record for its additional doses. Returns the index of the original record,
+    # the time and whether the record was added for each expanded record
+    addl = addl.to_numpy()
+    single = addl == 0
+    if pd.isna(addl[~single]).any():
+        raise ValueError('cannot convert float NaN to integer')
+    length = np.where(single, 0, np.trunc(addl.astype(np.float64))).astype(np.int64)
+    # NOTE Negative ADDL gives one record without time
+    missing = length < 0
+    counts = np.where(missing, 1, length + 1)
+    records = np.repeat(np.arange(len(addl)), counts)
+    starts = np.cumsum(counts) - counts
+    dosenum = np.arange(len(records)) - np.repeat(starts, counts)
+
+    times = np.empty(len(records), dtype=object)
+    times[:] = time[records]
+    repeated = ~single[records]
+    times[repeated] = ii[records[repeated]] * dosenum[repeated] + time[records[repeated]]
+    expanded = dosenum > 0
+    missing = missing[records]
+    times[missing] = np.nan
+    expanded[missing] = True
+    return records, times, expanded
+
+
+def _group_codes(df, columns, na_last=False):
+    # Codes of the groups in df.groupby(columns) in the sorted order of the groups. Rows with
+    # missing keys are not part of any group and get -1 unless na_last is set, in which case they
+    # are put last
+    codes = np.zeros(len(df), dtype=np.int64)
+    valid = np.ones(len(df), dtype=bool)
+    for col in columns:
+        col_codes, uniques = pd.factorize(df[col].infer_objects(), sort=True)
+        if na_last:
+            col_codes = np.where(col_codes < 0, len(uniques), col_codes)
+            n = len(uniques) + 1
+        else:
+            valid &= col_codes >= 0
+            n = len(uniques)
+        codes = codes * n + col_codes
+    codes[~valid] = -1
+    return codes
+
+
+def _sort_within_groups(group, key, records):
+    # Positions of rows in the order given by
+    # df.groupby(group, group_keys=False).apply(lambda x: x.sort_values(key, kind='stable'))
+    # where records is the index of the original row. As for apply, rows not in a group are
+    # dropped and the original order of the groups is kept if no group was reordered.
+    rows = np.flatnonzero(group >= 0)
+    grouped = rows[np.argsort(group[rows], kind='stable')]
+    ordered = rows[np.lexsort((key[rows], group[rows]))]
+    if np.array_equal(records[grouped], records[ordered]):
+        ordered = ordered[np.argsort(records[ordered], kind='stable')]
+    return ordered
+
+
 def get_doseid(model):
     """Get a DOSEID series from the dataset with an id of each dose period starting from 1
 
@@ -701,23 +757,49 @@ def get_doseid(model):
     idvcol = model.datainfo.idv_column.name
     ser = df.groupby([idcol, idvcol, '_RESETGROUP']).size()
     nonunique = ser[ser > 1]
-
-    for i, time, _ in nonunique.index:
-        groupind = df[(df[idcol] == i) & (df[idvcol] == time)].index
-        obsind = df[(df[idcol] == i) & (df[idvcol] == time) & (df[dose] == 0)].index
-        doseind = set(groupind) - set(obsind)
-        if not doseind:
-            continue
-        maxind = max(doseind)
-        for index in obsind:
-            if 0 in groupind:  # This is the first dose
-                continue
-            if maxind > index:  # Dose record is after the observation
-                continue
-            if ss and df.loc[maxind, ss] > 0:  # No swap for SS dosing
-                continue
-            curdoseid = df.loc[index, 'DOSEID']
-            df.loc[index, 'DOSEID'] = curdoseid - 1
+    if nonunique.empty:
+        return df['DOSEID'].copy()
+
+    # NOTE All records of an individual at a time point are handled once for each reset group
+    # having more than one record at that time point
+    moves = nonunique.groupby(level=[0, 1]).size()
+    keys = pd.MultiIndex.from_frame(df[[idcol, idvcol]].infer_objects())
+    moves = moves.reindex(keys).to_numpy()
+    rows = np.flatnonzero(moves > 0)
+    sub = df.iloc[rows]
+    timepoint = sub.groupby([idcol, idvcol], sort=False).ngroup().to_numpy()
+    ntimepoints = timepoint.max() + 1
+    labels = sub.index.to_numpy()
+    is_obs = (sub[dose] == 0).to_numpy()
+
+    first_dose = np.bincount(timepoint, weights=labels == 0, minlength=ntimepoints) > 0
+    doses = pd.DataFrame(
+        {
+            'timepoint': timepoint[~is_obs],
+            'label': labels[~is_obs],
+            'ss': sub[ss].to_numpy()[~is_obs] if ss else 0,
+        }
+    )
+    last_doses = doses.sort_values(['timepoint', 'label'], kind='stable').drop_duplicates(
+        'timepoint', keep='last'
+    )
+    has_dose = np.zeros(ntimepoints, dtype=bool)
+    has_dose[last_doses['timepoint']] = True
+    maxind = np.zeros(ntimepoints, dtype=labels.dtype)
+    maxind[last_doses['timepoint']] = last_doses['label']
+    ss_dose = np.zeros(ntimepoints, dtype=bool)
+    ss_dose[last_doses['timepoint']] = last_doses['ss'] > 0
+
+    move = (
+        is_obs
+        & has_dose[timepoint]
+        & ~first_dose[timepoint]  # This is the first dose
+        & ~(maxind[timepoint] > labels)  # Dose record is after the observation
+        & ~ss_dose[timepoint]  # No swap for SS dosing
+    )
+    doseid = df['DOSEID'].to_numpy().copy()
+    doseid[rows[move]] -= moves[rows[move]].astype(doseid.dtype)
+    df['DOSEID'] = doseid
 
     return df['DOSEID'].copy()
 
@@ -868,11 +950,10 @@ def add_time_after_dose(model):
     df['_DOSEID'] = get_doseid(temp)
 
     # Sort in case DOSEIDs are non-increasing
-    df = (
-        df.groupby(idlab)
-        .apply(lambda x: x.sort_values(by=['_DOSEID'], kind='stable', ignore_index=True))
-        .reset_index(drop=True)
-    )
+    group = _group_codes(df, [idlab])
+    rows = np.flatnonzero(group >= 0)
+    order = rows[np.lexsort((df['_DOSEID'].to_numpy()[rows], group[rows]))]
+    df = df.iloc[order].reset_index(drop=True)
 
     df['TAD'] = df.groupby([idlab, '_DOSEID'])['_NEWTIME'].diff().fillna(0)
     df['TAD'] = df.groupby([idlab, '_DOSEID'])['TAD'].cumsum()
@@ -889,20 +970,21 @@ def add_time_after_dose(model):
     except IndexError:
         pass
     else:
-
-        def fn(df):
-            if len(df) < 2:
-                return df
-            ii_time = None
-            for i in df.index:
-                if df.loc[i, ss] > 0:
-                    ii_time = df.loc[i, ii]
-                else:
-                    assert ii_time is not None
-                    df.loc[i, 'TAD'] = ii_time
-            return df
-
-        df = df.groupby([idlab, idv, '_DOSEID'], group_keys=False).apply(fn)
+        group = _group_codes(df, [idlab, idv, '_DOSEID'])
+        if (group < 0).any():
+            df = df[group >= 0].copy()
+            group = group[group >= 0]
+        size = np.bincount(group)[group]
+        is_ss = (df[ss] > 0).to_numpy()
+        # NOTE Position of the latest SS dose in the group
+        ss_pos = np.where(is_ss, np.arange(len(df)), -1)
+        ss_pos = pd.Series(ss_pos).groupby(group).cummax().to_numpy()
+        rows = np.flatnonzero((size >= 2) & ~is_ss)
+        assert (ss_pos[rows] >= 0).all()
+        if len(rows) > 0:
+            tad = df['TAD'].copy()
+            tad.iloc[rows] = df[ii].to_numpy()[ss_pos[rows]]
+            df['TAD'] = tad
 
     df.drop(columns=['_NEWTIME', '_DOSEID'], inplace=True)
 
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from typing import List, Mapping, Optional, Union
+from typing import Dict, List, Mapping, Optional, Union
 
 from pharmpy.deps import numpy as np
 from pharmpy.deps import pandas as pd
 from pharmpy.deps import sympy
 from pharmpy.deps.scipy import linalg
-from pharmpy.internals.expr.eval import eval_expr
+from pharmpy.internals.expr.eval import eval_expr, lambdify_with_arguments
 from pharmpy.internals.expr.parse import parse as parse_expr
 from pharmpy.internals.expr.subs import subs
 from pharmpy.model import Model
@@ -103,7 +103,8 @@ def evaluate_population_prediction(
     The evaluation is done for each data record in the model dataset
     or optionally using the dataset argument.
 
-    This function currently only support models without ODE systems
+    For models with ODE systems the amounts are evaluated with
+    :func:`evaluate_amounts`.
 
     Parameters
     ----------
@@ -141,7 +142,12 @@ def evaluate_population_prediction(
     See also
     --------
     evaluate_individual_prediction : Evaluate the individual prediction
+    evaluate_amounts : Evaluate the amounts of the ODE system
     """
+    if model.statements.ode_system is not None:
+        pred = _evaluate_ode_prediction(model, parameters, None, dataset)
+        return pd.Series(pred, name='PRED')
+
     y = get_population_prediction_expression(model)
     mapping = model.parameters.inits if parameters is None else parameters
     expr = subs(y, mapping)
@@ -167,7 +173,8 @@ def evaluate_individual_prediction(
     The evaluation is done at the current eta values
     or optionally at the given eta values.
 
-    This function currently only support models without ODE systems
+    For models with ODE systems the amounts are evaluated with
+    :func:`evaluate_amounts`.
 
     Parameters
     ----------
@@ -207,7 +214,12 @@ def evaluate_individual_prediction(
     See also
     --------
     evaluate_population_prediction : Evaluate the population prediction
+    evaluate_amounts : Evaluate the amounts of the ODE system
     """
+    if model.statements.ode_system is not None:
+        etas = _default_etas(model, model.dataset if dataset is None else dataset, etas)
+        ipred = _evaluate_ode_prediction(model, parameters, etas, dataset)
+        return pd.Series(ipred, name='IPRED')
 
     y = get_individual_prediction_expression(model)
     mapping = model.parameters.inits if parameters is None else parameters
@@ -217,15 +229,7 @@ def evaluate_individual_prediction(
 
     idcol = model.datainfo.id_column.name
 
-    _etas = (
-        pd.DataFrame(
-            0,
-            index=df[idcol].unique(),
-            columns=model.random_variables.etas.names,
-        )
-        if etas is None
-        else etas
-    )
+    _etas = _default_etas(model, df, etas)
 
     _df = df.join(_etas, on=idcol)
 
@@ -233,6 +237,40 @@ def evaluate_individual_prediction(
     return pd.Series(ipred, name='IPRED')
 
 
+def _default_etas(model: Model, df: pd.DataFrame, etas: Optional[pd.DataFrame]):
+    if etas is not None:
+        return etas
+    idcol = model.datainfo.id_column.name
+    return pd.DataFrame(0, index=df[idcol].unique(), columns=model.random_variables.etas.names)
+
+
+def _evaluate_ode_prediction(
+    model: Model,
+    parameters: Optional[ParameterMap],
+    etas: Optional[pd.DataFrame],
+    dataset: Optional[pd.DataFrame],
+):
+    # Prediction of a model with an ODE system from the evaluated amounts. Without etas
+    # this is the population prediction.
+    from .simulation import evaluate_amounts
+
+    df = model.dataset if dataset is None else dataset
+    statements = model.statements
+    y = statements.after_odes.full_expression(model.dependent_variable)
+    y = statements.before_odes.full_expression(y)
+    rvs = model.random_variables
+    zero = rvs.epsilons.names if etas is not None else rvs.epsilons.names + rvs.etas.names
+    y = subs(y, {sympy.Symbol(name): 0 for name in zero}, simultaneous=True)
+    mapping = model.parameters.inits if parameters is None else parameters
+    y = subs(y, mapping)
+
+    amounts = evaluate_amounts(model, parameters=parameters, etas=etas, dataset=df)
+    _df = df.join(amounts)
+    if etas is not None:
+        _df = _df.join(etas, on=model.datainfo.id_column.name)
+    return eval_expr(y, len(_df), DataFrameMapping(_df))
+
+
 def _replace_parameters(model: Model, y: List[sympy.Expr], parameters: Optional[ParameterMap]):
     mapping = model.parameters.inits if parameters is None else parameters
     return [subs(x, mapping) for x in y]
@@ -497,3 +535,239 @@ def evaluate_weighted_residuals(
         WRES = np.concatenate((WRES, WRESi))
 
     return pd.Series(WRES, name='WRES')
+
+
+class ModelEvaluator:
+    """Compiled numerical evaluator of model predictions and gradients
+
+    All expressions are derived and compiled only once with the population
+    parameters, the etas and the needed data columns kept as arguments.
+    Evaluation can then be done for a single parameter vector or for a
+    matrix of parameter vectors in one vectorized call.
+
+    Create using :func:`create_model_evaluator`.
+    """
+
+    def __init__(self, model: Model, dataset: Optional[pd.DataFrame] = None):
+        df = model.dataset if dataset is None else dataset
+        idcol = model.datainfo.id_column.name
+        self._parameter_names = model.parameters.names
+        self._inits = model.parameters.inits
+        self._eta_names = model.random_variables.etas.names
+        self._eps_names = model.random_variables.epsilons.names
+        ids, self._id_index = np.unique(df[idcol].to_numpy(), return_inverse=True)
+        self._ids = pd.Index(ids, name=idcol)
+        self._size = len(df)
+        self._df = df
+        self._model = model
+        self._compiled: Dict[str, list] = {}
+
+    @property
+    def parameter_names(self) -> List[str]:
+        """Names of population parameters in the order used for parameter arrays"""
+        return self._parameter_names
+
+    def _expressions(self, kind: str) -> List[sympy.Expr]:
+        if kind == 'pred':
+            return [get_population_prediction_expression(self._model)]
+        elif kind == 'ipred':
+            return [get_individual_prediction_expression(self._model)]
+        elif kind == 'eta_gradient':
+            return calculate_eta_gradient_expression(self._model)
+        else:
+            repl = {sympy.Symbol(eps): 0 for eps in self._eps_names}
+            return [subs(x, repl) for x in calculate_epsilon_gradient_expression(self._model)]
+
+    def _compile(self, kind: str):
+        if kind not in self._compiled:
+            exprs = self._expressions(kind)
+            known = set(self._parameter_names).union(self._eta_names)
+            columns = sorted({symb.name for expr in exprs for symb in expr.free_symbols} - known)
+            arguments = [
+                sympy.Symbol(name) for name in (*self._parameter_names, *self._eta_names, *columns)
+            ]
+            fns = [lambdify_with_arguments(expr, arguments) for expr in exprs]
+            data = [self._df[col].to_numpy() for col in columns]
+            self._compiled[kind] = [fns, data]
+        return self._compiled[kind]
+
+    def _parameter_matrix(self, parameters) -> np.ndarray:
+        names = self._parameter_names
+        if parameters is None:
+            return np.array([[self._inits[name] for name in names]])
+        if isinstance(parameters, pd.DataFrame):
+            filled = parameters.reindex(columns=names)
+            for name in names:
+                if name not in parameters.columns:
+                    filled[name] = self._inits[name]
+            return filled.to_numpy(dtype=np.float64)
+        if isinstance(parameters, np.ndarray):
+            a = np.atleast_2d(np.asarray(parameters, dtype=np.float64))
+            if a.shape[1] != len(names):
+                raise ValueError(
+                    f'Expected {len(names)} parameter values per vector, got {a.shape[1]}'
+                )
+            return a
+        mapping = {**self._inits, **{str(key): value for key, value in parameters.items()}}
+        return np.array([[float(mapping[name]) for name in names]])
+
+    def _eta_columns(self, etas) -> List[np.ndarray]:
+        if etas is None:
+            return [np.zeros(self._size) for _ in self._eta_names]
+        if isinstance(etas, pd.DataFrame):
+            etas = etas.reindex(index=self._ids, columns=self._eta_names, fill_value=0.0)
+            etas = etas.to_numpy(dtype=np.float64)
+        etas = np.asarray(etas, dtype=np.float64)
+        return [etas[self._id_index, i] for i in range(len(self._eta_names))]
+
+    def _evaluate(self, kind: str, parameters, etas) -> np.ndarray:
+        fns, data = self._compile(kind)
+        params = self._parameter_matrix(parameters)
+        m = params.shape[0]
+        param_args = [params[:, i : i + 1] for i in range(params.shape[1])]
+        args = [*param_args, *self._eta_columns(etas), *data]
+        shape = (m, self._size)
+        results = [np.broadcast_to(np.asarray(fn(*args), dtype=np.float64), shape) for fn in fns]
+        return np.stack(results, axis=-1)
+
+    @staticmethod
+    def _is_batch(parameters) -> bool:
+        return isinstance(parameters, pd.DataFrame) or (
+            isinstance(parameters, np.ndarray) and parameters.ndim == 2
+        )
+
+    def population_prediction(self, parameters=None):
+        """Evaluate the population prediction
+
+        Parameters
+        ----------
+        parameters : dict, pd.Series, np.ndarray or pd.DataFrame
+            Parameter values. A mapping or a 1-dimensional array gives one parameter
+            vector, a 2-dimensional array or a DataFrame gives one parameter vector per row.
+            Parameters not given are taken from the initial estimates.
+
+        Returns
+        -------
+        pd.Series or np.ndarray
+            Predictions for each data record or an array of shape
+            (number of parameter vectors, number of data records)
+        """
+        res = self._evaluate('pred', parameters, None)[..., 0]
+        if self._is_batch(parameters):
+            return res
+        return pd.Series(res[0], name='PRED')
+
+    def individual_prediction(self, parameters=None, etas=None):
+        """Evaluate the individual prediction
+
+        Parameters
+        ----------
+        parameters : dict, pd.Series, np.ndarray or pd.DataFrame
+            Parameter values. See :meth:`population_prediction`
+        etas : pd.DataFrame
+            Eta values for each individual. Default is all etas zero
+
+        Returns
+        -------
+        pd.Series or np.ndarray
+            Predictions for each data record or an array of shape
+            (number of parameter vectors, number of data records)
+        """
+        res = self._evaluate('ipred', parameters, etas)[..., 0]
+        if self._is_batch(parameters):
+            return res
+        return pd.Series(res[0], name='IPRED')
+
+    def eta_gradient(self, parameters=None, etas=None):
+        """Evaluate the eta gradient
+
+        Parameters
+        ----------
+        parameters : dict, pd.Series, np.ndarray or pd.DataFrame
+            Parameter values. See :meth:`population_prediction`
+        etas : pd.DataFrame
+            Eta values for each individual. Default is all etas zero
+
+        Returns
+        -------
+        pd.DataFrame or np.ndarray
+            Gradient for each data record or an array of shape
+            (number of parameter vectors, number of data records, number of etas)
+        """
+        res = self._evaluate('eta_gradient', parameters, etas)
+        if self._is_batch(parameters):
+            return res
+        return pd.DataFrame(res[0], columns=[f'dF/d{eta}' for eta in self._eta_names])
+
+    def epsilon_gradient(self, parameters=None, etas=None):
+        """Evaluate the epsilon gradient
+
+        Parameters
+        ----------
+        parameters : dict, pd.Series, np.ndarray or pd.DataFrame
+            Parameter values. See :meth:`population_prediction`
+        etas : pd.DataFrame
+            Eta values for each individual. Default is all etas zero
+
+        Returns
+        -------
+        pd.DataFrame or np.ndarray
+            Gradient for each data record or an array of shape
+            (number of parameter vectors, number of data records, number of epsilons)
+        """
+        res = self._evaluate('epsilon_gradient', parameters, etas)
+        if self._is_batch(parameters):
+            return res
+        return pd.DataFrame(res[0], columns=[f'dY/d{eps}' for eps in self._eps_names])
+
+
+def create_model_evaluator(model: Model, dataset: Optional[pd.DataFrame] = None):
+    """Create a compiled evaluator for predictions and gradients of a model
+
+    Expressions are derived and compiled once. The evaluator can then be called
+    repeatedly with different parameter values, or with a matrix of parameter
+    vectors, without redoing any symbolic manipulations.
+
+    This function currently only support models without ODE systems
+
+    Parameters
+    ----------
+    model : Model
+        Pharmpy model
+    dataset : pd.DataFrame
+        Optional dataset
+
+    Returns
+    -------
+    ModelEvaluator
+        Evaluator object
+
+    Examples
+    --------
+    >>> from pharmpy.modeling import load_example_model, create_model_evaluator
+    >>> model = load_example_model("pheno_linear")
+    >>> evaluator = create_model_evaluator(model)
+    >>> pe = model.modelfit_results.parameter_estimates
+    >>> evaluator.population_prediction(pe)
+    0      17.529739
+    1      28.179910
+    2       9.688648
+    3      17.798916
+    4      25.023225
+             ...
+    150    22.459036
+    151    29.223295
+    152    20.217288
+    153    28.472888
+    154    34.226455
+    Name: PRED, Length: 155, dtype: float64
+    >>> import pandas as pd
+    >>> evaluator.population_prediction(pd.DataFrame([pe, pe * 1.1])).shape
+    (2, 155)
+
+    See also
+    --------
+    evaluate_population_prediction : Evaluate the population prediction
+    evaluate_individual_prediction : Evaluate the individual prediction
+    """
+    return ModelEvaluator(model, dataset=dataset)
@@ -203,6 +203,7 @@ class Resample(DatasetIterator):
 
         self._df = df
         self._group = group
+        self._groups, self._order, self._offsets = group_row_positions(df, group)
         self._replace = replace
         self._stratas = stratas
         self._sample_size_dict = sample_size_dict
@@ -225,13 +226,9 @@ class Resample(DatasetIterator):
                 self._stratas[strata], size=self._sample_size_dict[strata], replace=self._replace
             ).tolist()
 
-        new_df = pd.DataFrame()
         # Build the dataset given the random_groups list
-        for grp_id, new_grp in zip(random_groups, range(1, len(random_groups) + 1)):
-            sub = self._df.loc[self._df[self._group] == grp_id].copy()
-            sub[self._group] = new_grp
-            new_df = pd.concat([new_df, sub])
-        new_df.reset_index(inplace=True, drop=True)
+        sample = pd.Index(self._groups).get_indexer(random_groups)
+        new_df = create_resampled_dataset(self._df, self._group, self._order, self._offsets, sample)
         if self._name:
             new_df.name = self._name
         else:
@@ -240,6 +237,66 @@ class Resample(DatasetIterator):
         return self._combine_dataset(new_df), random_groups
 
 
+def group_row_positions(df, group):
+    """Group the rows of a dataset
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataset
+    group : str
+        Name of column to group by
+
+    Returns
+    -------
+    tuple
+        Array of the groups in order of first appearance, array of row positions
+        ordered by group and array of offsets into the row positions for each group
+        (with one extra element at the end)
+    """
+    codes, groups = pd.factorize(df[group])
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes, minlength=len(groups))
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    return np.asarray(groups), order, offsets
+
+
+def create_resampled_dataset(df, group, order, offsets, sample):
+    """Create a dataset from a sample of groups
+
+    The groups will be renumbered from 1 and upwards in the order of the sample.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataset
+    group : str
+        Name of column to group by
+    order : np.ndarray
+        Row positions ordered by group as given by group_row_positions
+    offsets : np.ndarray
+        Offsets of each group into order as given by group_row_positions
+    sample : np.ndarray
+        Positions of the sampled groups
+
+    Returns
+    -------
+    pd.DataFrame
+        New dataset
+    """
+    sample = np.asarray(sample, dtype=np.int64)
+    starts = offsets[sample]
+    lengths = offsets[sample + 1] - starts
+    ends = np.cumsum(lengths)
+    positions = np.arange(ends[-1] if len(ends) else 0) - np.repeat(
+        ends - lengths - starts, lengths
+    )
+    new_df = df.take(order[positions])
+    new_df[group] = np.repeat(np.arange(1, len(sample) + 1), lengths)
+    new_df.reset_index(inplace=True, drop=True)
+    return new_df
+
+
 def resample_data(
     dataset_or_model,
     group,
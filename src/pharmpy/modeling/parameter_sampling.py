@@ -5,6 +5,9 @@ from pharmpy.deps import numpy as np
 from pharmpy.deps import pandas as pd
 from pharmpy.internals.math import is_posdef, nearest_postive_semidefinite
 
+# NOTE Maximum number of samples to draw at a time when sampling individual estimates
+_SAMPLE_CHUNK_SIZE = 100000
+
 
 def create_rng(seed=None):
     """Create a new random number generator
@@ -98,11 +101,11 @@ def _sample_from_function(
     while remaining > 0:
         samples = samplingfn(pe, lower, upper, n=remaining, rng=rng)
         df = pd.DataFrame(samples, columns=parameter_estimates.index)
+        rvs = model.random_variables
         if not force_posdef:
-            selected = df[df.apply(model.random_variables.validate_parameters, axis=1)]
+            selected = df[rvs.validate_parameters(df)]
         else:
-            rvs = model.random_variables
-            selected = df.transform(lambda row: rvs.nearest_valid_parameters(row), axis=1)
+            selected = rvs.nearest_valid_parameters(df)
         kept_samples = pd.concat((kept_samples, selected))
         remaining = n - len(kept_samples)
         i += 1
@@ -320,14 +323,38 @@ def sample_individual_estimates(
     if parameters is None:
         parameters = ests.columns
     ests = ests[parameters]
-    samples = pd.DataFrame()
-    for (idx, mu), sigma in zip(ests.iterrows(), covs):
-        sigma = sigma.loc[parameters, parameters]
-        sigma = nearest_postive_semidefinite(sigma)
-        id_samples = rng.multivariate_normal(mu.values, sigma.values, size=samples_per_id)
-        id_df = pd.DataFrame(id_samples, columns=ests.columns)
-        id_df['ID'] = idx
-        id_df['sample'] = list(range(0, samples_per_id))
-        id_df.set_index(['ID', 'sample'], drop=True, inplace=True)
-        samples = pd.concat((samples, id_df))
+    if len(ests) == 0:
+        return pd.DataFrame()
+    sigma = np.stack(
+        [
+            cov.loc[parameters, parameters].to_numpy(dtype=np.float64)
+            for _, cov in zip(ests.index, covs)
+        ]
+    )
+    sigma = nearest_postive_semidefinite(sigma)
+    samples = _sample_joint_normals(ests.to_numpy(dtype=np.float64), sigma, samples_per_id, rng)
+    index = pd.MultiIndex.from_product([ests.index, range(samples_per_id)], names=['ID', 'sample'])
+    return pd.DataFrame(samples.reshape(-1, len(ests.columns)), index=index, columns=ests.columns)
+
+
+def _sample_joint_normals(mu, sigma, n, rng):
+    """Sample from one joint normal distribution for each row of mu and matrix of sigma
+
+    Gives the same samples as calling rng.multivariate_normal(mu[i], sigma[i], size=n) for
+    each i in turn, but the samples for all distributions are drawn in chunks.
+    """
+    _, s, vh = np.linalg.svd(sigma)
+    factor = np.sqrt(s)[..., np.newaxis] * vh
+    k = mu.shape[1]
+    samples = np.empty((len(mu), n, k))
+    dists_per_chunk = max(_SAMPLE_CHUNK_SIZE // max(n, 1), 1)
+    for first in range(0, len(mu), dists_per_chunk):
+        last = min(first + dists_per_chunk, len(mu))
+        # NOTE If one distribution needs more samples than a chunk it is sampled in parts
+        for start in range(0, n, _SAMPLE_CHUNK_SIZE):
+            stop = min(start + _SAMPLE_CHUNK_SIZE, n)
+            x = rng.standard_normal((last - first, stop - start, k))
+            x = x @ factor[first:last]
+            x += mu[first:last, np.newaxis, :]
+            samples[first:last, start:stop] = x
     return samples
@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from pharmpy.deps import numpy as np
+from pharmpy.deps import pandas as pd
+from pharmpy.deps import sympy
+from pharmpy.deps.scipy import integrate, linalg, sparse
+from pharmpy.internals.expr.eval import eval_expr, lambdify_with_arguments
+from pharmpy.internals.expr.subs import subs
+from pharmpy.model import CompartmentalSystem, Infusion, Model
+
+from .evaluation import DataFrameMapping, ParameterMap
+
+RTOL = 1e-8
+ATOL = 1e-10
+
+
+def evaluate_amounts(
+    model: Model,
+    parameters: Optional[ParameterMap] = None,
+    etas: Optional[pd.DataFrame] = None,
+    dataset: Optional[pd.DataFrame] = None,
+):
+    """Evaluate the amounts in the compartments of the ODE system
+
+    The amounts are evaluated at the time of each data record for all individuals
+    at once. Amounts at dose records include the dose if it has no lag time.
+    Linear systems are solved with matrix exponentials. Systems that depend on
+    the amounts or on time, e.g. with Michaelis-Menten elimination, are solved
+    with a stiff ODE solver.
+
+    Parameters in the ODE system are evaluated at each data record and are used
+    for the time from the previous event up to the record, as in NONMEM.
+    Additional doses and resets of the system (EVID 3 and 4) are supported but
+    steady state doses are not.
+
+    Parameters
+    ----------
+    model : Model
+        Pharmpy model
+    parameters : dict
+        Optional dictionary of parameters and values
+    etas : pd.DataFrame
+        Optional eta values for each individual. Default is all etas zero
+    dataset : pd.DataFrame
+        Optional dataset
+
+    Returns
+    -------
+    pd.DataFrame
+        Amounts of all compartments for each data record
+
+    Examples
+    --------
+    >>> from pharmpy.modeling import load_example_model, evaluate_amounts
+    >>> model = load_example_model("pheno")
+    >>> pe = model.modelfit_results.parameter_estimates
+    >>> etas = model.modelfit_results.individual_estimates
+    >>> evaluate_amounts(model, parameters=dict(pe), etas=etas)
+         A_CENTRAL   A_OUTPUT
+    0    25.000000   0.000000
+    1    24.773968   0.226032
+    2    27.120402   1.379598
+    3    29.182039   2.817961
+    4    31.071659   4.428341
+    ..         ...        ...
+    739  35.092588  14.707412
+    740  36.071454  16.728546
+    741  37.060123  18.739877
+    742  37.874762  20.925238
+    743  37.508234  21.291766
+    <BLANKLINE>
+    [744 rows x 2 columns]
+
+    See also
+    --------
+    evaluate_population_prediction : Evaluate the population prediction
+    evaluate_individual_prediction : Evaluate the individual prediction
+    """
+    ode = model.statements.ode_system
+    if ode is None:
+        raise ValueError('Model has no ODE system')
+    if not isinstance(ode, CompartmentalSystem):
+        ode = ode.to_compartmental_system()
+    assert isinstance(ode, CompartmentalSystem)
+
+    df = model.dataset if dataset is None else dataset
+    mapping = model.parameters.inits if parameters is None else parameters
+    data = _join_etas(model, df, etas)
+    system = _System(model, ode, mapping, data)
+    events = _events(model, df, system)
+    amounts = _solve(system, events, len(df))
+    return pd.DataFrame(amounts, index=df.index, columns=system.amount_names)
+
+
+def _join_etas(model: Model, df: pd.DataFrame, etas: Optional[pd.DataFrame]):
+    idcol = model.datainfo.id_column.name
+    if etas is None:
+        etas = pd.DataFrame(0, index=df[idcol].unique(), columns=model.random_variables.etas.names)
+    return df.join(etas, on=idcol)
+
+
+class _System:
+    """The compartmental matrix and the doses evaluated at each data record"""
+
+    def __init__(self, model: Model, ode: CompartmentalSystem, mapping, data: pd.DataFrame):
+        amounts = list(ode.amounts)
+        t = ode.t
+        functions = {sympy.Function(amount.name)(t): amount for amount in amounts}
+        matrix = ode.compartmental_matrix.xreplace(functions)
+
+        dosing = ode.dosing_compartment
+        dose = dosing.dose
+        self.amount_names = [amount.name for amount in amounts]
+        self.size = len(amounts)
+        self.dose_index = ode.compartment_names.index(dosing.name)
+        self.nonlinear = bool(matrix.free_symbols & (set(amounts) | {t}))
+
+        exprs = {
+            'amount': dose.amount,
+            'lag_time': dosing.lag_time,
+            'bioavailability': dosing.bioavailability,
+        }
+        self.infusion = isinstance(dose, Infusion)
+        if self.infusion:
+            if dose.rate is not None:
+                exprs['rate'] = dose.rate
+            else:
+                exprs['duration'] = dose.duration
+
+        symbols = set(matrix.free_symbols) - set(amounts) - {t}
+        for expr in exprs.values():
+            symbols |= sympy.sympify(expr).free_symbols
+        self._symbols = sorted(symbols, key=str)
+
+        # NOTE The symbols of the ODE system are evaluated once for all records
+        n = len(data)
+        datamap = DataFrameMapping(data)
+        statements = model.statements.before_odes
+        self._values = []
+        for symbol in self._symbols:
+            expr = subs(statements.full_expression(symbol), mapping)
+            self._values.append(_as_array(eval_expr(expr, n, datamap), n))
+        self.doses = {
+            name: _as_array(
+                lambdify_with_arguments(sympy.sympify(expr), self._symbols)(*self._values), n
+            )
+            for name, expr in exprs.items()
+        }
+
+        entries = sympy.Tuple(*matrix)
+        if self.nonlinear:
+            self._matrix_fn = lambdify_with_arguments(entries, self._symbols + amounts + [t])
+            self._matrices = None
+        else:
+            self._matrix_fn = lambdify_with_arguments(entries, self._symbols)
+            self._matrices = self._stack(self._matrix_fn(*self._values), n)
+
+    def _stack(self, entries, n):
+        return np.stack([_as_array(entry, n) for entry in entries], axis=-1).reshape(
+            n, self.size, self.size
+        )
+
+    def matrices(self, records, amounts=None, time=None):
+        """Compartmental matrices for records, amounts and times of each individual"""
+        if self._matrices is not None:
+            return self._matrices[records]
+        values = [value[records] for value in self._values]
+        entries = self._matrix_fn(*values, *amounts.T, time)
+        return self._stack(entries, len(records))
+
+
+def _as_array(x, n):
+    return np.broadcast_to(np.asarray(x, dtype=np.float64), (n,))
+
+
+def _column(model: Model, df: pd.DataFrame, type: str):
+    try:
+        name = model.datainfo.typeix[type][0].name
+    except IndexError:
+        return None
+    return df[name].to_numpy()
+
+
+class _Events:
+    """Events sorted by individual, time and data record order"""
+
+    def __init__(self, individual, time, order, record, bolus, rate, reset, group):
+        ix = np.lexsort((order, time, individual))
+        self.individual = individual[ix]
+        self.time = time[ix]
+        self.record = record[ix]
+        self.bolus = bolus[ix]
+        self.rate = rate[ix]
+        self.reset = reset[ix]
+        self.group = group[ix]
+
+        # NOTE The system is advanced to an event with the parameters of the next record of
+        # the individual, or of the last record for events after all records
+        k = len(ix)
+        positions = np.arange(k)
+        is_record = self.record >= 0
+        following = np.minimum.accumulate(np.where(is_record, positions, k)[::-1])[::-1]
+        preceding = np.maximum.accumulate(np.where(is_record, positions, -1))
+        following_ok = following < k
+        following_ok[following_ok] &= (
+            self.individual[following[following_ok]] == self.individual[following_ok]
+        )
+        source = np.where(following_ok, following, preceding)
+        self.parameter_record = self.record[source]
+
+        starts = np.flatnonzero(np.r_[True, self.individual[1:] != self.individual[:-1]])
+        counts = np.diff(np.r_[starts, k])
+        position = positions - np.repeat(starts, counts)
+        self.layers = np.split(
+            np.argsort(position, kind='stable'), np.cumsum(np.bincount(position))
+        )
+        self.first_time = self.time[starts]
+        self.individuals = len(starts)
+
+
+def _events(model: Model, df: pd.DataFrame, system: _System) -> _Events:
+    n = len(df)
+    idcol = model.datainfo.id_column.name
+    idvcol = model.datainfo.idv_column.name
+    individual, _ = pd.factorize(df[idcol])
+    time = df[idvcol].to_numpy(dtype=np.float64)
+    records = np.arange(n)
+
+    amt = _column(model, df, 'dose')
+    evid = _column(model, df, 'event')
+    ss = _column(model, df, 'ss')
+    if ss is not None and np.any(ss[~pd.isna(ss)] != 0):
+        raise ValueError('Steady state doses are not supported')
+
+    is_dose = np.zeros(n, dtype=bool) if amt is None else amt != 0
+    is_reset = np.zeros(n, dtype=bool)
+    if evid is not None:
+        is_dose &= np.isin(evid, (1, 4))
+        is_reset = np.isin(evid, (3, 4))
+    group = pd.Series(is_reset).groupby(individual).cumsum().to_numpy()
+
+    # NOTE Additional doses are expanded into separate dose events
+    addl = _column(model, df, 'additional')
+    ii = _column(model, df, 'ii')
+    doses = np.flatnonzero(is_dose)
+    if addl is not None and ii is not None:
+        repeats = np.nan_to_num(addl[doses].astype(np.float64)).astype(np.int64) + 1
+        doses = np.repeat(doses, repeats)
+        starts = np.cumsum(repeats) - repeats
+        dose_number = np.arange(len(doses)) - np.repeat(starts, repeats)
+        dose_time = time[doses] + dose_number * ii[doses].astype(np.float64)
+    else:
+        dose_time = time[doses]
+
+    dose_time = dose_time + system.doses['lag_time'][doses]
+    amount = system.doses['amount'][doses] * system.doses['bioavailability'][doses]
+
+    if system.infusion:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if 'rate' in system.doses:
+                rate = system.doses['rate'][doses]
+                duration = amount / rate
+                infused = rate != 0
+            else:
+                duration = system.doses['duration'][doses]
+                rate = amount / duration
+                infused = duration != 0
+        # NOTE As in NONMEM doses with a rate of 0 in the dataset are boluses
+        data_rate = _column(model, df, 'rate')
+        if data_rate is not None:
+            infused &= data_rate[doses].astype(np.float64) != 0
+        inf, bol = np.flatnonzero(infused), np.flatnonzero(~infused)
+        dose_records = np.r_[doses[bol], doses[inf], doses[inf]]
+        times = np.r_[dose_time[bol], dose_time[inf], dose_time[inf] + duration[inf]]
+        bolus = np.r_[amount[bol], np.zeros(2 * len(inf))]
+        rates = np.r_[np.zeros(len(bol)), rate[inf], -rate[inf]]
+    else:
+        dose_records = doses
+        times = dose_time
+        bolus = amount
+        rates = np.zeros(len(doses))
+    resets = np.flatnonzero(is_reset)
+
+    # NOTE At the same time a reset comes before the doses of a record which come before the
+    # record itself
+    return _Events(
+        individual=np.r_[individual[resets], individual[dose_records], individual],
+        time=np.r_[time[resets], times, time],
+        order=np.r_[3 * resets, 3 * dose_records + 1, 3 * records + 2],
+        record=np.r_[np.full(len(resets) + len(dose_records), -1), records],
+        bolus=np.r_[np.zeros(len(resets)), bolus, np.zeros(n)],
+        rate=np.r_[np.zeros(len(resets)), rates, np.zeros(n)],
+        reset=np.r_[np.ones(len(resets), dtype=bool), np.zeros(len(dose_records) + n, dtype=bool)],
+        group=np.r_[group[resets], group[dose_records], group],
+    )
+
+
+def _solve(system: _System, events: _Events, n: int):
+    amounts = np.zeros((events.individuals, system.size))
+    rate = np.zeros(events.individuals)
+    last_time = events.first_time.copy()
+    group = np.zeros(events.individuals, dtype=np.int64)
+    res = np.full((n, system.size), np.nan)
+
+    for layer in events.layers:
+        if len(layer) == 0:
+            continue
+        individual = events.individual[layer]
+        dt = events.time[layer] - last_time[individual]
+        advance = dt > 0
+        if advance.any():
+            ix = individual[advance]
+            amounts[ix] = _advance(
+                system,
+                amounts[ix],
+                rate[ix],
+                events.parameter_record[layer[advance]],
+                last_time[ix],
+                dt[advance],
+            )
+        last_time[individual] = events.time[layer]
+
+        reset = events.reset[layer]
+        if reset.any():
+            ix = individual[reset]
+            amounts[ix] = 0
+            rate[ix] = 0
+            group[ix] = events.group[layer[reset]]
+
+        # NOTE Doses from before a reset are not given
+        current = events.group[layer] == group[individual]
+        amounts[individual, system.dose_index] += np.where(current, events.bolus[layer], 0)
+        rate[individual] += np.where(current, events.rate[layer], 0)
+
+        output = events.record[layer] >= 0
+        res[events.record[layer[output]]] = amounts[individual[output]]
+
+    return res
+
+
+def _advance(system: _System, amounts, rate, records, time, dt):
+    if system.nonlinear:
+        return _advance_nonlinear(system, amounts, rate, records, time, dt)
+
+    # NOTE The zero order input is added as an extra state of the system so that
+    # the solution is a single matrix exponential
+    k, m = len(records), system.size
+    augmented = np.zeros((k, m + 1, m + 1))
+    augmented[:, :m, :m] = system.matrices(records) * dt[:, np.newaxis, np.newaxis]
+    augmented[:, system.dose_index, m] = rate * dt
+    # NOTE expm of a stack of matrices needs scipy>=1.9
+    exp = linalg.expm(augmented)
+    return np.einsum('ijk,ik->ij', exp[:, :m, :m], amounts) + exp[:, :m, m]
+
+
+def _advance_nonlinear(system: _System, amounts, rate, records, time, dt):
+    # NOTE The systems of all individuals are solved together on a common
+    # time scale from 0 to 1
+    k, m = len(records), system.size
+
+    def fun(s, y):
+        a = y.reshape(k, m)
+        matrices = system.matrices(records, a, time + s * dt)
+        da = np.einsum('ijk,ik->ij', matrices, a)
+        da[:, system.dose_index] += rate
+        return (da * dt[:, np.newaxis]).ravel()
+
+    sparsity = sparse.block_diag([np.ones((m, m))] * k)
+    sol = integrate.solve_ivp(
+        fun,
+        (0.0, 1.0),
+        amounts.ravel(),
+        method='BDF',
+        rtol=RTOL,
+        atol=ATOL,
+        jac_sparsity=sparsity,
+    )
+    if not sol.success:
+        raise ValueError(f'Could not solve ODE system: {sol.message}')
+    return sol.y[:, -1].reshape(k, m)
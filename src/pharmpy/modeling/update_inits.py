@@ -82,7 +82,9 @@ def _is_zero_fix(param):
 def update_initial_individual_estimates(model, individual_estimates, force=True):
     """Update initial individual estimates for a model
 
-    Updates initial individual estimates for a model.
+    Updates initial individual estimates for a model. The estimates are matched to the
+    etas of the model by name. Estimates of etas that are not in the model are ignored
+    and etas without estimates will start from 0.
 
     Parameters
     ----------
@@ -10,6 +10,7 @@ from typing import Optional
 import pharmpy.model
 from pharmpy.deps import pandas as pd
 from pharmpy.deps import sympy, sympy_printing
+from pharmpy.internals.fs.cwd import working_directory
 from pharmpy.model import Assignment
 from pharmpy.modeling import write_csv
 from pharmpy.results import ModelfitResults
@@ -241,7 +242,7 @@ def parse_modelfit_results(model, path):
 def execute_model(model, db):
     database = db.model_database
     model = convert_model(model)
-    path = Path.cwd() / f'nlmixr_run_{model.name}-{uuid.uuid1()}'
+    path = working_directory() / f'nlmixr_run_{model.name}-{uuid.uuid1()}'
     model.internals.path = path
     meta = path / '.pharmpy'
     meta.mkdir(parents=True, exist_ok=True)
@@ -1,6 +1,8 @@
 # Read dataset from file
+import operator
 import re
 import warnings
+from functools import lru_cache
 from io import StringIO
 
 from lark import Lark
@@ -97,6 +99,34 @@ def _convert_data_item(x, null_value):
     return converted
 
 
+def _convert_data_column(column, null_value):
+    """Convert all items of a column as with _convert_data_item
+
+    Ordinary numbers are converted in one go. Only columns containing special
+    fortran numbers are converted item by item.
+    """
+    if len(column) == 0:
+        return column.apply(_convert_data_item, args=(null_value,))
+    values = column.to_numpy(dtype=object, copy=True)
+    values[pd.isna(values) | (values == '.') | (values == '')] = null_value
+    if max(map(len, values)) > 24:
+        raise DatasetError("The dataset contains an item that is longer than 24 characters")
+    try:
+        converted = values.astype(np.float64)
+    except ValueError:
+        try:
+            converted = np.fromiter(
+                map(convert_fortran_number, values), dtype=np.float64, count=len(values)
+            )
+        except ValueError as e:
+            raise DatasetError(str(e)) from e
+    for na_value in data.conf.na_values:
+        # NOTE Same semantics as the "in" test in _convert_data_item
+        if isinstance(na_value, (int, float, np.number)):
+            converted[converted == na_value] = np.nan
+    return pd.Series(converted, index=column.index, name=column.name)
+
+
 def _make_ids_unique(df, columns):
     """Check if id numbers are reused and make renumber. If not simply pass through the dataset."""
     if 'ID' in df.columns:
@@ -117,15 +147,18 @@ def _make_ids_unique(df, columns):
     return df
 
 
-def _filter_ignore_accept(df, ignore, accept, null_value):
-    if ignore and accept:
-        raise ValueError("Cannot have both IGNORE and ACCEPT")
+_COMPARISONS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+}
 
-    if not ignore and not accept:
-        return df
-
-    statements = ignore if ignore else accept
 
+@lru_cache(maxsize=None)
+def _ignore_accept_parser():
     grammar = r'''
         start: column skip1? (operator skip2?)? expr
         column: COLNAME
@@ -147,7 +180,7 @@ def _filter_ignore_accept(df, ignore, accept, null_value):
         QEXPR : /"[^"]*"/
               | /'[^']*'/
     '''
-    parser = Lark(
+    return Lark(
         grammar,
         start='start',
         parser='lalr',
@@ -157,11 +190,24 @@ def _filter_ignore_accept(df, ignore, accept, null_value):
         debug=False,
         cache=True,
     )
+
+
+def _filter_ignore_accept(df, ignore, accept, null_value):
+    if ignore and accept:
+        raise ValueError("Cannot have both IGNORE and ACCEPT")
+
+    if not ignore and not accept:
+        return df
+
+    statements = ignore if ignore else accept
+
+    parser = _ignore_accept_parser()
+    keep = np.ones(len(df), dtype=bool)
     for s in statements:
         tree = parser.parse(s)
         column = ''
         expr = ''
-        operator = '=='
+        op = '=='
         operator_type = str
         for st in tree.iter_subtrees():
             if st.data == 'column':
@@ -172,28 +218,28 @@ def _filter_ignore_accept(df, ignore, accept, null_value):
                 operator_token = st.children[0]
                 tp = operator_token.type  # pyright: ignore [reportGeneralTypeIssues]
                 if tp == 'OP_EQ':
-                    operator = '=='
+                    op = '=='
                     operator_type = float
                 elif tp == 'OP_NE':
-                    operator = '!='
+                    op = '!='
                     operator_type = float
                 elif tp == 'OP_LT':
-                    operator = '<'
+                    op = '<'
                     operator_type = float
                 elif tp == 'OP_GT':
-                    operator = '>'
+                    op = '>'
                     operator_type = float
                 elif tp == 'OP_LT_EQ':
-                    operator = '<='
+                    op = '<='
                     operator_type = float
                 elif tp == 'OP_GT_EQ':
-                    operator = '>='
+                    op = '>='
                     operator_type = float
                 elif tp == 'OP_STR_EQ':
-                    operator = '=='
+                    op = '=='
                     operator_type = str
                 elif tp == 'OP_STR_NE':
-                    operator = '!='
+                    op = '!='
                     operator_type = str
         if len(expr) >= 3 and (
             (expr.startswith("'") and expr.endswith("'"))
@@ -201,24 +247,94 @@ def _filter_ignore_accept(df, ignore, accept, null_value):
         ):
             expr = expr[1:-1]
 
+        # NOTE Statements are applied one after the other so columns are only
+        # converted for rows that have not already been filtered out
+        column_values = df[column][keep]
         if operator_type == str:
-            expression = f'{column} {operator} "{expr}"'
-            if ignore:
-                expression = 'not(' + expression + ')'
-            df.query(expression, inplace=True)
+            value = expr
         else:
             # Need to temporary convert column. Refer to NONMEM fileformat documentation
             # for further information.
-            # Using a name with spaces since this cannot collide with other NONMEM names
-            magic_colname = 'a a'
-            df[magic_colname] = df[column].apply(_convert_data_item, args=(str(null_value),))
-            expression = f'`{magic_colname}` {operator} {expr}'
-            if ignore:
-                expression = 'not(' + expression + ')'
-            df.query(expression, inplace=True)
-            df.drop(labels=magic_colname, axis=1, inplace=True)
-    df.reset_index(drop=True, inplace=True)
-    return df
+            column_values = _convert_data_column(column_values, str(null_value))
+            value = float(expr)
+        mask = _COMPARISONS[op](column_values, value).to_numpy()
+        if ignore:
+            mask = ~mask
+        keep[keep] = mask
+    return df[keep].reset_index(drop=True)
+
+
+_SEPARATOR = re.compile(r' *, *| *[\t] *| +')
+_LINE_PADDING = re.compile(r'^[ \t]+|[ \t]+$', re.MULTILINE)
+_UNSAFE_CHARACTERS = re.compile(r'[^\t\n\x20-\x7e]')
+
+
+def _items_per_line(buf, separator):
+    # NOTE Number of separators on each line of an ASCII buffer ending with a newline
+    newline = buf == ord('\n')
+    separators = np.cumsum(buf == separator)
+    return np.diff(separators[newline], prepend=0)
+
+
+def _words_per_line(buf):
+    # NOTE Number of space separated words on each line of an ASCII buffer ending with a
+    # newline
+    newline = buf == ord('\n')
+    word = ~newline & (buf != ord(' '))
+    starts = word.copy()
+    starts[1:] &= ~word[:-1]
+    line = np.cumsum(newline) - newline
+    return np.bincount(line[starts], minlength=np.count_nonzero(newline))
+
+
+def _read_csv_fast(text, sep):
+    return pd.read_csv(
+        StringIO(text),
+        sep=sep,
+        na_filter=False,
+        header=None,
+        engine='c',
+        quoting=3,
+        dtype=object,
+        index_col=False,
+    )
+
+
+def _read_table(contents):
+    # NOTE The fast paths use the C parser. This gives the same result as splitting the
+    # stripped lines on the separators with the python parser if all lines contain only
+    # printable ASCII and have the same number of items. Otherwise we fall back to the
+    # python parser.
+    if contents and not _UNSAFE_CHARACTERS.search(contents):
+        text = contents if contents.endswith('\n') else contents + '\n'
+        buf = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+        has_tab = bool(np.any(buf == ord('\t')))
+        has_space = bool(np.any(buf == ord(' ')))
+        has_comma = bool(np.any(buf == ord(',')))
+        if not has_tab and not has_space:
+            counts = _items_per_line(buf, ord(','))
+            sep = ','
+        elif not has_tab and not has_comma:
+            counts = _words_per_line(buf)
+            sep = r'\s+'
+        else:
+            text = _SEPARATOR.sub(',', _LINE_PADDING.sub('', text))
+            buf = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+            counts = _items_per_line(buf, ord(','))
+            sep = ','
+        if np.all(counts == counts[0]):
+            return _read_csv_fast(text, sep)
+
+    return pd.read_table(
+        StringIO(contents),
+        sep=_SEPARATOR.pattern,
+        na_filter=False,
+        header=None,
+        engine='python',
+        quoting=3,
+        dtype=object,
+        index_col=False,
+    )
 
 
 def read_nonmem_dataset(
@@ -260,16 +376,7 @@ def read_nonmem_dataset(
         raise KeyError('Column names are not unique')
 
     file_io = NMTRANDataIO(path_or_io, ignore_character)
-    df = pd.read_table(
-        file_io,
-        sep=r' *, *| *[\t] *| +',
-        na_filter=False,
-        header=None,
-        engine='python',
-        quoting=3,
-        dtype=object,
-        index_col=False,
-    )
+    df = _read_table(file_io.getvalue())
 
     diff_cols = len(df.columns) - len(colnames)
     if diff_cols > 0:
@@ -296,7 +403,7 @@ def read_nonmem_dataset(
             x for x in parse_columns if x not in ['TIME', 'DATE', 'DAT1', 'DAT2', 'DAT3']
         ]
     for column in parse_columns:
-        df[column] = df[column].apply(_convert_data_item, args=(str(null_value),))
+        df[column] = _convert_data_column(df[column], str(null_value))
     df = _make_ids_unique(df, parse_columns)
 
     if not raw:
@@ -308,7 +415,7 @@ def read_nonmem_dataset(
         else:
             idcol = None
         if idcol:
-            if all(df[idcol].astype('int32') == df[idcol]):
+            if (df[idcol].astype('int32') == df[idcol]).all():
                 df[idcol] = df[idcol].astype('int32')
 
         # Parse TIME if possible
@@ -316,7 +423,7 @@ def read_nonmem_dataset(
             item in df.columns for item in ['DATE', 'DAT1', 'DAT2', 'DAT3']
         ):
             try:
-                df['TIME'] = df['TIME'].apply(_convert_data_item, args=(str(null_value),))
+                df['TIME'] = _convert_data_column(df['TIME'], str(null_value))
             except DatasetError:
                 pass
 
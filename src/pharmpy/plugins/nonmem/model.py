@@ -232,6 +232,7 @@ class Model(BaseModel):
     def dataset(self):
         if not hasattr(self, '_dataset'):
             self._dataset = parse_dataset(self.datainfo, self.internals.control_stream, raw=False)
+        self._resolve_dataset()
         return self._dataset
 
     @dataset.setter
@@ -247,7 +248,13 @@ class Model(BaseModel):
         )
 
 
-def parse_code(code: str, path: Optional[Path] = None, dataset: Optional[pd.DataFrame] = None, **_):
+def parse_code(
+    code: str,
+    path: Optional[Path] = None,
+    dataset: Optional[pd.DataFrame] = None,
+    parse_results: bool = True,
+    **_,
+):
     parser = NMTranParser()
     if path is None:
         name = 'run1'
@@ -326,7 +333,7 @@ def parse_code(code: str, path: Optional[Path] = None, dataset: Optional[pd.Data
     value_type = parse_value_type(control_stream, statements)
 
     modelfit_results = _parse_modelfit_results(
-        path,
+        path if parse_results else None,
         control_stream,
         BaseModel(  # FIXME This should not be necessary
             name=name,
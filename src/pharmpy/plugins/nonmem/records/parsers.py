@@ -1,16 +1,19 @@
 from pathlib import Path
 
-from lark import Lark, Tree, Visitor
+from lark import Tree, Visitor
 
 from pharmpy.internals.parse import GenericParser, InsertMissing, with_ignored_tokens
+from pharmpy.internals.parse.grammar import LazyGrammar
 
 grammar_root = Path(__file__).resolve().parent / 'grammars'
 
 
 def install_grammar(cls):
+    # NOTE The parser is built on first use of the record type
     grammar = Path(grammar_root / cls.grammar_filename).resolve()
-    with open(str(grammar), 'r') as fh:
-        cls.lark = Lark(fh, **{**GenericParser.lark_options, **getattr(cls, 'grammar_options', {})})
+    cls.lark = LazyGrammar(
+        grammar, {**GenericParser.lark_options, **getattr(cls, 'grammar_options', {})}
+    )
     return cls
 
 
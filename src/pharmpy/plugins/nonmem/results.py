@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from pathlib import Path
 from typing import Dict, Optional, Union
 
@@ -15,7 +16,7 @@ from .nmtran_parser import NMTranControlStream
 from .parameters import parameter_translation
 from .random_variables import rv_translation
 from .results_file import NONMEMResultsFile
-from .table import ExtTable, NONMEMTableFile, PhiTable
+from .table import ExtTable, NONMEMTableFile, PhiTable, iterate_tables
 
 
 def _parse_modelfit_results(
@@ -35,6 +36,7 @@ def _parse_modelfit_results(
     estimation_steps = model.estimation_steps
     parameters = model.parameters
     etas = model.random_variables.etas
+    epsilons = model.random_variables.epsilons
 
     log = Log()
     try:
@@ -70,6 +72,7 @@ def _parse_modelfit_results(
     table_df = _parse_tables(path, control_stream)
     residuals = _parse_residuals(table_df)
     predictions = _parse_predictions(table_df)
+    derivatives = _parse_derivatives(table_df, etas.names, epsilons.names)
     iofv, ie, iec = _parse_phi(path, control_stream, etas)
     rse = _calculate_relative_standard_errors(final_pe, ses)
     (
@@ -139,6 +142,7 @@ def _parse_modelfit_results(
         ofv=final_ofv,
         ofv_iterations=ofv_iterations,
         predictions=predictions,
+        derivatives=derivatives,
         residuals=residuals,
         evaluation=evaluation,
         log=log,
@@ -314,6 +318,11 @@ def _parse_phi(path: Path, control_stream: NMTranControlStream, etas: RandomVari
         return None, None, None
 
 
+_DERIVATIVE_COLUMN = re.compile(
+    r'G(?P<eta>\d+)1|H(?P<eps>\d+)1|D_EPSETA(?P<cross_eps>\d+)_(?P<cross_eta>\d+)'
+)
+
+
 def _parse_tables(path: Path, control_stream: NMTranControlStream) -> pd.DataFrame:
     """Parse $TABLE and table files into one large dataframe of useful columns"""
     interesting_columns = {
@@ -334,12 +343,19 @@ def _parse_tables(path: Path, control_stream: NMTranControlStream) -> pd.DataFra
     df = pd.DataFrame()
     for table_rec in table_recs:
         columns_in_table = []
+        synonyms = {}
         for key, value in table_rec.all_options:
             if key in interesting_columns and key not in found and value is None:
                 # FIXME: Cannot handle synonyms here
                 colname = key
             elif value in interesting_columns and value not in found:
                 colname = value
+            elif key in interesting_columns and key not in found:
+                # NOTE The column of a synonym, e.g. CIPREDI=OPRED, has the synonym as header
+                colname = key
+                synonyms[value] = key
+            elif _DERIVATIVE_COLUMN.fullmatch(key) and key not in found and value is None:
+                colname = key
             else:
                 continue
 
@@ -348,15 +364,21 @@ def _parse_tables(path: Path, control_stream: NMTranControlStream) -> pd.DataFra
 
         noheader = table_rec.has_option("NOHEADER")
         notitle = table_rec.has_option("NOTITLE") or noheader
-        nolabel = table_rec.has_option("NOLABEL") or noheader
         table_path = path.parent / table_rec.path
         try:
-            table_file = NONMEMTableFile(table_path, notitle=notitle, nolabel=nolabel)
+            # NOTE Only the first table is needed so avoid reading e.g. all simulated subproblems
+            table = next(
+                iterate_tables(
+                    table_path,
+                    columns=columns_in_table + list(synonyms.keys()),
+                    notitle=notitle,
+                )
+            )
         except IOError:
             continue
-        table = table_file.tables[0]
 
-        df[columns_in_table] = table.data_frame[columns_in_table]
+        table_df = table.data_frame.rename(columns=synonyms)
+        df[columns_in_table] = table_df[columns_in_table]
 
     if 'ID' in df.columns:
         df['ID'] = df['ID'].convert_dtypes()
@@ -394,6 +416,38 @@ def _parse_predictions(df: pd.DataFrame):
     return df
 
 
+def _parse_derivatives(df: pd.DataFrame, eta_names, epsilon_names):
+    # NOTE Gxx1 and Hxx1 are the derivatives of NONMEM and D_EPSETAi_j the cross
+    # derivatives in the convention of PsN linearize
+    def name(names, number):
+        i = int(number) - 1
+        return names[i] if 0 <= i < len(names) else None
+
+    columns = {}
+    for col in df.columns:
+        m = _DERIVATIVE_COLUMN.fullmatch(col)
+        if m is None:
+            continue
+        if m.group('eta') is not None:
+            names = [name(eta_names, m.group('eta'))]
+        elif m.group('eps') is not None:
+            names = [name(epsilon_names, m.group('eps'))]
+        else:
+            names = [
+                name(epsilon_names, m.group('cross_eps')),
+                name(eta_names, m.group('cross_eta')),
+            ]
+        # NOTE Columns for random variables that are not in the model are skipped
+        if None in names:
+            continue
+        columns[col] = ';'.join(names)
+    index_cols = ['ID', 'TIME']
+    df = _extract_from_df(df, index_cols, list(columns.keys()))
+    if df is not None:
+        df = df.rename(columns=columns).set_index(index_cols)
+    return df
+
+
 def _create_failed_ofv_iterations(n: int):
     steps = list(range(1, n + 1))
     iterations = [0] * n
@@ -8,6 +8,7 @@ import warnings
 from itertools import repeat
 from pathlib import Path
 
+from pharmpy.internals.fs.cwd import working_directory
 from pharmpy.model import EstimationSteps
 from pharmpy.modeling import write_csv, write_model
 from pharmpy.plugins.nonmem import conf, convert_model, parse_modelfit_results
@@ -20,7 +21,7 @@ def execute_model(model, db):
     parent_model = model.parent_model
     model = convert_model(model)
     model.parent_model = parent_model
-    path = Path.cwd() / f'NONMEM_run_{model.name}-{uuid.uuid1()}'
+    path = working_directory() / f'NONMEM_run_{model.name}-{uuid.uuid1()}'
 
     # NOTE This deduplicates the dataset before running NONMEM so we know which
     # filename to give to this dataset.
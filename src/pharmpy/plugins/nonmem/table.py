@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 from io import StringIO
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Iterable, Iterator, List, Optional, Union
 
 from pharmpy.deps import numpy as np
 from pharmpy.deps import pandas as pd
@@ -69,32 +69,11 @@ class NONMEMTableFile:
             table = CovTable(''.join(content))
         else:
             # Remove repeated header lines, but not the first
-            content[1:] = [line for line in content[1:] if not re.match(r'\s[A-Za-z_]', line)]
+            content[1:] = [line for line in content[1:] if not _is_header_line(line)]
             table = NONMEMTable(''.join(content))  # Fallback to non-specific table type
 
         if table_line is not None:
-            m = re.match(r'TABLE NO.\s+(\d+)', table_line)
-            if not m:
-                raise ValueError(f"Illegal {suffix}-file: missing TABLE NO.")
-            table.number = int(m.group(1))
-            table.is_evaluation = False
-            if re.search(r'(Evaluation)', table_line):
-                table.is_evaluation = True  # No estimation step was run
-            m = re.match(
-                r'TABLE NO.\s+\d+: (.*?): (?:Goal Function=(.*): )?Problem=(\d+) '
-                r'Subproblem=(\d+) Superproblem1=(\d+) Iteration1=(\d+) Superproblem2=(\d+) '
-                r'Iteration2=(\d+)',
-                table_line,
-            )
-            if m:
-                table.method = m.group(1)
-                table.goal_function = m.group(2)
-                table.problem = int(m.group(3))
-                table.subproblem = int(m.group(4))
-                table.superproblem1 = int(m.group(5))
-                table.iteration1 = int(m.group(6))
-                table.superproblem2 = int(m.group(7))
-                table.iteration2 = int(m.group(8))
+            _parse_table_line(table, table_line, suffix)
 
         return table
 
@@ -134,6 +113,137 @@ class NONMEMTableFile:
                 print(table.content, file=df, end='')
 
 
+def _parse_table_line(table: NONMEMTable, table_line: str, suffix: Optional[str] = None):
+    m = re.match(r'TABLE NO.\s+(\d+)', table_line)
+    if not m:
+        raise ValueError(f"Illegal {suffix}-file: missing TABLE NO.")
+    table.number = int(m.group(1))
+    table.is_evaluation = False
+    if re.search(r'(Evaluation)', table_line):
+        table.is_evaluation = True  # No estimation step was run
+    m = re.match(
+        r'TABLE NO.\s+\d+: (.*?): (?:Goal Function=(.*): )?Problem=(\d+) '
+        r'Subproblem=(\d+) Superproblem1=(\d+) Iteration1=(\d+) Superproblem2=(\d+) '
+        r'Iteration2=(\d+)',
+        table_line,
+    )
+    if m:
+        table.method = m.group(1)
+        table.goal_function = m.group(2)
+        table.problem = int(m.group(3))
+        table.subproblem = int(m.group(4))
+        table.superproblem1 = int(m.group(5))
+        table.iteration1 = int(m.group(6))
+        table.superproblem2 = int(m.group(7))
+        table.iteration2 = int(m.group(8))
+
+
+def _is_header_line(line: str) -> bool:
+    # NOTE Same as re.match(r'\s[A-Za-z_]', line) but faster
+    return len(line) > 1 and line[0].isspace() and (line[1].isalpha() or line[1] == '_')
+
+
+def iterate_tables(
+    path: Union[str, Path],
+    columns: Optional[Iterable[str]] = None,
+    subproblems: Optional[Iterable[int]] = None,
+    chunksize: Optional[int] = None,
+    notitle: bool = False,
+) -> Iterator[NONMEMTable]:
+    """Read the tables of a NONMEM table file one at a time
+
+    The file is streamed so that only one table, or one chunk of rows, is kept in
+    memory at a time. This is suitable for large files, e.g. from simulations with
+    many subproblems.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path to table file
+    columns : iterable of str
+        Only keep these columns. Columns not present in a table are ignored.
+        Default is to keep all columns.
+    subproblems : iterable of int
+        Only read tables for these subproblems. For tables that do not have the
+        subproblem number in the title line, the tables are numbered consecutively
+        starting from 1. Default is to read all tables.
+    chunksize : int
+        Maximum number of rows in each yielded table. Tables with more rows are split
+        into multiple consecutive NONMEMTable objects having the same metadata.
+        Default is to yield complete tables.
+    notitle : bool
+        The table file has no title lines, i.e. it contains a single table
+
+    Returns
+    -------
+    Iterator[NONMEMTable]
+        Tables in file order
+    """
+    path = Path(path)
+    if path.stat().st_size == 0:
+        raise OSError("Empty table file")
+    wanted_subproblems = None if subproblems is None else set(subproblems)
+    wanted_columns = None if columns is None else set(columns)
+
+    with open(str(path), 'r') as tablefile:
+        line = None if notitle else tablefile.readline()
+        ordinal = 0
+        while True:
+            table_line = line
+            ordinal += 1
+            header_line = tablefile.readline()
+            usecols = (
+                None
+                if wanted_columns is None
+                else [col for col in header_line.split() if col in wanted_columns]
+            )
+
+            table = _create_table(table_line, path.suffix, ordinal, header_line, [], usecols)
+            selected = wanted_subproblems is None or table.subproblem in wanted_subproblems
+
+            rows = []
+            nchunks = 0
+            line = None
+            for current in tablefile:
+                if current.startswith('TABLE NO.'):
+                    line = current
+                    break
+                if not selected or _is_header_line(current):
+                    continue
+                rows.append(current)
+                if chunksize is not None and len(rows) == chunksize:
+                    yield _create_table(
+                        table_line, path.suffix, ordinal, header_line, rows, usecols
+                    )
+                    nchunks += 1
+                    rows = []
+
+            if selected and (rows or nchunks == 0):
+                yield _create_table(table_line, path.suffix, ordinal, header_line, rows, usecols)
+
+            if line is None:
+                break
+
+
+def _create_table(
+    table_line: Optional[str],
+    suffix: str,
+    ordinal: int,
+    header_line: str,
+    rows: List[str],
+    usecols: Optional[List[str]],
+) -> NONMEMTable:
+    # NOTE The header line is parsed by pandas to get the same handling of duplicate
+    # column names as NONMEMTable
+    df = pd.read_csv(StringIO(header_line + ''.join(rows)), sep=r'\s+', usecols=usecols, engine='c')
+    table = NONMEMTable(df=df)
+    if table_line is not None:
+        _parse_table_line(table, table_line, suffix)
+    if table.subproblem is None:
+        table.subproblem = ordinal
+    return table
+
+
 class NONMEMTable:
     """A NONMEM output table."""
 
@@ -7,7 +7,6 @@ from pathlib import Path
 from typing import TYPE_CHECKING, List, Mapping, Optional
 
 from pharmpy.deps import numpy as np
-from pharmpy.deps import pandas as pd
 from pharmpy.deps import sympy, sympy_printing
 from pharmpy.internals.parse import AttrTree
 from pharmpy.internals.sequence.lcs import diff
@@ -34,7 +33,7 @@ if TYPE_CHECKING:
 
 from .nmtran_parser import NMTranControlStream
 from .parameters import parameter_translation
-from .parsing import get_zero_fix_rvs, parse_column_info
+from .parsing import parse_column_info
 from .records import code_record
 from .records.code_record import CodeRecord
 from .records.etas_record import EtasRecord
@@ -1388,7 +1387,9 @@ def update_input(model: Model):
 def update_initial_individual_estimates(model: Model, path, nofiles=False):
     """Update $ETAS
 
-    Could have 0 FIX in model. Need to read these
+    Estimates are matched to the etas of the model by name. Estimates of etas
+    that are not in the model are ignored and etas without estimates start at
+    0 as do etas with a variance that is fixed to 0.
     """
     if path is None:  # What to do here?
         phi_path = Path('.')
@@ -1399,27 +1400,18 @@ def update_initial_individual_estimates(model: Model, path, nofiles=False):
     estimates = model.initial_individual_estimates
     if estimates is not model.internals._old_initial_individual_estimates:
         assert estimates is not None
-        rv_names = {rv for rv in model.random_variables.names if rv.startswith('ETA')}
-        columns = set(estimates.columns)
-        if columns < rv_names:
-            raise ValueError(
-                f'Cannot set initial estimate for random variable not in the model:'
-                f' {rv_names - columns}'
-            )
-        diff = columns - rv_names
-        # If not setting all etas automatically set remaining to 0 for all individuals
-        if len(diff) > 0:
-            for name in diff:
-                estimates = estimates.copy(deep=True)
-                estimates[name] = 0
-            estimates = _sort_eta_columns(estimates)
-
-        etas = estimates
-        zero_fix = get_zero_fix_rvs(model.internals.control_stream, eta=True)
-        if zero_fix:
-            for eta in zero_fix:
+        # NOTE The etas are numbered in the order of the random variables when
+        # the code is generated so the columns are put in that order
+        rvs = model.random_variables.etas
+        rv_names = rvs.names
+        etas = estimates.reindex(columns=rv_names, fill_value=0)
+        # NOTE Reading the zero fix etas from the records would renumber them
+        params = model.parameters
+        for eta in rv_names:
+            variance = rvs[eta].get_variance(eta)
+            if variance in params.symbols and params[variance].fix and params[variance].init == 0:
                 etas[eta] = 0
-        etas = _sort_eta_columns(etas)
+        etas.columns = [f'ETA({i})' for i in range(1, len(rv_names) + 1)]
         if not nofiles:
             phi = PhiTable(df=etas)
             table_file = NONMEMTableFile(tables=[phi])
@@ -1440,10 +1432,6 @@ def update_initial_individual_estimates(model: Model, path, nofiles=False):
             first_est_record.set_option('MCETA', '1')
 
 
-def _sort_eta_columns(df: pd.DataFrame):
-    return df.reindex(sorted(df.columns), axis=1)
-
-
 def abbr_translation(model: Model, rv_trans):
     abbr_pharmpy = model.internals.control_stream.abbreviated.translate_to_pharmpy_names()
     abbr_replace = model.internals.control_stream.abbreviated.replace
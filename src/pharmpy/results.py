@@ -163,6 +163,9 @@ class ModelfitResults(Results, Immutable):
         Table of various residuals
     predictions: pd.DataFrame
         Table of various predictions
+    derivatives: pd.DataFrame
+        Table of derivatives of the model output with respect to the random variables. Cross
+        derivatives have the names of both random variables separated by a semicolon.
     estimation_runtime : float
         Runtime for one estimation step
     runtime_total : float
@@ -204,6 +207,7 @@ class ModelfitResults(Results, Immutable):
     individual_estimates_covariance: Optional[pd.DataFrame] = None
     residuals: Optional[pd.DataFrame] = None
     predictions: Optional[pd.DataFrame] = None
+    derivatives: Optional[pd.DataFrame] = None
     runtime_total: Optional[float] = None
     termination_cause: Optional[str] = None
     termination_cause_iterations: Optional[pd.Series] = None
@@ -1,15 +1,48 @@
-from pharmpy.modeling import resample_data
+from pharmpy.deps import numpy as np
+from pharmpy.modeling import create_rng
+from pharmpy.modeling.iterators import create_resampled_dataset, group_row_positions
 from pharmpy.tools.bootstrap.results import calculate_results
 from pharmpy.tools.modelfit import create_fit_workflow
 from pharmpy.workflows import Task, Workflow
 
 
-def create_workflow(model, resamples=1):
+def create_workflow(model, resamples=1, rng=None):
+    """Run bootstrap tool
+
+    Parameters
+    ----------
+    model : Model
+        Pharmpy model
+    resamples : int
+        Number of bootstrap resamples
+    rng : Generator or int
+        Random number generator or seed. Use a seed to get the same resamples in
+        every run.
+
+    Returns
+    -------
+    BootstrapResults
+        Bootstrap tool result object
+
+    Examples
+    --------
+    >>> from pharmpy.modeling import load_example_model
+    >>> model = load_example_model("pheno")
+    >>> from pharmpy.tools import run_tool # doctest: +SKIP
+    >>> res = run_tool("bootstrap", model, resamples=100, rng=1234)   # doctest: +SKIP
+    """
     wf = Workflow()
     wf.name = 'bootstrap'
 
+    # NOTE The dataset is grouped once and all resamples are drawn in one go. Each task
+    # only gets the sampled group positions and creates its dataset when run.
+    _, order, offsets = group_row_positions(model.dataset, model.datainfo.id_column.name)
+    samples = _draw_samples(len(offsets) - 1, resamples, rng)
+
     for i in range(resamples):
-        task_resample = Task('resample', resample_model, model, f'bs_{i + 1}')
+        task_resample = Task(
+            'resample', resample_model, model, order, offsets, samples[i], f'bs_{i + 1}'
+        )
         wf.add_task(task_resample)
 
     wf_fit = create_fit_workflow(n=resamples)
@@ -21,9 +54,20 @@ def create_workflow(model, resamples=1):
     return wf
 
 
-def resample_model(model, name):
-    resample = resample_data(model, model.datainfo.id_column.name, resamples=1, name=name)
-    model, _ = next(resample)
+def _draw_samples(ngroups, resamples, rng=None):
+    # NOTE Same sampling as resample_data with default options, i.e. all groups without
+    # replacement, but for all resamples at once
+    rng = create_rng(rng)
+    return rng.permuted(np.tile(np.arange(ngroups), (resamples, 1)), axis=1)
+
+
+def resample_model(model, order, offsets, sample, name):
+    df = create_resampled_dataset(
+        model.dataset, model.datainfo.id_column.name, order, offsets, sample
+    )
+    model = model.copy()
+    model.dataset = df
+    model.name = name
     return model
 
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 import warnings
 from dataclasses import dataclass
 from typing import Any, Optional, Sequence, Type, TypeVar
@@ -7,7 +8,7 @@ from typing import Any, Optional, Sequence, Type, TypeVar
 from pharmpy.deps import numpy as np
 from pharmpy.deps import pandas as pd
 from pharmpy.model import Model, Results
-from pharmpy.modeling import update_inits
+from pharmpy.modeling import update_initial_individual_estimates, update_inits
 from pharmpy.tools import rank_models, summarize_errors
 from pharmpy.workflows import ToolDatabase
 
@@ -30,9 +31,47 @@ def update_initial_estimates(model):
         )
     except (ValueError, np.linalg.LinAlgError):
         warn()
+
+    from pharmpy.tools.modelfit import conf
+
+    individual_estimates = model.modelfit_results.individual_estimates
+    if conf.warm_start_etas and individual_estimates is not None:
+        # NOTE The estimates are mapped onto the etas of the model by name when
+        # the model is written so etas that are added or removed later are handled
+        individual_estimates = _rename_individual_estimates(model, individual_estimates)
+        update_initial_individual_estimates(model, individual_estimates)
     return model
 
 
+_ETA_NUMBER = re.compile(r'ETA\((\d+)\)')
+
+
+def _rename_individual_estimates(model, individual_estimates):
+    # NOTE Etas of models read from code without names in the $OMEGA records are named
+    # by their number. Columns and etas that do not match by name are matched by number
+    # instead, i.e. the n:th column with ETA(n) and ETA(n) with the n:th eta
+    names = model.random_variables.etas.names
+    columns = list(individual_estimates.columns)
+    unmatched = {name for name in names if name not in columns}
+    renaming = {}
+    for i, col in enumerate(columns):
+        if col in names:
+            continue
+        match = _ETA_NUMBER.fullmatch(col)
+        if match and 0 < int(match.group(1)) <= len(names):
+            name = names[int(match.group(1)) - 1]
+        elif i < len(names):
+            name = names[i]
+            if name != f'ETA({i + 1})':
+                continue
+        else:
+            continue
+        if name in unmatched:
+            renaming[col] = name
+            unmatched.remove(name)
+    return individual_estimates.rename(columns=renaming)
+
+
 @dataclass(frozen=True)
 class ToolResults(Results):
     summary_tool: Optional[Any] = None
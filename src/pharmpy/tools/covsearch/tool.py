@@ -1,3 +1,5 @@
+import multiprocessing
+import warnings
 from collections import Counter, defaultdict
 from dataclasses import astuple, dataclass, replace
 from itertools import count
@@ -25,8 +27,9 @@ from pharmpy.tools.mfl.feature.covariate import (
 )
 from pharmpy.tools.mfl.parse import parse as mfl_parse
 from pharmpy.tools.modelfit import create_fit_workflow
+from pharmpy.tools.modelfit.cache import get_fit_cache
 from pharmpy.tools.scm.results import candidate_summary_dataframe, ofv_summary_dataframe
-from pharmpy.workflows import Task, Workflow, call_workflow
+from pharmpy.workflows import Task, Workflow, as_completed, call_workflow, submit_workflow
 
 from ..mfl.filter import covsearch_statement_types
 from .results import COVSearchResults
@@ -96,6 +99,7 @@ class SearchState:
 
 
 ALGORITHMS = frozenset(['scm-forward', 'scm-forward-then-backward'])
+SCHEDULINGS = frozenset(['barrier', 'speculative'])
 
 
 def create_workflow(
@@ -106,6 +110,7 @@ def create_workflow(
     algorithm: str = 'scm-forward-then-backward',
     results: Optional[ModelfitResults] = None,
     model: Optional[Model] = None,
+    scheduling: str = 'barrier',
 ):
     """Run COVsearch tool. For more details, see :ref:`covsearch`.
 
@@ -127,6 +132,14 @@ def create_workflow(
         Results of model
     model : Model
         Pharmpy model
+    scheduling : str
+        How to schedule the candidates of the steps. With 'barrier' all candidates
+        of a step are fitted before the next step is started. With 'speculative'
+        the candidates of the next step are started with a lower priority as soon
+        as the fits of the current step suggest a best candidate. The selected
+        models are the same for both. Speculative scheduling falls back to 'barrier'
+        with a warning if the tasks run in several processes and the fit cache is
+        disabled.
 
     Returns
     -------
@@ -159,6 +172,7 @@ def create_workflow(
         effects,
         p_forward,
         max_steps,
+        scheduling,
     )
 
     wf.add_task(forward_search_task, predecessors=init_task)
@@ -171,6 +185,7 @@ def create_workflow(
             task_greedy_backward_search,
             p_backward,
             max_steps,
+            scheduling,
         )
 
         wf.add_task(backward_search_task, predecessors=search_output)
@@ -206,28 +221,40 @@ def task_greedy_forward_search(
     effects: Union[str, Sequence[Spec]],
     p_forward: float,
     max_steps: int,
+    scheduling: str,
     state: SearchState,
 ) -> SearchState:
+    scheduling = _check_scheduling(scheduling)
     candidate = state.best_candidate_so_far
     assert state.all_candidates_so_far == [candidate]
     effect_spec = spec(candidate.model, mfl_parse(effects)) if isinstance(effects, str) else effects
     candidate_effects = sorted(set(parse_spec(effect_spec)))
 
-    def handle_effects(
-        step: int, parent: Candidate, candidate_effects: List[EffectLiteral], index_offset: int
+    def create_wf(
+        parent: Candidate,
+        candidate_effects: List[EffectLiteral],
+        index_offset: int,
+        name_prefix: str = 'covsearch_run',
     ):
+        return wf_effects_addition(
+            parent.model,
+            parent,
+            candidate_effects,
+            index_offset,
+            name_prefix,
+            _deduplicate(scheduling),
+        )
 
-        wf = wf_effects_addition(parent.model, parent, candidate_effects, index_offset)
-        new_candidate_models = call_workflow(wf, f'{NAME_WF}-effects_addition-{step}', context)
+    def create_candidate(parent: Candidate, effect: EffectLiteral, model: Model):
+        return Candidate(model, parent.steps + (ForwardStep(p_forward, AddEffect(*effect)),))
 
-        return [
-            Candidate(model, parent.steps + (ForwardStep(p_forward, AddEffect(*effect)),))
-            for model, effect in zip(new_candidate_models, candidate_effects)
-        ]
-
-    return _greedy_search(
+    return _search(
+        context,
+        f'{NAME_WF}-effects_addition',
+        scheduling,
         state,
-        handle_effects,
+        create_wf,
+        create_candidate,
         candidate_effects,
         p_forward,
         max_steps,
@@ -238,33 +265,207 @@ def task_greedy_backward_search(
     context,
     p_backward: float,
     max_steps: int,
+    scheduling: str,
     state: SearchState,
 ) -> SearchState:
-    def handle_effects(
-        step: int, parent: Candidate, candidate_effects: List[EffectLiteral], index_offset: int
-    ):
+    scheduling = _check_scheduling(scheduling)
 
-        wf = wf_effects_removal(state.start_model, parent, candidate_effects, index_offset)
-        new_candidate_models = call_workflow(wf, f'{NAME_WF}-effects_removal-{step}', context)
+    def create_wf(
+        parent: Candidate,
+        candidate_effects: List[EffectLiteral],
+        index_offset: int,
+        name_prefix: str = 'covsearch_run',
+    ):
+        return wf_effects_removal(
+            state.start_model,
+            parent,
+            candidate_effects,
+            index_offset,
+            name_prefix,
+            _deduplicate(scheduling),
+        )
 
-        return [
-            Candidate(model, parent.steps + (BackwardStep(p_backward, RemoveEffect(*effect)),))
-            for model, effect in zip(new_candidate_models, candidate_effects)
-        ]
+    def create_candidate(parent: Candidate, effect: EffectLiteral, model: Model):
+        return Candidate(model, parent.steps + (BackwardStep(p_backward, RemoveEffect(*effect)),))
 
     candidate_effects = list(map(astuple, _added_effects(state.best_candidate_so_far.steps)))
 
     n_removable_effects = max(0, len(state.best_candidate_so_far.steps) - 1)
 
-    return _greedy_search(
+    return _search(
+        context,
+        f'{NAME_WF}-effects_removal',
+        scheduling,
         state,
-        handle_effects,
+        create_wf,
+        create_candidate,
         candidate_effects,
         p_backward,
         min(max_steps, n_removable_effects) if max_steps >= 0 else n_removable_effects,
     )
 
 
+def _search(
+    context,
+    name: str,
+    scheduling: str,
+    state: SearchState,
+    create_wf: Callable[..., Workflow],
+    create_candidate: Callable[[Candidate, EffectLiteral, Model], Candidate],
+    candidate_effects: List[EffectLiteral],
+    alpha: float,
+    max_steps: int,
+) -> SearchState:
+    if scheduling == 'speculative':
+        handle_effects = _SpeculativeSteps(context, name, create_wf, create_candidate, alpha)
+        try:
+            return _greedy_search(state, handle_effects, candidate_effects, alpha, max_steps)
+        finally:
+            handle_effects.cancel()
+
+    def handle_barrier_step(
+        step: int, parent: Candidate, candidate_effects: List[EffectLiteral], index_offset: int
+    ):
+        wf = create_wf(parent, candidate_effects, index_offset)
+        new_candidate_models = call_workflow(wf, f'{name}-{step}', context)
+
+        return [
+            create_candidate(parent, effect, model)
+            for model, effect in zip(new_candidate_models, candidate_effects)
+        ]
+
+    return _greedy_search(state, handle_barrier_step, candidate_effects, alpha, max_steps)
+
+
+class _SpeculativeSteps:
+    """Fit the candidates of a step and speculatively start the next step
+
+    The candidates of a step are ranked as their fits finish. Whenever the
+    provisional best candidate changes, the candidates of the next step are
+    started from it with a lower priority than the candidates of the current
+    step and the speculative fits from the previous provisional best candidate
+    are cancelled. Speculative candidates are built in the same way as the
+    candidates of the next step so that the latter reuse the speculative fits,
+    since identical models are only fitted once per tool run.
+
+    Cancelling only stops speculative tasks that have not started yet.
+    """
+
+    def __init__(
+        self,
+        context,
+        name: str,
+        create_wf: Callable[..., Workflow],
+        create_candidate: Callable[[Candidate, EffectLiteral, Model], Candidate],
+        alpha: float,
+    ):
+        self._context = context
+        self._name = name
+        self._create_wf = create_wf
+        self._create_candidate = create_candidate
+        self._alpha = alpha
+        self._speculative = []
+        self._speculation_count = count(1)
+
+    def __call__(
+        self,
+        step: int,
+        parent: Candidate,
+        candidate_effects: List[EffectLiteral],
+        index_offset: int,
+    ) -> List[Candidate]:
+        futures = [
+            submit_workflow(
+                self._create_wf(parent, [effect], index_offset + i),
+                f'{self._name}-{step}-{i}',
+                self._context,
+            )
+            for i, effect in enumerate(candidate_effects)
+        ]
+        # NOTE The candidates of this step that were started speculatively are
+        # already running or will be fitted by the tasks submitted above
+        self.cancel()
+
+        index = {future: i for i, future in enumerate(futures)}
+        models: List[Optional[Model]] = [None] * len(futures)
+        provisional_best = parent.model
+        n_done = 0
+        for future in as_completed(futures):
+            (models[index[future]],) = future.result()
+            n_done += 1
+            if n_done == len(futures):
+                break
+            best = _provisional_best(parent.model, models, self._alpha)
+            if best is not provisional_best:
+                provisional_best = best
+                self.cancel()
+                if best is not parent.model:
+                    best_index = next(i for i, model in enumerate(models) if model is best)
+                    self._speculate(parent, candidate_effects, models, best_index)
+
+        return [
+            self._create_candidate(parent, effect, model)
+            for model, effect in zip(models, candidate_effects)
+        ]
+
+    def _speculate(
+        self,
+        parent: Candidate,
+        candidate_effects: List[EffectLiteral],
+        models: List[Optional[Model]],
+        best_index: int,
+    ):
+        best_candidate = self._create_candidate(
+            parent, candidate_effects[best_index], models[best_index]
+        )
+        next_effects = _compatible_effects(candidate_effects, best_candidate.steps[-1].effect)
+
+        # NOTE Effects that gave the largest drop in OFV in this step are started first
+        ofvs = {
+            effect: _ofv(model)
+            for effect, model in zip(candidate_effects, models)
+            if model is not None
+        }
+        ranked = sorted(next_effects, key=lambda effect: ofvs.get(effect, np.inf))
+
+        for rank, effect in enumerate(ranked, 1):
+            n = next(self._speculation_count)
+            wf = self._create_wf(best_candidate, [effect], n - 1, 'covsearch_speculative')
+            future = submit_workflow(
+                wf, f'{self._name}-speculative{n}', self._context, priority=-rank
+            )
+            self._speculative.append(future)
+
+    def cancel(self):
+        """Cancel the speculative fits that have not started"""
+        for future in self._speculative:
+            future.cancel()
+        self._speculative = []
+
+
+def _ofv(model: Model) -> float:
+    return np.nan if (mfr := model.modelfit_results) is None else mfr.ofv
+
+
+def _provisional_best(parent: Model, models: List[Optional[Model]], alpha: float) -> Model:
+    done = [model for model in models if model is not None]
+    # NOTE We assume parent.modelfit_results is not None
+    assert parent.modelfit_results is not None
+    return lrt_best_of_many(
+        parent, done, parent.modelfit_results.ofv, [_ofv(model) for model in done], alpha
+    )
+
+
+def _compatible_effects(
+    candidate_effects: List[EffectLiteral], last_step_effect: Effect
+) -> List[EffectLiteral]:
+    return [
+        effect
+        for effect in candidate_effects
+        if effect[0] != last_step_effect.parameter or effect[1] != last_step_effect.covariate
+    ]
+
+
 def _greedy_search(
     state: SearchState,
     handle_effects: Callable[[int, Candidate, List[EffectLiteral], int], List[Candidate]],
@@ -290,10 +491,7 @@ def _greedy_search(
         new_candidate_models = list(map(lambda candidate: candidate.model, new_candidates))
 
         parent = best_candidate_so_far.model
-        ofvs = [
-            np.nan if (mfr := model.modelfit_results) is None else mfr.ofv
-            for model in new_candidate_models
-        ]
+        ofvs = [_ofv(model) for model in new_candidate_models]
         # NOTE We assume parent.modelfit_results is not None
         assert parent.modelfit_results is not None
         best_model_so_far = lrt_best_of_many(
@@ -310,11 +508,7 @@ def _greedy_search(
         # NOTE Filter out incompatible effects
         last_step_effect = best_candidate_so_far.steps[-1].effect
 
-        candidate_effects = [
-            effect
-            for effect in candidate_effects
-            if effect[0] != last_step_effect.parameter or effect[1] != last_step_effect.covariate
-        ]
+        candidate_effects = _compatible_effects(candidate_effects, last_step_effect)
 
     return SearchState(
         state.start_model,
@@ -323,8 +517,36 @@ def _greedy_search(
     )
 
 
+def _check_scheduling(scheduling: str) -> str:
+    # NOTE Identical fits are only shared between the tasks of a process or through the
+    # fit cache. Without sharing every speculative candidate would be fitted twice.
+    if scheduling == 'speculative' and _in_worker_process() and get_fit_cache() is None:
+        warnings.warn(
+            'Speculative scheduling needs a dispatcher running all tasks in one process or '
+            'a fit cache. Falling back to barrier scheduling.'
+        )
+        return 'barrier'
+    return scheduling
+
+
+def _in_worker_process() -> bool:
+    # NOTE The worker processes of a multi-process dask cluster are daemonic
+    return multiprocessing.current_process().daemon
+
+
+def _deduplicate(scheduling: str) -> Optional[bool]:
+    # NOTE Speculative scheduling relies on the candidates of the next step reusing
+    # the identical speculative fits
+    return True if scheduling == 'speculative' else None
+
+
 def wf_effects_addition(
-    model: Model, candidate: Candidate, candidate_effects: List[EffectLiteral], index_offset: int
+    model: Model,
+    candidate: Candidate,
+    candidate_effects: List[EffectLiteral],
+    index_offset: int,
+    name_prefix: str = 'covsearch_run',
+    deduplicate: Optional[bool] = None,
 ):
     wf = Workflow()
 
@@ -335,11 +557,11 @@ def wf_effects_addition(
             model,
             candidate,
             effect,
-            index_offset + i,
+            f'{name_prefix}{index_offset + i}',
         )
         wf.add_task(task)
 
-    wf_fit = create_fit_workflow(n=len(candidate_effects))
+    wf_fit = create_fit_workflow(n=len(candidate_effects), deduplicate=deduplicate)
     wf.insert_workflow(wf_fit)
 
     task_gather = Task('gather', lambda *models: models)
@@ -347,10 +569,8 @@ def wf_effects_addition(
     return wf
 
 
-def task_add_covariate_effect(
-    model: Model, candidate: Candidate, effect: EffectLiteral, effect_index: int
-):
-    model_with_added_effect = copy_model(model, name=f'covsearch_run{effect_index}')
+def task_add_covariate_effect(model: Model, candidate: Candidate, effect: EffectLiteral, name: str):
+    model_with_added_effect = copy_model(model, name=name)
     model_with_added_effect.description = _create_description(effect, candidate.steps)
     model_with_added_effect.parent_model = model.name
     update_initial_estimates(model_with_added_effect)
@@ -387,7 +607,12 @@ def _create_description(
 
 
 def wf_effects_removal(
-    base_model: Model, parent: Candidate, candidate_effects: List[EffectLiteral], index_offset: int
+    base_model: Model,
+    parent: Candidate,
+    candidate_effects: List[EffectLiteral],
+    index_offset: int,
+    name_prefix: str = 'covsearch_run',
+    deduplicate: Optional[bool] = None,
 ):
     wf = Workflow()
 
@@ -398,11 +623,11 @@ def wf_effects_removal(
             base_model,
             parent,
             effect,
-            index_offset + i,
+            f'{name_prefix}{index_offset + i}',
         )
         wf.add_task(task)
 
-    wf_fit = create_fit_workflow(n=len(candidate_effects))
+    wf_fit = create_fit_workflow(n=len(candidate_effects), deduplicate=deduplicate)
     wf.insert_workflow(wf_fit)
 
     task_gather = Task('gather', lambda *models: models)
@@ -411,10 +636,10 @@ def wf_effects_removal(
 
 
 def task_remove_covariate_effect(
-    base_model: Model, candidate: Candidate, effect: EffectLiteral, effect_index: int
+    base_model: Model, candidate: Candidate, effect: EffectLiteral, name: str
 ):
     model = candidate.model
-    model_with_removed_effect = copy_model(base_model, name=f'covsearch_run{effect_index}')
+    model_with_removed_effect = copy_model(base_model, name=name)
     model_with_removed_effect.description = _create_description(
         effect, candidate.steps, forward=False
     )
@@ -536,12 +761,17 @@ def _make_df_steps_row(
 
 @with_runtime_arguments_type_check
 @with_same_arguments_as(create_workflow)
-def validate_input(effects, p_forward, p_backward, algorithm, model):
+def validate_input(effects, p_forward, p_backward, algorithm, model, scheduling):
     if algorithm not in ALGORITHMS:
         raise ValueError(
             f'Invalid `algorithm`: got `{algorithm}`, must be one of {sorted(ALGORITHMS)}.'
         )
 
+    if scheduling not in SCHEDULINGS:
+        raise ValueError(
+            f'Invalid `scheduling`: got `{scheduling}`, must be one of {sorted(SCHEDULINGS)}.'
+        )
+
     if not 0 < p_forward <= 1:
         raise ValueError(
             f'Invalid `p_forward`: got `{p_forward}`, must be a float in range (0, 1].'
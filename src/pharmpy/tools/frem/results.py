@@ -7,7 +7,8 @@ from typing import Any, Optional
 from pharmpy.deps import altair as alt
 from pharmpy.deps import numpy as np
 from pharmpy.deps import pandas as pd
-from pharmpy.deps import symengine, sympy
+from pharmpy.deps import sympy
+from pharmpy.internals.expr.eval import lambdify_with_arguments
 from pharmpy.internals.expr.subs import subs
 from pharmpy.internals.math import (
     conditional_joint_normal,
@@ -610,68 +611,69 @@ def calculate_results_from_samples(frem_model, continuous, categorical, parvecs,
     coefficients = pd.DataFrame(index=coefficients_index, columns=covariates, dtype=np.float64)
     parameter_variability = []
 
-    # Switch to symengine for speed
-    # Could also assume order of parameters, but not much gain
-    sigma_symb = symengine.sympify(sigma_symb)
-    parvecs.columns = [symengine.Symbol(colname) for colname in parvecs.columns]
-
     estimated_covbase = _calculate_covariate_baselines(frem_model, covariates)
     covbase = estimated_covbase.to_numpy()
 
     parameter_variability_all = None
 
-    for sample_no, params in parvecs.iterrows():
-        sigma = sigma_symb.subs(dict(params))
-        sigma = np.array(sigma).astype(np.float64)
-        if scaling is not None:
-            sigma = scaling @ sigma @ scaling
-        if sample_no != 'estimates':
-            variability[sample_no, 0, :] = np.diag(sigma)[:npars]
+    # Evaluate the omega matrix for all samples at once giving an array of shape (n + 1, k, k)
+    sigmas = _evaluate_matrix_for_samples(sigma_symb, parvecs)
+    if scaling is not None:
+        sigmas = scaling @ sigmas @ scaling
+    is_estimates = parvecs.index == 'estimates'
+    sample_nos = np.asarray(parvecs.index[~is_estimates], dtype=int)
+    samples_sigma = sigmas[~is_estimates]
+    sigma = sigmas[is_estimates][-1]
+
+    variability[sample_nos, 0, :] = np.diagonal(samples_sigma, axis1=1, axis2=2)[:, :npars]
+    original_variability[0, :] = np.diag(sigma)[:npars]
+    # Coefficients conditioned on all parameters
+    # Sigma_12 * Sigma_22^-1
+    coeffs_all = sigma[0:npars, npars:] @ np.linalg.inv(sigma[npars:, npars:])
+    coefficients.loc['all'] = coeffs_all
+
+    for i, cov in enumerate(covariates):
+        indices = param_indices + [i + npars]
+        cov_mu = np.array([0] * npars + [cov_refs[cov]])
+        if cov in categorical:
+            first_reference = cov_others[cov]
         else:
-            original_variability[0, :] = np.diag(sigma)[:npars]
-            # Coefficients conditioned on all parameters
-            # Sigma_12 * Sigma_22^-1
-            coeffs_all = sigma[0:npars, npars:] @ np.linalg.inv(sigma[npars:, npars:])
-            coefficients.loc['all'] = coeffs_all
-        for i, cov in enumerate(covariates):
-            indices = param_indices + [i + npars]
-            cov_sigma = sigma[indices][:, indices]
-            cov_mu = np.array([0] * npars + [cov_refs[cov]])
-            if cov in categorical:
-                first_reference = cov_others[cov]
-            else:
-                first_reference = cov_5th[cov]
-            mu_bar_given_5th_cov, sigma_bar = conditional_joint_normal(
-                cov_mu, cov_sigma, np.array([first_reference])
-            )
-            if sample_no != 'estimates':
-                mu_bar_given_95th_cov, _ = conditional_joint_normal(
-                    cov_mu, cov_sigma, np.array([cov_95th[cov]])
-                )
-                mu_bars_given_5th[sample_no, i, :] = mu_bar_given_5th_cov
-                mu_bars_given_95th[sample_no, i, :] = mu_bar_given_95th_cov
-                variability[sample_no, i + 1, :] = np.diag(sigma_bar)
-            else:
-                original_variability[i + 1, :] = np.diag(sigma_bar)
-                parameter_variability.append(sigma_bar)
-                # Calculate coefficients
-                # Cov(Par, covariate) / Var(covariate)
-                for parind, parname in enumerate(param_names):
-                    coefficients[cov]['each', parname] = cov_sigma[parind][-1] / cov_sigma[-1][-1]
+            first_reference = cov_5th[cov]
 
+        cov_sigmas = samples_sigma[:, indices][:, :, indices]
+        mu_bar_given_5th_cov, sigma_bar = conditional_joint_normal(
+            cov_mu, cov_sigmas, np.array([first_reference])
+        )
+        mu_bar_given_95th_cov, _ = conditional_joint_normal(
+            cov_mu, cov_sigmas, np.array([cov_95th[cov]])
+        )
+        mu_bars_given_5th[sample_nos, i, :] = mu_bar_given_5th_cov
+        mu_bars_given_95th[sample_nos, i, :] = mu_bar_given_95th_cov
+        variability[sample_nos, i + 1, :] = np.diagonal(sigma_bar, axis1=1, axis2=2)
+
+        cov_sigma = sigma[indices][:, indices]
+        _, sigma_bar = conditional_joint_normal(cov_mu, cov_sigma, np.array([first_reference]))
+        original_variability[i + 1, :] = np.diag(sigma_bar)
+        parameter_variability.append(sigma_bar)
+        # Calculate coefficients
+        # Cov(Par, covariate) / Var(covariate)
+        for parind, parname in enumerate(param_names):
+            coefficients[cov]['each', parname] = cov_sigma[parind][-1] / cov_sigma[-1][-1]
+
+    if nids > 0:
         id_mu = np.array([0] * npars + list(cov_refs))
+        assert covbase.shape[1] + npars == len(id_mu)
+
+        cjn = conditional_joint_normal_lambda(id_mu, samples_sigma, npars)
+        mu_id_bar, sigma_id_bar = cjn(covbase)
+        mu_id_bars[sample_nos] = mu_id_bar
+        variability[sample_nos, -1, :] = np.diagonal(sigma_id_bar, axis1=1, axis2=2)
+
         cjn = conditional_joint_normal_lambda(id_mu, sigma, npars)
-        for i in range(len(estimated_covbase)):
-            row = covbase[i, :]
-            assert npars + len(row) == len(id_mu)
-            mu_id_bar, sigma_id_bar = cjn(row)
-            if sample_no != 'estimates':
-                mu_id_bars[sample_no, i, :] = mu_id_bar
-                variability[sample_no, -1, :] = np.diag(sigma_id_bar)
-            else:
-                original_id_bar[i, :] = mu_id_bar
-                original_variability[ncovs + 1, :] = np.diag(sigma_id_bar)
-                parameter_variability_all = sigma_id_bar
+        mu_id_bar, sigma_id_bar = cjn(covbase)
+        original_id_bar[:, :] = mu_id_bar
+        original_variability[ncovs + 1, :] = np.diag(sigma_id_bar)
+        parameter_variability_all = sigma_id_bar
 
     # Create covariate effects table
     mu_bars_given_5th = np.exp(mu_bars_given_5th)
@@ -815,6 +817,20 @@ def calculate_results_from_samples(frem_model, continuous, categorical, parvecs,
     )
 
 
+def _evaluate_matrix_for_samples(matrix, parvecs):
+    # Evaluate a symbolic matrix for each row in parvecs giving an array of shape (n, k, k)
+    symbols = [sympy.Symbol(name) for name in parvecs.columns]
+    values = [parvecs[name].to_numpy(dtype=np.float64) for name in parvecs.columns]
+    n = len(parvecs)
+    a = np.empty((n, matrix.rows, matrix.cols))
+    for (row, col), expr in np.ndenumerate(np.array(matrix, dtype=object)):
+        if expr.free_symbols:
+            a[:, row, col] = lambdify_with_arguments(expr, symbols)(*values)
+        else:
+            a[:, row, col] = float(expr)
+    return a
+
+
 def get_params(frem_model, rvs, npars):
     param_names = rvs[:npars]
     sset = frem_model.statements.before_odes
@@ -1,6 +1,7 @@
-from typing import Dict, Tuple
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 import pharmpy.tools.modelfit as modelfit
+from pharmpy.deps import numpy as np
 from pharmpy.internals.expr.subs import subs
 from pharmpy.internals.set.partitions import partitions
 from pharmpy.internals.set.subsets import non_empty_subsets
@@ -12,6 +13,11 @@ from pharmpy.results import mfr
 from pharmpy.tools.common import update_initial_estimates
 from pharmpy.workflows import Task, Workflow
 
+_BlockStructureKey = FrozenSet[FrozenSet[str]]
+
+# NOTE Etas with an estimated variance below this are not put in blocks
+_NEAR_ZERO_VARIANCE = 1e-4
+
 
 def brute_force_no_of_etas(base_model, index_offset=0):
     wf = Workflow()
@@ -39,7 +45,13 @@ def brute_force_no_of_etas(base_model, index_offset=0):
     return wf
 
 
-def brute_force_block_structure(base_model, index_offset=0):
+def brute_force_block_structure(
+    base_model,
+    index_offset=0,
+    keep_blocks: Optional[Sequence[Sequence[str]]] = None,
+    max_candidates: Optional[int] = None,
+    block_structures_so_far: Optional[Set[_BlockStructureKey]] = None,
+):
     wf = Workflow()
 
     base_model.description = create_description(base_model)
@@ -47,9 +59,27 @@ def brute_force_block_structure(base_model, index_offset=0):
     iivs = base_model.random_variables.iiv
     model_no = 1 + index_offset
 
-    for block_structure in _rv_block_structures(iivs):
-        if _is_rv_block_structure(iivs, block_structure):
-            continue
+    # NOTE Etas with a fixed or near zero variance are kept on the diagonal
+    kept = [(eta,) for eta in _diagonal_etas(base_model)]
+    if keep_blocks is not None:
+        kept.extend(tuple(eta for eta in block if eta in iivs.names) for block in keep_blocks)
+
+    block_structures = [
+        block_structure
+        for block_structure in _rv_block_structures(iivs, kept)
+        if not _is_rv_block_structure(iivs, block_structure)
+        and (
+            block_structures_so_far is None
+            or _block_structure_key(block_structure) not in block_structures_so_far
+        )
+    ]
+
+    if max_candidates is not None:
+        block_structures = _rank_block_structures(base_model, block_structures)[:max_candidates]
+
+    for block_structure in block_structures:
+        if block_structures_so_far is not None:
+            block_structures_so_far.add(_block_structure_key(block_structure))
 
         model_name = f'iivsearch_run{model_no}'
         task_copy = Task('copy', copy, model_name)
@@ -71,9 +101,88 @@ def brute_force_block_structure(base_model, index_offset=0):
     return wf
 
 
-def _rv_block_structures(etas: RandomVariables):
-    # NOTE All possible partitions of etas into block structures
-    return partitions(etas.names)
+def _rv_block_structures(
+    etas: RandomVariables, kept: Iterable[Tuple[str, ...]] = ()
+) -> Iterator[Tuple[Tuple[str, ...], ...]]:
+    # NOTE All possible partitions of etas into block structures where the
+    # kept blocks are part of all partitions
+    kept_blocks = []
+    kept_etas = set()
+    for block in kept:
+        block = tuple(eta for eta in block if eta not in kept_etas)
+        if block:
+            kept_blocks.append(block)
+            kept_etas.update(block)
+
+    if not kept_blocks:
+        yield from partitions(etas.names)
+        return
+
+    free_etas = [eta for eta in etas.names if eta not in kept_etas]
+    for partition in partitions(free_etas):
+        yield tuple(sorted(partition + tuple(kept_blocks), key=lambda part: (len(part), part)))
+
+
+def _block_structure_key(partition: Tuple[Tuple[str, ...], ...]) -> _BlockStructureKey:
+    return frozenset(map(frozenset, partition))
+
+
+def _model_block_structure_key(model: Model) -> _BlockStructureKey:
+    return _block_structure_key(tuple(dist.names for dist in model.random_variables.iiv))
+
+
+def _diagonal_etas(model: Model) -> List[str]:
+    # Etas with a fixed or a near zero estimated variance
+    res = model.modelfit_results
+    estimates = res.parameter_estimates if res is not None else None
+    params = model.parameters
+    etas = []
+    for eta in model.random_variables.iiv.names:
+        variance = model.random_variables[eta].get_variance(eta)
+        if variance not in params.symbols:
+            continue
+        param = params[variance]
+        if param.fix:
+            etas.append(eta)
+        elif estimates is not None and param.name in estimates.index:
+            if abs(estimates[param.name]) < _NEAR_ZERO_VARIANCE:
+                etas.append(eta)
+    return etas
+
+
+def _rank_block_structures(
+    model: Model, block_structures: List[Tuple[Tuple[str, ...], ...]]
+) -> List[Tuple[Tuple[str, ...], ...]]:
+    # NOTE The block structures are ranked on the BIC gain expected from the
+    # correlations of the individual estimates of the model. For a block this is
+    # the likelihood ratio of a multivariate normal distribution with and without
+    # the correlations, minus the BIC penalty of the covariance parameters.
+    res = model.modelfit_results
+    ie = res.individual_estimates if res is not None else None
+    if ie is None:
+        return block_structures
+
+    names = model.random_variables.iiv.names
+    columns = [name for name in names if name in ie.columns]
+    corr = ie[columns].corr().reindex(index=names, columns=names).fillna(0).to_numpy()
+    np.fill_diagonal(corr, 1)
+    n = len(ie.index)
+    index = {name: i for i, name in enumerate(names)}
+
+    def gain(partition):
+        total = 0.0
+        for part in partition:
+            if len(part) == 1:
+                continue
+            ix = [index[eta] for eta in part]
+            sign, logdet = np.linalg.slogdet(corr[np.ix_(ix, ix)])
+            if sign <= 0:
+                return -np.inf
+            k = len(part)
+            total += -n * logdet - np.log(n) * k * (k - 1) / 2
+        return total
+
+    return sorted(block_structures, key=gain, reverse=True)
 
 
 def _is_rv_block_structure(etas: RandomVariables, partition: Tuple[Tuple[str, ...], ...]):
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 import warnings
-from dataclasses import dataclass, replace
-from typing import List, Optional, Set, Union
+from dataclasses import dataclass, field, replace
+from typing import FrozenSet, List, Optional, Set, Union
 
 import pharmpy.tools.iivsearch.algorithms as algorithms
 from pharmpy.deps import pandas as pd
@@ -26,6 +26,7 @@ class State:
     algorithm: str
     model_names_so_far: Set[str]
     input_model_name: List[str]
+    block_structures_so_far: Set[FrozenSet[FrozenSet[str]]] = field(default_factory=set)
 
 
 def create_workflow(
@@ -35,6 +36,8 @@ def create_workflow(
     cutoff: Optional[Union[float, int]] = None,
     results: Optional[ModelfitResults] = None,
     model: Optional[Model] = None,
+    keep_blocks: Optional[List[List[str]]] = None,
+    max_block_candidates: Optional[int] = None,
 ):
     """Run IIVsearch tool. For more details, see :ref:`iivsearch`.
 
@@ -54,6 +57,14 @@ def create_workflow(
         Results for model
     model : Model
         Pharmpy model
+    keep_blocks : list
+        Blocks of etas (given by name) that will be kept in all candidates of the block
+        structure search. A block of one eta keeps that eta on the diagonal. Default is None
+        (all block structures are tried)
+    max_block_candidates : int
+        Maximum number of candidates of the block structure search. The block structures
+        are ranked on the correlations between the individual estimates of the base model.
+        Default is None (all block structures are tried)
 
     Returns
     -------
@@ -70,14 +81,33 @@ def create_workflow(
 
     wf = Workflow()
     wf.name = 'iivsearch'
-    start_task = Task('start_iiv', start, model, algorithm, iiv_strategy, rank_type, cutoff)
+    start_task = Task(
+        'start_iiv',
+        start,
+        model,
+        algorithm,
+        iiv_strategy,
+        rank_type,
+        cutoff,
+        keep_blocks,
+        max_block_candidates,
+    )
     wf.add_task(start_task)
     task_results = Task('results', _results)
     wf.add_task(task_results, predecessors=[start_task])
     return wf
 
 
-def create_algorithm_workflow(input_model, base_model, state, iiv_strategy, rank_type, cutoff):
+def create_algorithm_workflow(
+    input_model,
+    base_model,
+    state,
+    iiv_strategy,
+    rank_type,
+    cutoff,
+    keep_blocks=None,
+    max_block_candidates=None,
+):
     wf: Workflow[IIVSearchResults] = Workflow()
 
     start_task = Task(f'start_{state.algorithm}', _start_algorithm, base_model)
@@ -94,7 +124,16 @@ def create_algorithm_workflow(input_model, base_model, state, iiv_strategy, rank
         [model_name for model_name in state.model_names_so_far if 'base' not in model_name]
     )
     algorithm_func = getattr(algorithms, state.algorithm)
-    wf_method = algorithm_func(base_model, index_offset)
+    if state.algorithm == 'brute_force_block_structure':
+        wf_method = algorithm_func(
+            base_model,
+            index_offset,
+            keep_blocks,
+            max_block_candidates,
+            state.block_structures_so_far,
+        )
+    else:
+        wf_method = algorithm_func(base_model, index_offset)
     wf.insert_workflow(wf_method)
 
     task_result = Task(
@@ -107,7 +146,16 @@ def create_algorithm_workflow(input_model, base_model, state, iiv_strategy, rank
     return wf
 
 
-def start(context, input_model, algorithm, iiv_strategy, rank_type, cutoff):
+def start(
+    context,
+    input_model,
+    algorithm,
+    iiv_strategy,
+    rank_type,
+    cutoff,
+    keep_blocks=None,
+    max_block_candidates=None,
+):
     if iiv_strategy != 'no_add':
         model_iiv = copy_model(input_model, 'base_model')
         _add_iiv(iiv_strategy, model_iiv)
@@ -123,20 +171,30 @@ def start(context, input_model, algorithm, iiv_strategy, rank_type, cutoff):
 
     models = []
     models_set = set()
+    # NOTE Block structures that have been fitted are not fitted again in later steps
+    block_structures_set = {algorithms._model_block_structure_key(base_model)}
     last_res = None
     final_model = None
 
     for i, algorithm_cur in enumerate(list_of_algorithms):
-        state = State(algorithm_cur, models_set, input_model.name)
+        state = State(algorithm_cur, models_set, input_model.name, block_structures_set)
         # NOTE Execute algorithm
         wf = create_algorithm_workflow(
-            input_model, base_model, state, iiv_strategy, rank_type, cutoff
+            input_model,
+            base_model,
+            state,
+            iiv_strategy,
+            rank_type,
+            cutoff,
+            keep_blocks,
+            max_block_candidates,
         )
         res = call_workflow(wf, f'results_{algorithm}', context)
         # NOTE Append results
         new_models = list(filter(lambda model: model.name not in models_set, res.models))
         models.extend(new_models)
         models_set.update(model.name for model in new_models)
+        block_structures_set.update(map(algorithms._model_block_structure_key, new_models))
 
         if i == 0:
             # Have input model as first row in summary of models as step 0
@@ -254,6 +312,9 @@ def validate_input(
     algorithm,
     iiv_strategy,
     rank_type,
+    model,
+    keep_blocks,
+    max_block_candidates,
 ):
     if algorithm not in IIV_ALGORITHMS:
         raise ValueError(
@@ -271,6 +332,26 @@ def validate_input(
             f' must be one of {sorted(IIV_STRATEGIES)}.'
         )
 
+    if max_block_candidates is not None and max_block_candidates < 1:
+        raise ValueError(
+            f'Invalid `max_block_candidates`: got `{max_block_candidates}`, must be at least 1.'
+        )
+
+    if keep_blocks is not None:
+        etas = [eta for block in keep_blocks for eta in block]
+        if len(etas) != len(set(etas)):
+            raise ValueError(
+                f'Invalid `keep_blocks`: etas are in more than one block {keep_blocks}'
+            )
+        # NOTE Etas added by the iiv strategy are not in the input model
+        if model is not None and iiv_strategy == 'no_add':
+            iiv_names = model.random_variables.iiv.names
+            unknown = [eta for eta in etas if eta not in iiv_names]
+            if unknown:
+                raise ValueError(
+                    f'Invalid `keep_blocks`: {unknown} are not iiv etas of the model {iiv_names}'
+                )
+
 
 @dataclass(frozen=True)
 class IIVSearchResults(ToolResults):
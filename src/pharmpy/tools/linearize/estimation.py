@@ -0,0 +1,185 @@
+"""Built-in estimation of linearized models
+
+A linearized model is a first order Taylor expansion of a model in its ETAs and
+EPSILONs around the individual estimates of the original model. The model
+function of each observation is then given by a handful of numbers from the
+tables of the original model, i.e. the conditional individual prediction, the
+derivatives with respect to the ETAs and the EPSILONs and the cross derivatives.
+
+These are put into dense arrays with one row per individual, padded to the
+largest number of observations, and the model is estimated with FOCE with
+interaction in-process, see pharmpy.internals.foce.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from pharmpy.deps import numpy as np
+from pharmpy.deps import pandas as pd
+from pharmpy.deps import sympy
+from pharmpy.internals import foce
+from pharmpy.internals.expr.eval import lambdify_with_arguments
+from pharmpy.model import Model
+from pharmpy.results import ModelfitResults
+
+
+def estimate(model: Model) -> Optional[ModelfitResults]:
+    """Estimate the parameters of a linearized model
+
+    Parameters
+    ----------
+    model : Model
+        Linearized model as created by create_linearized_model. The dataset must have
+        the columns ID, DV, OPRED, D_ETAi, OETAi, D_EPSj and D_EPSETAj_i for all ETAs
+        i and EPSILONs j.
+
+    Returns
+    -------
+    ModelfitResults
+        Results of the estimation or None if the model could not be estimated
+    """
+    try:
+        objective = _Objective(model)
+    except ValueError:
+        return None
+
+    evaluated_ofv, _, _ = objective.evaluate(objective.parameter_values(objective.x0))
+    minimized = foce.minimize(objective)
+    if minimized is None:
+        return None
+    res, success = minimized
+
+    values = objective.parameter_values(res.x)
+    ofv, eta, iofv = objective.evaluate(values)
+    pe = pd.Series(values, index=objective.parameter_names, name='estimates')
+    ie = pd.DataFrame(eta, index=objective.ids, columns=objective.eta_names)
+    ie.index.name = 'ID'
+    iofv = pd.Series(iofv, index=objective.ids, name='iOFV')
+    iofv.index.name = 'ID'
+    ofv_iterations = pd.Series(
+        [evaluated_ofv, ofv],
+        index=pd.MultiIndex.from_tuples([(1, 0), (1, res.nit)], names=['steps', 'iteration']),
+        name='OFV',
+    )
+    return ModelfitResults(
+        name=model.name,
+        description=model.description,
+        ofv=ofv,
+        ofv_iterations=ofv_iterations,
+        parameter_estimates=pe,
+        individual_estimates=ie,
+        individual_ofv=iofv,
+        minimization_successful=success,
+        function_evaluations=objective.evaluations,
+    )
+
+
+class _Objective(foce.Objective):
+    """Objective function value of a linearized model as a function of its transformed
+    free variability parameters
+
+    Raises ValueError for models that cannot be estimated.
+    """
+
+    def __init__(self, model: Model):
+        rvs = model.random_variables
+        etas, epsilons = rvs.etas, rvs.epsilons
+        self.eta_names = etas.names
+        k, m = len(etas), len(epsilons)
+
+        params = model.parameters
+        param_symbs = [sympy.Symbol(name) for name in params.names]
+        self._omega_fn = lambdify_with_arguments(sympy.Tuple(*etas.covariance_matrix), param_symbs)
+        self._sigma_fn = lambdify_with_arguments(
+            sympy.Tuple(*epsilons.covariance_matrix), param_symbs
+        )
+        self._shape = (k, m)
+
+        df = model.dataset
+        if df is None:
+            raise ValueError('Model has no dataset')
+        if 'MDV' in df.columns:
+            df = df[df['MDV'] == 0]
+        columns = {
+            'opred': ['OPRED'],
+            'g': [f'D_ETA{i}' for i in range(1, k + 1)],
+            'oeta': [f'OETA{i}' for i in range(1, k + 1)],
+            'h': [f'D_EPS{j}' for j in range(1, m + 1)],
+            'he': [f'D_EPSETA{j}_{i}' for j in range(1, m + 1) for i in range(1, k + 1)],
+        }
+        needed = ['ID', 'DV'] + [col for cols in columns.values() for col in cols]
+        if any(col not in df.columns for col in needed):
+            raise ValueError('Dataset does not have all derivatives of the linearized model')
+
+        # NOTE Observation t of individual i goes into row i and column t of the arrays.
+        # Padding has a residual variance of one and all derivatives zero so that it does
+        # not contribute to the objective function value.
+        codes, ids = pd.factorize(df['ID'])
+        self.ids = pd.Index(ids)
+        n = len(ids)
+        obs = df.groupby(codes).cumcount().to_numpy()
+        shape = (n, obs.max() + 1 if len(obs) else 0)
+        self._mask = np.zeros(shape, dtype=bool)
+        self._mask[codes, obs] = True
+
+        def dense(cols):
+            x = np.zeros(shape + (len(cols),))
+            x[codes, obs] = df[cols].to_numpy(dtype=np.float64)
+            return x
+
+        self._y = dense(['DV'])[..., 0]
+        self._opred = dense(columns['opred'])[..., 0]
+        self._g = dense(columns['g'])
+        self._h = dense(columns['h'])
+        self._he = dense(columns['he']).reshape(shape + (m, k))
+        oeta = df[columns['oeta']].to_numpy(dtype=np.float64)
+        self._oeta = np.zeros((n, k))
+        self._oeta[codes] = oeta
+
+        super().__init__(params, set(rvs.variance_parameters), n, k, free=set(rvs.parameter_names))
+
+    def _omega(self, values):
+        k, m = self._shape
+        sigma = np.array(self._sigma_fn(*values), dtype=np.float64).reshape(m, m)
+        try:
+            np.linalg.cholesky(sigma)
+        except np.linalg.LinAlgError:
+            return None
+        self._sigma = sigma
+        return np.array(self._omega_fn(*values), dtype=np.float64).reshape(k, k)
+
+    def _initial_etas(self):
+        # NOTE Always start from the point of linearization. The modes are close to it and
+        # the objective function value does not depend on earlier evaluations, which keeps
+        # the rounding errors small enough for the finite difference gradient
+        return self._oeta.copy()
+
+    def _individual(self, values, eta):
+        d = eta - self._oeta
+        f = self._opred + np.einsum('ntk,nk->nt', self._g, d)
+        h = self._h + np.einsum('ntjk,nk->ntj', self._he, d)
+        sh = h @ self._sigma
+        r = np.where(self._mask, np.sum(sh * h, axis=-1), 1.0)
+        # Derivatives of the residual variance with respect to the ETAs
+        q = 2 * np.einsum('ntj,ntjk->ntk', sh, self._he)
+
+        resid = self._y - f
+        ofv_obs = np.log(r) + resid**2 / r
+        grad_obs = (
+            q / r[..., np.newaxis]
+            - 2 * (resid / r)[..., np.newaxis] * self._g
+            - (resid**2 / r**2)[..., np.newaxis] * q
+        )
+        info_obs = (
+            self._g[..., :, np.newaxis]
+            * self._g[..., np.newaxis, :]
+            / r[..., np.newaxis, np.newaxis]
+            + 0.5
+            * q[..., :, np.newaxis]
+            * q[..., np.newaxis, :]
+            / (r**2)[..., np.newaxis, np.newaxis]
+        )
+        ofv_i = np.sum(ofv_obs, axis=1)
+        grad = np.sum(grad_obs, axis=1)
+        info = np.sum(info_obs, axis=1)
+        return ofv_i, grad, info
@@ -1,10 +1,39 @@
 import pharmpy.model
+from pharmpy.deps import numpy as np
+from pharmpy.deps import pandas as pd
 from pharmpy.deps import sympy
-from pharmpy.model import Assignment, EstimationStep, EstimationSteps, Statements
+from pharmpy.model import Assignment, EstimationStep, EstimationSteps, Parameters, Statements
+from pharmpy.modeling import get_mdv
 from pharmpy.workflows import Task, Workflow
 
+from .estimation import estimate
+from .results import calculate_results
+
 
 def create_workflow(model=None):
+    """Run linearize tool
+
+    The model is linearized around its individual estimates using the derivatives in
+    its tables and the linearized model is estimated in-process.
+
+    Parameters
+    ----------
+    model : Model
+        Pharmpy model. Needs modelfit results with individual estimates, conditional
+        individual predictions and derivatives with respect to all ETAs and EPSILONs.
+
+    Returns
+    -------
+    LinearizeResults
+        Linearize tool result object
+
+    Examples
+    --------
+    >>> from pharmpy.modeling import *
+    >>> model = load_example_model("pheno")
+    >>> from pharmpy.tools import run_tool # doctest: +SKIP
+    >>> res = run_tool("linearize", model)   # doctest: +SKIP
+    """
     wf = Workflow()
     wf.name = "linearize"
 
@@ -18,19 +47,25 @@ def create_workflow(model=None):
 
 
 def start_linearize(model):
-    return model
+    linbase = create_linearized_model(model)
+    linbase.dataset = _create_dataset(model)
+    linbase.modelfit_results = estimate(linbase)
+    if linbase.modelfit_results is None:
+        raise ValueError(f'Could not estimate the linearized model of {model.name}')
+    return calculate_results(model, linbase)
 
 
 def create_linearized_model(model):
     linbase = pharmpy.model.Model()
-    linbase.parameters = model.parameters
+    rv_params = set(model.random_variables.parameter_names)
+    linbase.parameters = Parameters([p for p in model.parameters if p.name in rv_params])
     linbase.random_variables = model.random_variables
 
     ms = []
     base_terms_sum = 0
     for i, eta in enumerate(model.random_variables.etas.names, start=1):
-        deta = sympy.Symbol("D_ETA1")
-        oeta = sympy.Symbol("OETA")
+        deta = sympy.Symbol(f"D_ETA{i}")
+        oeta = sympy.Symbol(f"OETA{i}")
         base = Assignment(sympy.Symbol(f'BASE{i}'), deta * (sympy.Symbol(eta) - oeta))
         ms.append(base)
         base_terms_sum += base.symbol
@@ -42,15 +77,16 @@ def create_linearized_model(model):
 
     i = 1
     err_terms_sum = 0
-    for epsno, eps in enumerate(model.random_variables.epsilons, start=1):
-        err = Assignment(sympy.Symbol(f'ERR{epsno}'), sympy.Symbol(f'D_EPS{epsno}'))
+    for epsno, eps in enumerate(model.random_variables.epsilons.names, start=1):
+        err = Assignment(sympy.Symbol(f'ERR{i}'), sympy.Symbol(eps) * sympy.Symbol(f'D_EPS{epsno}'))
         err_terms_sum += err.symbol
         ms.append(err)
         i += 1
         for etano, eta in enumerate(model.random_variables.etas.names, start=1):
             inter = Assignment(
                 sympy.Symbol(f'ERR{i}'),
-                sympy.Symbol(f'D_EPSETA{epsno}_{etano}')
+                sympy.Symbol(eps)
+                * sympy.Symbol(f'D_EPSETA{epsno}_{etano}')
                 * (sympy.Symbol(eta) - sympy.Symbol(f'OETA{etano}')),
             )
             err_terms_sum += inter.symbol
@@ -60,11 +96,70 @@ def create_linearized_model(model):
     ms.append(error_terms)
 
     y = model.dependent_variable
-    Assignment(y, ipred.symbol + error_terms.symbol)
+    ms.append(Assignment(y, ipred.symbol + error_terms.symbol))
     linbase.statements = Statements(ms)
+    linbase.dependent_variable = y
 
     linbase.name = 'linbase'
 
     est = EstimationStep('foce', interaction=True)
     linbase.estimation_steps = EstimationSteps([est])
     return linbase
+
+
+def _create_dataset(model):
+    # Dataset of the linearized model with one row per observation
+    res = model.modelfit_results
+    if res is None or res.derivatives is None:
+        raise ValueError('Need derivatives in the modelfit results of the model')
+    predictions = res.predictions
+    if predictions is not None and 'CIPREDI' in predictions:
+        ipredcol = 'CIPREDI'
+    elif predictions is not None and 'IPRED' in predictions:
+        ipredcol = 'IPRED'
+    else:
+        raise ValueError("Need CIPREDI or IPRED")
+    ie = res.individual_estimates
+    if ie is None:
+        raise ValueError('Need individual estimates in the modelfit results of the model')
+
+    # NOTE The tables have one row per record of the dataset
+    n = len(model.dataset)
+    if len(res.derivatives) != n or len(predictions) != n:
+        raise ValueError(
+            f'The derivatives ({len(res.derivatives)} rows) and predictions '
+            f'({len(predictions)} rows) do not match the dataset ({n} rows) of the model'
+        )
+    idcol = model.datainfo.id_column.name
+    ids = model.dataset[idcol].reset_index(drop=True)
+    if 'ID' in res.derivatives.index.names and not np.array_equal(
+        res.derivatives.index.get_level_values('ID').to_numpy(), ids.to_numpy()
+    ):
+        raise ValueError('The IDs of the derivatives do not match the dataset of the model')
+
+    derivatives = res.derivatives.reset_index(drop=True)
+    etas = model.random_variables.etas.names
+    epsilons = model.random_variables.epsilons.names
+    df = pd.DataFrame(
+        {
+            'ID': ids,
+            'DV': model.dataset[model.datainfo.dv_column.name].reset_index(drop=True),
+            'MDV': get_mdv(model).reset_index(drop=True),
+            'OPRED': predictions[ipredcol].reset_index(drop=True),
+        }
+    )
+    for i, eta in enumerate(etas, start=1):
+        if eta not in derivatives:
+            raise ValueError(f'Need the derivative with respect to {eta}')
+        df[f'D_ETA{i}'] = derivatives[eta]
+        df[f'OETA{i}'] = ie[eta].reindex(ids).to_numpy()
+    for j, eps in enumerate(epsilons, start=1):
+        if eps not in derivatives:
+            raise ValueError(f'Need the derivative with respect to {eps}')
+        df[f'D_EPS{j}'] = derivatives[eps]
+        for i, eta in enumerate(etas, start=1):
+            # NOTE Cross derivatives that are not in the table are taken as zero
+            cross = f'{eps};{eta}'
+            df[f'D_EPSETA{j}_{i}'] = derivatives[cross] if cross in derivatives else 0.0
+    df = df[df['MDV'] == 0].drop(columns=['MDV']).reset_index(drop=True)
+    return df
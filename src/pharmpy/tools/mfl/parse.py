@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import List
 
 from lark import Lark
@@ -7,8 +8,9 @@ from .interpreter import MFLInterpreter
 from .statement.statement import Statement
 
 
-def parse(code: str) -> List[Statement]:
-    parser = Lark(
+@lru_cache(maxsize=None)
+def _parser():
+    return Lark(
         grammar,
         start='start',
         parser='lalr',
@@ -20,6 +22,8 @@ def parse(code: str) -> List[Statement]:
         cache=True,
     )
 
-    tree = parser.parse(code)
+
+def parse(code: str) -> List[Statement]:
+    tree = _parser().parse(code)
 
     return MFLInterpreter().interpret(tree)
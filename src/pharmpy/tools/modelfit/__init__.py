@@ -11,7 +11,34 @@ r"""
      - 'nonmem'
      - str
      - Name of default estimation tool either 'nonmem' or 'nlmixr'
+   * - ``fit_cache``
+     - ``False``
+     - bool
+     - Whether results of fitted models should be cached and reused for identical models
+   * - ``fit_cache_path``
+     - User cache directory
+     - str
+     - Path to the directory of the fit cache
+   * - ``fit_cache_size``
+     - 10000
+     - int
+     - Maximum size of the fit cache in megabytes
+   * - ``fit_deduplication``
+     - ``False``
+     - bool
+     - Whether identical models in the same tool run should only be fitted once. The
+       duplicates get the modelfit results of the fitted model but no output files of
+       the estimation tool in the model database
+   * - ``warm_start_etas``
+     - ``False``
+     - bool
+     - Whether candidate models of the search tools should start from the individual
+       estimates of their parent model
 """
+from pathlib import Path
+
+import appdirs
+
 import pharmpy.config as config
 
 from .tool import create_fit_workflow, create_workflow
@@ -20,6 +47,27 @@ from .tool import create_fit_workflow, create_workflow
 class ModelfitConfiguration(config.Configuration):
     module = 'pharmpy.tools.modelfit'  # TODO: change default
     default_tool = config.ConfigItem('nonmem', 'Name of default estimation tool', cls=str)
+    fit_cache = config.ConfigItem(
+        False,
+        'Whether results of fitted models should be cached and reused for identical models',
+        cls=bool,
+    )
+    fit_cache_path = config.ConfigItem(
+        str(Path(appdirs.user_cache_dir(config.appname)) / 'modelfit'),
+        'Path to the directory of the fit cache',
+        cls=str,
+    )
+    fit_cache_size = config.ConfigItem(10000, 'Maximum size of the fit cache in megabytes', cls=int)
+    fit_deduplication = config.ConfigItem(
+        False,
+        'Whether identical models in the same tool run should only be fitted once',
+        cls=bool,
+    )
+    warm_start_etas = config.ConfigItem(
+        False,
+        'Whether candidate models should start from the individual estimates of their parent',
+        cls=bool,
+    )
 
 
 conf = ModelfitConfiguration()
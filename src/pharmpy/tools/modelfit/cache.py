@@ -0,0 +1,158 @@
+"""Cache of modelfit results shared between tool runs
+
+Results are stored in a directory (see the ``fit_cache_path`` option) under a
+key computed from the generated model code and the dataset. Parts of the code
+that do not influence the estimation, i.e. the description of the model in
+$PROBLEM, the path to the dataset in $DATA and the names of the table files
+and of the $ETAS file, are not part of the key so that identical candidate
+models from different tool runs share results. The initial individual estimates
+in the $ETAS file are part of the key instead. Models with code that reads other
+files, e.g. $MSFI or INCLUDE, get no key since the contents of these files are
+not known.
+"""
+
+import dataclasses
+import os
+import pickle
+import re
+from hashlib import sha256
+from pathlib import Path
+from typing import Optional
+
+import pharmpy
+from pharmpy.internals.df import hash_df_fs
+from pharmpy.model import Model
+from pharmpy.results import ModelfitResults
+
+CACHE_SUFFIX = '.pickle'
+
+_PROBLEM_RECORD = re.compile(r'^(\$PROB[A-Z]*)[^\n]*', re.MULTILINE)
+_DATA_FILENAME = re.compile(r'^(\$DATA\s+)("[^"]*"|\'[^\']*\'|\S+)', re.MULTILINE)
+_TABLE_FILENAME = re.compile(
+    r'^(\$TAB[A-Z]*\b[^$]*?\bFILE\s*=\s*)("[^"]*"|\'[^\']*\'|\S+)', re.MULTILINE
+)
+_EXTERNAL_FILE = re.compile(
+    r'^\s*(\$MSFI|\$INCLUDE\b|INCLUDE\b)|^\$SUB[A-Z]*\b[^$]*?\bOTHER\s*=', re.MULTILINE
+)
+_ETAS_RECORD = re.compile(r'^\$ETAS\b', re.MULTILINE)
+_ETAS_FILENAME = re.compile(r'^(\$ETAS\b[^$]*?\bFILE\s*=\s*)("[^"]*"|\'[^\']*\'|\S+)', re.MULTILINE)
+
+
+def _get_convert_model(tool: str):
+    if tool == 'nonmem':
+        from pharmpy.plugins.nonmem import convert_model
+    elif tool == 'nlmixr':
+        from pharmpy.plugins.nlmixr import convert_model
+    else:
+        raise ValueError(f"Unknown estimation tool {tool}")
+
+    return convert_model
+
+
+def _normalize_code(code: str) -> str:
+    code = _PROBLEM_RECORD.sub(r'\1', code)
+    code = _TABLE_FILENAME.sub(r'\1', code)
+    code = _ETAS_FILENAME.sub(r'\1', code)
+    return _DATA_FILENAME.sub(r'\1', code)
+
+
+def fit_cache_key(model: Model, tool: str) -> Optional[str]:
+    """Key of a model in the fit cache
+
+    Returns None if no key could be computed for the model
+    """
+    try:
+        code = _get_convert_model(tool)(model).model_code
+    except NotImplementedError:
+        return None
+
+    if _EXTERNAL_FILE.search(code) or (
+        _ETAS_RECORD.search(code) and model.initial_individual_estimates is None
+    ):
+        return None
+
+    h = sha256()
+    h.update(f'{pharmpy.__version__}\n{tool}\n'.encode('utf-8'))
+    h.update(_normalize_code(code).encode('utf-8'))
+    if model.dataset is not None:
+        h.update(hash_df_fs(model.dataset).encode('utf-8'))
+    if model.initial_individual_estimates is not None:
+        h.update(hash_df_fs(model.initial_individual_estimates).encode('utf-8'))
+    return h.hexdigest()
+
+
+class FitCache:
+    """Directory of pickled modelfit results
+
+    Parameters
+    ----------
+    path : Path
+        Directory of the cache. Will be created if needed.
+    size : int
+        Maximum size of the cache in megabytes. Least recently used results
+        are removed when the cache grows larger.
+    """
+
+    def __init__(self, path, size):
+        self.path = Path(path)
+        self.size = size
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / key[:2] / (key + CACHE_SUFFIX)
+
+    def retrieve(self, key: str, model: Model) -> Optional[ModelfitResults]:
+        """Retrieve results for model with key or None if not in cache"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                res = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+        # NOTE Update mtime so that eviction is least recently used
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        return dataclasses.replace(res, name=model.name, description=model.description)
+
+    def store(self, key: str, res: ModelfitResults):
+        """Store results under key and evict entries if the cache became too large"""
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        with open(tmp, 'wb') as f:
+            pickle.dump(res, f, protocol=5)
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits within its size"""
+        entries = []
+        for path in self.path.glob(f'*/*{CACHE_SUFFIX}'):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        limit = self.size * 1024 * 1024
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= limit:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def get_fit_cache() -> Optional[FitCache]:
+    """Fit cache as configured or None if the cache is disabled"""
+    from pharmpy.tools.modelfit import conf
+
+    if not conf.fit_cache:
+        return None
+    return FitCache(conf.fit_cache_path, conf.fit_cache_size)
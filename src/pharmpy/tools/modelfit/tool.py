@@ -1,6 +1,15 @@
+import threading
+import weakref
+from concurrent.futures import Future
+from dataclasses import replace
+from typing import Dict, Optional
+
 from pharmpy.model import Model
+from pharmpy.results import ModelfitResults
 from pharmpy.workflows import Task, Workflow
 
+from .cache import fit_cache_key, get_fit_cache
+
 
 def create_workflow(models=None, n=None, tool=None):
     """Run modelfit tool.
@@ -34,8 +43,8 @@ def create_workflow(models=None, n=None, tool=None):
     return wf
 
 
-def create_fit_workflow(models=None, n=None, tool=None):
-    execute_model = retrieve_from_database_or_execute_model_with_tool(tool)
+def create_fit_workflow(models=None, n=None, tool=None, deduplicate=None):
+    execute_model = retrieve_from_database_or_execute_model_with_tool(tool, deduplicate)
 
     wf = Workflow()
     if models is None:
@@ -63,7 +72,7 @@ def post_process_results(context, *models):
         return models[0]
 
 
-def retrieve_from_database_or_execute_model_with_tool(tool):
+def retrieve_from_database_or_execute_model_with_tool(tool, deduplicate=None):
     def task(context, model):
         try:
             db_results = context.model_database.retrieve_modelfit_results(model.name)
@@ -88,18 +97,127 @@ def retrieve_from_database_or_execute_model_with_tool(tool):
                 model.modelfit_results = db_results
                 return model
 
+        cache = get_fit_cache()
+        dedup = _resolve_deduplicate(deduplicate)
+        # NOTE The key is only computed when needed since it requires generating the
+        # code of the model and hashing its dataset
+        key = fit_cache_key(model, _resolve_tool(tool)) if cache is not None or dedup else None
+
+        # NOTE Identical models fitted earlier, e.g. by another tool run, can be
+        # reused from the fit cache
+        if cache is not None and key is not None:
+            cached_results = cache.retrieve(key, model)
+            if cached_results is not None:
+                return _reuse_results(context, model, cached_results)
+
+        # NOTE Identical models in the same workflow run, e.g. duplicate candidates of a
+        # search tool, are only fitted once. The duplicates get the modelfit results but
+        # no output files of the estimation tool in the model database.
+        owner = False
+        if dedup and key is not None:
+            fit = _run_fits.join(context, key)
+            owner = fit is None
+            if fit is not None:
+                res = _wait_for(fit)
+                if res is not None:
+                    return _reuse_results(context, model, res)
+
         # NOTE Fallback to executing the model
-        execute_model = get_execute_model(tool)
-        return execute_model(model, context)
+        res = None
+        try:
+            execute_model = get_execute_model(tool)
+            model = execute_model(model, context)
+            res = model.modelfit_results
+        finally:
+            if owner:
+                _run_fits.finish(context, key, res)
+
+        if cache is not None and key is not None and res is not None:
+            cache.store(key, res)
+
+        return model
 
     return task
 
 
-def get_execute_model(tool):
+class _RunFits:
+    """Fits of the workflow runs in this process
+
+    Fits are keyed on the fit cache key and kept for as long as the context
+    of the run exists.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def join(self, context, key: str) -> Optional[Future]:
+        """Future of a fit of an identical model or None if the caller should fit"""
+        with self._lock:
+            fits: Dict[str, Future] = self._runs.setdefault(context, {})
+            fit = fits.get(key)
+            if fit is None:
+                fits[key] = Future()
+            return fit
+
+    def finish(self, context, key: str, res: Optional[ModelfitResults]):
+        with self._lock:
+            fits = self._runs[context]
+            fit = fits[key]
+            if res is None:
+                # NOTE A later identical model will be fitted again
+                del fits[key]
+        fit.set_result(res)
+
+
+_run_fits = _RunFits()
+
+
+def _wait_for(fit: Future) -> Optional[ModelfitResults]:
+    try:
+        from dask.distributed import get_worker, rejoin, secede
+
+        get_worker()
+    except (ImportError, ValueError):
+        # NOTE Not running in a dask worker
+        return fit.result()
+
+    # NOTE As in call_workflow the task does not occupy a worker thread while the
+    # identical model is fitted
+    secede()
+    try:
+        return fit.result()
+    finally:
+        rejoin()
+
+
+def _reuse_results(context, model, res):
+    model.modelfit_results = replace(res, name=model.name, description=model.description)
+    store_model(context, model)
+    return model
+
+
+def store_model(context, model):
+    """Store a model fitted without the estimation tool in the model database of the
+    context, if any"""
+    if context is not None and context.model_database is not None:
+        context.model_database.store_model(model)
+
+
+def _resolve_tool(tool):
     from pharmpy.tools.modelfit import conf
 
-    if tool is None:
-        tool = conf.default_tool
+    return conf.default_tool if tool is None else tool
+
+
+def _resolve_deduplicate(deduplicate):
+    from pharmpy.tools.modelfit import conf
+
+    return conf.fit_deduplication if deduplicate is None else deduplicate
+
+
+def get_execute_model(tool):
+    tool = _resolve_tool(tool)
 
     if tool == 'nonmem':
         from pharmpy.plugins.nonmem.run import execute_model
@@ -1,5 +1,7 @@
+import functools
 from typing import Any, List
 
+from pharmpy.internals.pool import run_in_pool
 from pharmpy.model import Model
 from pharmpy.modeling import (
     add_iiv,
@@ -40,23 +42,20 @@ def exhaustive(mfl_statements: List[Statement], iiv_strategy: str):
     for i, combo in enumerate(combinations, 1):
         model_name = f'modelsearch_run{i}'
 
-        task_copy = Task('copy', _copy, model_name, combo)
-        wf_search.add_task(task_copy)
-
-        task_previous = task_copy
-        for feat in combo:
-            func = funcs[feat]
-            task_function = Task(key_to_str(feat), func)
-            wf_search.add_task(task_function, predecessors=task_previous)
-            if iiv_strategy != 'no_add':
-                task_add_iiv = Task('add_iivs', _add_iiv_to_func, iiv_strategy)
-                wf_search.add_task(task_add_iiv, predecessors=task_function)
-                task_previous = task_add_iiv
-            else:
-                task_previous = task_function
+        transformations = [funcs[feat] for feat in combo]
+        task_create = Task(
+            'create_candidate',
+            _create_candidate,
+            model_name,
+            combo,
+            False,
+            transformations,
+            iiv_strategy,
+        )
+        wf_search.add_task(task_create)
 
         wf_fit = create_fit_workflow(n=1)
-        wf_search.insert_workflow(wf_fit, predecessors=task_previous)
+        wf_search.insert_workflow(wf_fit, predecessors=task_create)
 
         model_tasks += wf_fit.output_tasks
 
@@ -204,26 +203,44 @@ def _get_previous_features(wf, task, mfl_funcs):
 def _create_model_workflow(model_name, feat, func, iiv_strategy):
     wf_stepwise_step = Workflow()
 
-    task_copy = Task('copy', _copy, model_name, (feat,))
-    wf_stepwise_step.add_task(task_copy)
+    # NOTE The task is named after the feature since the stepwise algorithms use the names of
+    # upstream tasks to find the features of a model
+    transformations = [functools.partial(_apply_transformation, feat, func)]
+    task_function = Task(
+        key_to_str(feat),
+        _create_candidate,
+        model_name,
+        (feat,),
+        True,
+        transformations,
+        iiv_strategy,
+    )
+    wf_stepwise_step.add_task(task_function)
 
-    task_update_inits = Task('update_inits', update_initial_estimates)
-    wf_stepwise_step.add_task(task_update_inits, predecessors=task_copy)
+    wf_fit = create_fit_workflow(n=1)
+    wf_stepwise_step.insert_workflow(wf_fit, predecessors=task_function)
 
-    task_function = Task(key_to_str(feat), _apply_transformation, feat, func)
-    wf_stepwise_step.add_task(task_function, predecessors=task_update_inits)
+    return wf_stepwise_step, task_function
 
-    if iiv_strategy != 'no_add':
-        task_add_iiv = Task('add_iivs', _add_iiv_to_func, iiv_strategy)
-        wf_stepwise_step.add_task(task_add_iiv, predecessors=task_function)
-        task_to_fit = task_add_iiv
-    else:
-        task_to_fit = task_function
 
-    wf_fit = create_fit_workflow(n=1)
-    wf_stepwise_step.insert_workflow(wf_fit, predecessors=task_to_fit)
+def _create_candidate(model_name, features, update_inits, transformations, iiv_strategy, model):
+    # NOTE Candidates can be built in a process pool since the transformations would
+    # otherwise serialize on the GIL in a threaded scheduler, see pharmpy.internals.pool.
+    # The fit of each candidate starts as soon as it has been built.
+    return run_in_pool(
+        _build_candidate, model_name, features, update_inits, transformations, iiv_strategy, model
+    )
 
-    return wf_stepwise_step, task_function
+
+def _build_candidate(model_name, features, update_inits, transformations, iiv_strategy, model):
+    model = _copy(model_name, features, model)
+    if update_inits:
+        model = update_initial_estimates(model)
+    for transformation in transformations:
+        model = transformation(model)
+        if iiv_strategy != 'no_add':
+            model = _add_iiv_to_func(iiv_strategy, model)
+    return model
 
 
 def _apply_transformation(feat, func, model):
@@ -0,0 +1,154 @@
+"""Built-in estimation of the residual error models of ruvsearch
+
+The residual error models are fitted on a dataset of CWRES. They have a single
+dependent variable statement, a few univariate ETAs and EPSILONs and no ODE
+system, so that estimating them takes milliseconds and starting an external
+estimation tool for each of them dominates the runtime of ruvsearch.
+
+Here they are estimated with FOCE with interaction in-process, see
+pharmpy.internals.foce. For models that are linear in the ETAs and where the
+residual variance does not depend on the ETAs, which is all models except IIV
+on RUV, the objective function value is the exact -2LL.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from pharmpy.deps import numpy as np
+from pharmpy.deps import pandas as pd
+from pharmpy.deps import sympy
+from pharmpy.internals import foce
+from pharmpy.internals.expr.eval import lambdify_with_arguments
+from pharmpy.model import Model, NormalDistribution
+from pharmpy.results import ModelfitResults
+
+
+def estimate(model: Model) -> Optional[ModelfitResults]:
+    """Estimate the parameters of a residual error model of ruvsearch
+
+    Parameters
+    ----------
+    model : Model
+        Model to estimate. All random variables must have univariate normal distributions,
+        the model cannot have an ODE system and the dataset needs ID and DV columns.
+
+    Returns
+    -------
+    ModelfitResults
+        Results of the estimation or None if the model could not be estimated
+    """
+    try:
+        objective = _Objective(model)
+    except ValueError:
+        return None
+
+    minimized = foce.minimize(objective)
+    if minimized is None:
+        return None
+    res, success = minimized
+
+    values = objective.parameter_values(res.x)
+    ofv, eta, _ = objective.evaluate(values)
+    pe = pd.Series(values, index=objective.parameter_names)
+    ie = pd.DataFrame(eta, index=objective.ids, columns=objective.eta_names)
+    ie.index.name = 'ID'
+    return ModelfitResults(
+        name=model.name,
+        description=model.description,
+        ofv=ofv,
+        parameter_estimates=pe,
+        individual_estimates=ie,
+        minimization_successful=success,
+        function_evaluations=objective.evaluations,
+    )
+
+
+def _segment_sum(codes, x, n):
+    # Sum rows of x for each code
+    if x.ndim == 1:
+        return np.bincount(codes, weights=x, minlength=n)
+    flat = x.reshape(len(x), -1)
+    sums = np.empty((n, flat.shape[1]))
+    for i in range(flat.shape[1]):
+        sums[:, i] = np.bincount(codes, weights=flat[:, i], minlength=n)
+    return sums.reshape((n,) + x.shape[1:])
+
+
+class _Objective(foce.Objective):
+    """Objective function value of a model as a function of its transformed free parameters
+
+    Raises ValueError for models that cannot be estimated.
+    """
+
+    def __init__(self, model: Model):
+        rvs = model.random_variables
+        if model.statements.ode_system is not None:
+            raise ValueError('Models with ODE systems are not supported')
+        if not all(isinstance(dist, NormalDistribution) for dist in rvs):
+            raise ValueError('Only univariate distributions are supported')
+
+        params = model.parameters
+        param_symbs = [sympy.Symbol(name) for name in params.names]
+        etas = [sympy.Symbol(name) for name in rvs.etas.names]
+        epsilons = [sympy.Symbol(name) for name in rvs.epsilons.names]
+        self.eta_names = rvs.etas.names
+
+        y = model.statements.full_expression(model.dependent_variable)
+        no_eps = {eps: 0 for eps in epsilons}
+        f = sympy.sympify(y).subs(no_eps)
+        r = sympy.Integer(0)
+        for eps in epsilons:
+            r += sympy.diff(y, eps).subs(no_eps) ** 2 * rvs[eps.name].variance
+        g = [sympy.diff(f, eta) for eta in etas]
+        h = [sympy.diff(r, eta) for eta in etas]
+
+        df = model.dataset
+        if 'ID' not in df.columns or 'DV' not in df.columns:
+            raise ValueError('Dataset must have ID and DV columns')
+        exprs = [f, r] + g + h
+        data_symbs = sorted(
+            set().union(*(expr.free_symbols for expr in exprs)) - set(param_symbs) - set(etas),
+            key=str,
+        )
+        if any(symb.name not in df.columns for symb in data_symbs):
+            raise ValueError('Model uses symbols that are not parameters or data columns')
+        self._data = [df[symb.name].to_numpy(dtype=np.float64) for symb in data_symbs]
+        self._fn = lambdify_with_arguments(sympy.Tuple(*exprs), param_symbs + etas + data_symbs)
+        omegas = [rvs[eta.name].variance for eta in etas]
+        self._omega_fn = lambdify_with_arguments(sympy.Tuple(*omegas), param_symbs)
+
+        self._y = df['DV'].to_numpy(dtype=np.float64)
+        self._codes, ids = pd.factorize(df['ID'])
+        self.ids = pd.Index(ids)
+
+        super().__init__(params, set(rvs.variance_parameters), len(ids), len(etas))
+
+    def _omega(self, values):
+        omega = np.array(self._omega_fn(*values), dtype=np.float64).reshape(self._netas)
+        return np.diag(omega)
+
+    def _individual(self, values, eta):
+        n = len(self._y)
+        k = self._netas
+        eta_obs = eta[self._codes]
+        res = self._fn(*values, *eta_obs.T, *self._data)
+        f, r = (np.broadcast_to(x, n) for x in res[:2])
+        g = np.column_stack([np.broadcast_to(x, n) for x in res[2 : 2 + k]] or [np.empty(n)])
+        h = np.column_stack([np.broadcast_to(x, n) for x in res[2 + k :]] or [np.empty(n)])
+        g, h = g[:, :k], h[:, :k]
+
+        resid = self._y - f
+        ofv_obs = np.log(r) + resid**2 / r
+        grad_obs = (
+            h / r[:, np.newaxis]
+            - 2 * resid[:, np.newaxis] * g / r[:, np.newaxis]
+            - (resid**2 / r**2)[:, np.newaxis] * h
+        )
+        info_obs = (
+            g[:, :, np.newaxis] * g[:, np.newaxis, :] / r[:, np.newaxis, np.newaxis]
+            + 0.5 * h[:, :, np.newaxis] * h[:, np.newaxis, :] / (r**2)[:, np.newaxis, np.newaxis]
+        )
+        ofv_i = _segment_sum(self._codes, ofv_obs, self._nids)
+        grad = _segment_sum(self._codes, grad_obs, self._nids)
+        info = _segment_sum(self._codes, info_obs, self._nids)
+        return ofv_i, grad, info
@@ -37,11 +37,14 @@ from pharmpy.tools import (
 )
 from pharmpy.tools.common import summarize_tool, update_initial_estimates
 from pharmpy.tools.modelfit import create_fit_workflow
+from pharmpy.tools.modelfit.tool import store_model
 from pharmpy.workflows import Task, Workflow, call_workflow
 
+from .estimation import estimate
 from .results import RUVSearchResults, calculate_results
 
 SKIP = frozenset(('IIV_on_RUV', 'power', 'combined', 'time_varying'))
+CWRES_ESTIMATORS = frozenset(('builtin',))
 
 
 def create_workflow(
@@ -50,6 +53,7 @@ def create_workflow(
     groups: int = 4,
     p_value: float = 0.05,
     skip: Optional[List[str]] = None,
+    cwres_estimator: Optional[str] = None,
 ):
     """Run the ruvsearch tool. For more details, see :ref:`ruvsearch`.
 
@@ -65,6 +69,10 @@ def create_workflow(
         The p-value to use for the likelihood ratio test
     skip : list
         A list of models to not attempt.
+    cwres_estimator : str
+        How to estimate the residual error models of the CWRES. Either None to use the
+        estimation tool of modelfit or 'builtin' to estimate them in-process. The selected
+        model is always estimated with the estimation tool of modelfit.
 
     Returns
     -------
@@ -82,14 +90,14 @@ def create_workflow(
 
     wf = Workflow()
     wf.name = "ruvsearch"
-    start_task = Task('start_ruvsearch', start, model, groups, p_value, skip)
+    start_task = Task('start_ruvsearch', start, model, groups, p_value, skip, cwres_estimator)
     wf.add_task(start_task)
     task_results = Task('results', _results)
     wf.add_task(task_results, predecessors=[start_task])
     return wf
 
 
-def create_iteration_workflow(model, groups, cutoff, skip, current_iteration):
+def create_iteration_workflow(model, groups, cutoff, skip, current_iteration, cwres_estimator=None):
     wf = Workflow()
 
     start_task = Task('start_iteration', _start_iteration, model)
@@ -131,7 +139,10 @@ def create_iteration_workflow(model, groups, cutoff, skip, current_iteration):
             tasks.append(task)
             wf.add_task(task, predecessors=task_base_model)
 
-    fit_wf = create_fit_workflow(n=1 + len(tasks))
+    if cwres_estimator == 'builtin':
+        fit_wf = Workflow([Task(f'run{i}', _estimate_cwres_model) for i in range(1 + len(tasks))])
+    else:
+        fit_wf = create_fit_workflow(n=1 + len(tasks))
     wf.insert_workflow(fit_wf, predecessors=[task_base_model] + tasks)
     post_pro = partial(post_process, cutoff=cutoff, current_iteration=current_iteration)
     task_post_process = Task('post_process', post_pro)
@@ -140,7 +151,7 @@ def create_iteration_workflow(model, groups, cutoff, skip, current_iteration):
     return wf
 
 
-def start(context, model, groups, p_value, skip):
+def start(context, model, groups, p_value, skip, cwres_estimator):
     cutoff = float(stats.chi2.isf(q=p_value, df=1))
     if skip is None:
         skip = []
@@ -152,7 +163,9 @@ def start(context, model, groups, p_value, skip):
     last_iteration = 0
     for current_iteration in (1, 2, 3):
         last_iteration = current_iteration
-        wf = create_iteration_workflow(model, groups, cutoff, skip, current_iteration)
+        wf = create_iteration_workflow(
+            model, groups, cutoff, skip, current_iteration, cwres_estimator
+        )
         res, best_model, selected_model_name = call_workflow(
             wf, f'results{current_iteration}', context
         )
@@ -212,6 +225,17 @@ def _create_summary_tool(selected_models, cutoff):
     return sum_tool_by_iter.drop(columns=['rank'])
 
 
+def _estimate_cwres_model(context, model):
+    res = estimate(model)
+    if res is None:
+        # NOTE Fallback to the estimation tool for models that are not supported
+        fit_wf = create_fit_workflow(models=[model])
+        return call_workflow(fit_wf, f'fit_{model.name}', context)
+    model.modelfit_results = res
+    store_model(context, model)
+    return model
+
+
 def _start_iteration(model):
     return model
 
@@ -442,7 +466,7 @@ def _create_best_model(model, res, current_iteration, groups=4, cutoff=3.84):
 
 @with_runtime_arguments_type_check
 @with_same_arguments_as(create_workflow)
-def validate_input(model, groups, p_value, skip):
+def validate_input(model, groups, p_value, skip, cwres_estimator):
     if groups <= 0:
         raise ValueError(f'Invalid `groups`: got `{groups}`, must be >= 1.')
 
@@ -452,6 +476,12 @@ def validate_input(model, groups, p_value, skip):
     if skip is not None and not set(skip).issubset(SKIP):
         raise ValueError(f'Invalid `skip`: got `{skip}`, must be None/NULL or a subset of {SKIP}.')
 
+    if cwres_estimator is not None and cwres_estimator not in CWRES_ESTIMATORS:
+        raise ValueError(
+            f'Invalid `cwres_estimator`: got `{cwres_estimator}`,'
+            f' must be None/NULL or one of {sorted(CWRES_ESTIMATORS)}.'
+        )
+
     if model is not None:
 
         if model.modelfit_results is None:
@@ -10,7 +10,8 @@
    * - ``default_dispatcher``
      - ``pharmpy.workflows.local_dask``
      - str
-     - Name of default dispatcher module
+     - Name of default dispatcher module. Use ``pharmpy.workflows.local_dask_pool`` to keep
+       a pool of worker processes alive between tool runs
    * - ``default_model_database``
      - ``pharmpy.workflows.LocalDirectoryDatabase``
      - str
@@ -27,8 +28,8 @@ import importlib
 import pharmpy.config as config
 
 from .args import split_common_options
-from .call import call_workflow
-from .dispatchers import local_dask
+from .call import as_completed, call_workflow, submit_workflow
+from .dispatchers import local_dask, local_dask_pool
 from .execute import execute_workflow
 from .log import Log
 from .model_database import (
@@ -74,13 +75,16 @@ default_tool_database = _importclass(conf.default_tool_database)
 
 
 __all__ = [
+    'as_completed',
     'call_workflow',
     'default_dispatcher',
     'default_model_database',
     'default_tool_database',
     'execute_workflow',
     'split_common_options',
+    'submit_workflow',
     'local_dask',
+    'local_dask_pool',
     'LocalDirectoryDatabase',
     'LocalModelDirectoryDatabase',
     'LocalDirectoryToolDatabase',
@@ -1,4 +1,4 @@
-from typing import TypeVar
+from typing import Iterable, Iterator, TypeVar
 
 from .context import insert_context
 from .workflow import Workflow
@@ -18,25 +18,83 @@ def call_workflow(wf: Workflow[T], unique_name, db) -> T:
     unique_name : str
         A name of the results node that is unique between parent and dynamically created workflows
     db : ToolDatabase
-        ToolDatabase to pass to new workflow
+        ToolDatabase to pass to new workflow. Its dataset registry, if any, is used for
+        the datasets of the models of the workflow.
 
     Returns
     -------
     Any
         Whatever the dynamic workflow returns
     """
-    from dask.distributed import get_client, rejoin, secede
+    from dask.distributed import rejoin, secede
 
-    from .optimize import optimize_task_graph_for_dask_distributed
+    future = submit_workflow(wf, unique_name, db)
+    secede()
+    res: T = future.result()  # pyright: ignore [reportGeneralTypeIssues]
+    rejoin()
+    return res
+
+
+def submit_workflow(wf: Workflow[T], unique_name, db, priority: int = 0):
+    """Dynamically start a workflow from another workflow without waiting for it.
+
+    Currently only supports dask distributed
+
+    Parameters
+    ----------
+    wf : Workflow
+        A workflow object
+    unique_name : str
+        A name of the results node that is unique between parent and dynamically created workflows
+    db : ToolDatabase
+        ToolDatabase to pass to new workflow. Its dataset registry, if any, is used for
+        the datasets of the models of the workflow.
+    priority : int
+        Priority of the tasks of the workflow. Tasks with higher priority are run first.
+
+    Returns
+    -------
+    Future
+        Future of whatever the dynamic workflow returns. Cancelling the future
+        stops the tasks of the workflow that have not started yet.
+    """
+    from dask.distributed import get_client
+
+    from pharmpy.internals.fs.cwd import working_directory
+
+    from .optimize import optimize_task_graph_for_dask_distributed, run_in_directory
 
     insert_context(wf, db)
 
     client = get_client()
-    dsk = wf.as_dask_dict()
+    # NOTE The tasks of the workflow have the working directory of the calling task
+    dsk = run_in_directory(wf.as_dask_dict(), working_directory())
     dsk[unique_name] = dsk.pop('results')
-    dsk_optimized = optimize_task_graph_for_dask_distributed(client, dsk)
-    futures = client.get(dsk_optimized, unique_name, sync=False)
+    registry = getattr(db, 'dataset_registry', None)
+    dsk_optimized = optimize_task_graph_for_dask_distributed(client, dsk, registry)
+    return client.get(dsk_optimized, unique_name, sync=False, priority=priority)
+
+
+def as_completed(futures: Iterable) -> Iterator:
+    """Iterate over futures of dynamically started workflows as they complete.
+
+    The calling task does not occupy a worker thread until the iteration is done.
+
+    Parameters
+    ----------
+    futures : list
+        Futures from :func:`submit_workflow`
+
+    Returns
+    -------
+    Iterator
+        The futures in order of completion
+    """
+    from dask.distributed import as_completed as dask_as_completed
+    from dask.distributed import rejoin, secede
+
     secede()
-    res: T = client.gather(futures)  # pyright: ignore [reportGeneralTypeIssues]
-    rejoin()
-    return res
+    try:
+        yield from dask_as_completed(futures)
+    finally:
+        rejoin()
@@ -0,0 +1,258 @@
+"""Registry of datasets shared between the processes of a workflow run
+
+Scattering models to worker processes serializes the dataset of each model
+separately, so that a workflow with many models on the same dataset will have
+many copies of it in flight. A :class:`DatasetRegistry` instead stores each
+unique dataset, keyed on its content hash, once in shared memory (``/dev/shm``
+when available, otherwise a temporary directory) and models are sent to the
+workers with a lightweight :class:`DatasetReference` in its place. A model
+loads its dataset from the reference on first access.
+
+The registry is removed when it is closed. Registries that are still open when
+the Python process exits are removed at exit and registries left behind by
+processes that crashed are removed when a new registry is created.
+"""
+from __future__ import annotations
+
+import atexit
+import copy
+import os
+import pickle
+import shutil
+import threading
+from pathlib import Path
+from tempfile import gettempdir, mkdtemp
+from typing import Dict, List, Optional
+
+from pharmpy.deps import numpy as np
+from pharmpy.deps import pandas as pd
+from pharmpy.internals.df import hash_df_fs
+from pharmpy.internals.immutable import Immutable
+from pharmpy.model import Model
+
+_SHM_PATH = Path('/dev/shm')
+
+_PREFIX = 'pharmpy-datasets-'
+
+_lock = threading.Lock()
+_open_registries: List[DatasetRegistry] = []
+
+
+@atexit.register
+def _close_open_registries():
+    with _lock:
+        registries = list(_open_registries)
+    for registry in registries:
+        registry.close()
+
+
+def _remove_stale_registries(path: Path):
+    # NOTE The directory of a registry is named after the process owning it so that
+    # directories of processes that no longer exist can be removed
+    for directory in path.glob(f'{_PREFIX}*-*'):
+        pid = directory.name[len(_PREFIX) :].split('-', 1)[0]
+        if not pid.isdigit() or _process_exists(int(pid)):
+            continue
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _process_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        pass
+    return True
+
+
+def _default_directory() -> Optional[Path]:
+    if _SHM_PATH.is_dir() and os.access(_SHM_PATH, os.W_OK):
+        return _SHM_PATH
+    return None
+
+
+def _local_dataset(key: str) -> Optional[pd.DataFrame]:
+    with _lock:
+        for registry in _open_registries:
+            df = registry._datasets.get(key)
+            if df is not None:
+                return df
+    return None
+
+
+class DatasetReference(Immutable):
+    """Reference to a dataset stored in a :class:`DatasetRegistry`
+
+    Calling the reference returns a new DataFrame with the dataset. In the
+    process owning the registry the registered DataFrame is used directly,
+    in other processes the dataset is read from shared memory.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        path: Path,
+        columns: pd.Index,
+        index: Optional[pd.RangeIndex],
+        pickled: List[bool],
+    ):
+        self.key = key
+        self.path = path
+        self.columns = columns
+        self.index = index
+        self.pickled = pickled
+        self._df = _local_dataset(key)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_df']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # NOTE References coming back to the owning process can be resolved without
+        # reading from shared memory and then stay valid after the registry is closed
+        self._df = _local_dataset(self.key)
+
+    def __call__(self) -> pd.DataFrame:
+        if self._df is not None:
+            return self._df.copy()
+        return self.load()
+
+    def load(self) -> pd.DataFrame:
+        """Read the dataset from the registry"""
+        columns = {}
+        for i, pickled in enumerate(self.pickled):
+            if pickled:
+                with open(self.path / f'{i}.pickle', 'rb') as f:
+                    columns[i] = pickle.load(f)
+            else:
+                columns[i] = np.load(self.path / f'{i}.npy', mmap_mode='r')
+        index = self.index
+        if index is None:
+            with open(self.path / 'index.pickle', 'rb') as f:
+                index = pickle.load(f)
+        # NOTE Copying makes the DataFrame independent of the shared memory
+        df = pd.DataFrame(columns, index=index, copy=True)
+        df.columns = self.columns
+        return df
+
+    def __repr__(self):
+        return f'<DatasetReference {self.key[:12]}>'
+
+
+class DatasetRegistry:
+    """Datasets stored once each in shared memory
+
+    The registry can be sent to other processes of the same workflow run. Datasets
+    registered there are stored in the same directory and the registry is removed
+    when it is closed by the process that created it.
+
+    Parameters
+    ----------
+    path : Path
+        Directory in which to create the registry. Default is ``/dev/shm``
+        if available and otherwise the default temporary directory.
+
+    Examples
+    --------
+    >>> from pharmpy.modeling import load_example_model
+    >>> from pharmpy.workflows.dataset_registry import DatasetRegistry
+    >>> model = load_example_model("pheno")
+    >>> with DatasetRegistry() as registry:
+    ...     ref = registry.register(model.dataset)
+    ...     df = ref()
+    >>> df.equals(model.dataset)
+    True
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        if path is None:
+            path = _default_directory()
+        _remove_stale_registries(Path(gettempdir() if path is None else path))
+        self.path = Path(mkdtemp(prefix=f'{_PREFIX}{os.getpid()}-', dir=path))
+        self._owner = os.getpid()
+        self._datasets: Dict[str, pd.DataFrame] = {}
+        self._references: Dict[str, DatasetReference] = {}
+        with _lock:
+            _open_registries.append(self)
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self._owner = None
+        self._datasets = {}
+        self._references = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def register(self, df: pd.DataFrame) -> DatasetReference:
+        """Store a dataset unless already stored and return a reference to it"""
+        key = hash_df_fs(df)
+        ref = self._references.get(key)
+        if ref is not None:
+            return ref
+
+        path = self.path / key
+        # NOTE Object and extension dtypes cannot be memory mapped
+        pickled = [not (isinstance(dtype, np.dtype) and dtype != object) for dtype in df.dtypes]
+        index = df.index if isinstance(df.index, pd.RangeIndex) else None
+        if not path.exists():
+            # NOTE Other processes of the same run could be storing the same dataset so
+            # it is written to a temporary directory that is then moved into place
+            tmp = Path(mkdtemp(prefix=f'{key}-', dir=self.path))
+            _store(df, tmp, pickled)
+            try:
+                tmp.rename(path)
+            except OSError:
+                shutil.rmtree(tmp, ignore_errors=True)
+
+        with _lock:
+            self._datasets[key] = df
+        ref = DatasetReference(key, path, df.columns, index, pickled)
+        self._references[key] = ref
+        return ref
+
+    def detach(self, model: Model) -> Model:
+        """Copy of model with its dataset replaced by a reference to the registry"""
+        df = model.__dict__.get('_dataset')
+        if not isinstance(df, pd.DataFrame):
+            return model
+        # NOTE A shallow copy suffices since the model is serialized before it is used
+        # and Model.copy would make it a child of model
+        detached = copy.copy(model)
+        detached._dataset = self.register(df)
+        return detached
+
+    def close(self):
+        """Remove all datasets from shared memory
+
+        Only the process that created the registry removes it.
+        """
+        with _lock:
+            if self in _open_registries:
+                _open_registries.remove(self)
+        self._datasets.clear()
+        self._references.clear()
+        if self._owner == os.getpid():
+            shutil.rmtree(self.path, ignore_errors=True)
+
+
+def _store(df: pd.DataFrame, path: Path, pickled: List[bool]):
+    for i, is_pickled in enumerate(pickled):
+        values = df.iloc[:, i]
+        if is_pickled:
+            with open(path / f'{i}.pickle', 'wb') as f:
+                pickle.dump(values.array, f, protocol=5)
+        else:
+            np.save(path / f'{i}.npy', values.to_numpy())
+    if not isinstance(df.index, pd.RangeIndex):
+        with open(path / 'index.pickle', 'wb') as f:
+            pickle.dump(df.index, f, protocol=5)
@@ -8,6 +8,13 @@ class DispatcherConfiguration(config.Configuration):
         'Which type of dask scheduler to use (supports threaded and distributed).',
         str,
     )
+    pool_workers = config.ConfigItem(
+        0,
+        'Number of worker processes for CPU bound work of tools. The default (0) does the work '
+        'in the calling process. Scripts using the pool must guard their code with '
+        'if __name__ == \'__main__\'.',
+        int,
+    )
 
 
 conf = DispatcherConfiguration()
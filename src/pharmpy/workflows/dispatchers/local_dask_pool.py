@@ -0,0 +1,123 @@
+"""Dispatcher keeping a pool of worker processes alive between workflow runs
+
+In contrast to :mod:`pharmpy.workflows.dispatchers.local_dask`, which
+creates a new threaded cluster for each call to ``run``, this dispatcher
+starts a multi-process dask cluster on first use and reuses it for all
+subsequent workflows in the same Python session. Workers have pharmpy
+preloaded so that no import cost is paid when running tasks and model
+transformations do not contend for a single GIL. Datasets of input models
+are placed once in shared memory, see
+:mod:`pharmpy.workflows.dataset_registry`.
+"""
+
+import atexit
+import threading
+import warnings
+from typing import TypeVar
+
+from pharmpy.internals.fs.tmp import TemporaryDirectory
+from pharmpy.internals.pool import available_cores
+
+from ..workflow import Workflow
+
+T = TypeVar('T')
+
+_PRELOAD = ('pharmpy.modeling',)
+
+_lock = threading.Lock()
+_cluster = None
+_client = None
+_scratch = None
+_shutdown_registered = False
+
+
+def _get_client():
+    global _cluster, _client, _scratch, _shutdown_registered
+
+    with _lock:
+        if _client is not None and _client.status == 'running':
+            return _client
+
+        from dask.distributed import LocalCluster  # pyright: ignore [reportPrivateImportUsage]
+        from dask.distributed import (
+            Client,
+        )
+
+        # NOTE The scratch space of the workers is given to the cluster rather than set
+        # in the global dask configuration
+        _scratch = TemporaryDirectory()
+
+        with warnings.catch_warnings():
+            # Catch deprecation warning from python 3.10 via tornado.
+            # Should be fixed with tornado 6.2
+            warnings.filterwarnings("ignore", message="There is no current event loop")
+            _cluster = LocalCluster(
+                n_workers=available_cores(),
+                threads_per_worker=1,
+                processes=True,
+                dashboard_address=None,
+                preload=list(_PRELOAD),
+                local_directory=_scratch.name,
+            )
+            _client = Client(_cluster, set_as_default=False)
+
+        if not _shutdown_registered:
+            atexit.register(shutdown)
+            _shutdown_registered = True
+        return _client
+
+
+def shutdown():
+    """Close the worker pool
+
+    A new pool will be started the next time a workflow is run.
+    """
+    global _cluster, _client, _scratch
+
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+        if _cluster is not None:
+            _cluster.close()
+            _cluster = None
+        if _scratch is not None:
+            _scratch.cleanup()
+            _scratch = None
+
+
+def _contexts(workflow):
+    # NOTE Workflows started from the tasks use the registry of the run through their
+    # context, see pharmpy.workflows.call
+    from ..tool_database import ToolDatabase
+
+    contexts = []
+    for task in workflow.tasks:
+        for inp in task.task_input:
+            if isinstance(inp, ToolDatabase) and all(inp is not c for c in contexts):
+                contexts.append(inp)
+    return contexts
+
+
+def run(workflow: Workflow[T]) -> T:
+    from ..dataset_registry import DatasetRegistry
+    from ..optimize import optimize_task_graph_for_dask_distributed, run_in_directory
+
+    client = _get_client()
+
+    with TemporaryDirectory() as tempdirname, DatasetRegistry() as registry:
+        contexts = _contexts(workflow)
+        for context in contexts:
+            context.dataset_registry = registry
+        try:
+            # NOTE The workers are shared by concurrent runs and the seceded tasks of a
+            # worker run in parallel threads, so instead of changing the working directory
+            # of the worker processes each task gets the directory of its run
+            dsk = run_in_directory(workflow.as_dask_dict(), tempdirname)
+            # NOTE Each unique dataset is sent to the worker processes once via shared memory
+            dsk_optimized = optimize_task_graph_for_dask_distributed(client, dsk, registry)
+            res = client.get(dsk_optimized, 'results')
+        finally:
+            for context in contexts:
+                context.dataset_registry = None
+    return res  # pyright: ignore [reportGeneralTypeIssues]
@@ -1,7 +1,37 @@
+"""
+.. list-table:: Options for the model database module
+   :widths: 25 25 50 150
+   :header-rows: 1
+
+   * - Option name
+     - Default value
+     - Type
+     - Description
+   * - ``cache_results``
+     - ``False``
+     - bool
+     - Whether LocalModelDirectoryDatabase should cache parsed modelfit results in binary form
+"""
+
+import pharmpy.config as config
+
 from .baseclass import ModelDatabase
 from .local_directory import LocalDirectoryDatabase, LocalModelDirectoryDatabase
 from .null_database import NullModelDatabase
 
+
+class ModelDatabaseConfiguration(config.Configuration):
+    module = 'pharmpy.workflows.model_database'
+    cache_results = config.ConfigItem(
+        False,
+        'Whether LocalModelDirectoryDatabase should cache parsed modelfit results in binary form',
+        bool,
+    )
+
+
+conf = ModelDatabaseConfiguration()
+
+
 __all__ = [
     'LocalDirectoryDatabase',
     'LocalModelDirectoryDatabase',
@@ -1,10 +1,15 @@
+import hashlib
 import json
+import os
+import pickle
 import shutil
 from contextlib import contextmanager
 from os import stat
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
+import pharmpy
+import pharmpy.workflows.model_database
 from pharmpy.internals.df import hash_df_fs
 from pharmpy.internals.fs.lock import path_lock
 from pharmpy.internals.fs.path import path_absolute
@@ -23,6 +28,8 @@ DIRECTORY_DATASETS = '.datasets'
 DIRECTORY_INDEX = '.hash'
 FILE_METADATA = 'metadata.json'
 FILE_MODELFIT_RESULTS = 'results.json'
+FILE_RESULTS_CACHE = 'results.pickle'
+FILE_RESULTS_CACHE_KEY = 'results_cache.json'
 FILE_PENDING = 'PENDING'
 FILE_LOCK = '.lock'
 
@@ -45,6 +52,79 @@ def get_modelfit_results(model, path):
     model.modelfit_results = res
 
 
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _results_source_files(model_dir: Path):
+    return sorted(p for p in model_dir.iterdir() if p.is_file())
+
+
+def _results_cache_key(model_dir: Path, old_key: Optional[dict] = None) -> dict:
+    # NOTE The key consists of the size, mtime and digest of all files of the model.
+    # Digests are reused from old_key for files with unchanged size and mtime.
+    old_files = {} if old_key is None else old_key['files']
+    files = {}
+    for path in _results_source_files(model_dir):
+        st = path.stat()
+        old = old_files.get(path.name)
+        if old is not None and old['size'] == st.st_size and old['mtime_ns'] == st.st_mtime_ns:
+            digest = old['sha256']
+        else:
+            digest = _file_digest(path)
+        files[path.name] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': digest}
+    return {'version': pharmpy.__version__, 'files': files}
+
+
+def _read_cached_modelfit_results(model_dir: Path):
+    # NOTE Returns None if there is no valid cache
+    cache_dir = model_dir / DIRECTORY_PHARMPY_METADATA
+    try:
+        with open(cache_dir / FILE_RESULTS_CACHE_KEY, 'r') as f:
+            old_key = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if old_key.get('version') != pharmpy.__version__:
+        return None
+
+    key = _results_cache_key(model_dir, old_key)
+    digests = {name: d['sha256'] for name, d in key['files'].items()}
+    old_digests = {name: d['sha256'] for name, d in old_key['files'].items()}
+    if digests != old_digests:
+        return None
+
+    try:
+        with open(cache_dir / FILE_RESULTS_CACHE, 'rb') as f:
+            res = pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return None
+
+    if key != old_key:
+        # NOTE Only mtimes changed
+        _atomic_write(cache_dir / FILE_RESULTS_CACHE_KEY, json.dumps(key).encode('utf-8'))
+    return res
+
+
+def _write_cached_modelfit_results(model_dir: Path, res):
+    cache_dir = model_dir / DIRECTORY_PHARMPY_METADATA
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    key = _results_cache_key(model_dir)
+    _atomic_write(cache_dir / FILE_RESULTS_CACHE, pickle.dumps(res, protocol=5))
+    # NOTE Write key last so that a valid key always refers to a complete cache
+    _atomic_write(cache_dir / FILE_RESULTS_CACHE_KEY, json.dumps(key).encode('utf-8'))
+
+
+def _atomic_write(path: Path, content: bytes):
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
 class LocalDirectoryDatabase(NonTransactionalModelDatabase):
     """ModelDatabase implementation for single local directory
 
@@ -132,13 +212,25 @@ class LocalModelDirectoryDatabase(TransactionalModelDatabase):
         Path to the base database directory. Will be created if it does not exist.
     file_extension : str
         File extension to use for model files.
+    cache_results : bool
+        Whether to cache parsed modelfit results in a binary file for each model. The cache is
+        invalidated when any of the files of the model change. Default is to use the
+        cache_results configuration option.
     """
 
-    def __init__(self, path: Union[str, Path] = '.', file_extension='.mod'):
+    def __init__(
+        self,
+        path: Union[str, Path] = '.',
+        file_extension='.mod',
+        cache_results: Optional[bool] = None,
+    ):
         path = Path(path)
         path.mkdir(parents=True, exist_ok=True)
         self.path = path_absolute(path)
         self.file_extension = file_extension
+        if cache_results is None:
+            cache_results = pharmpy.workflows.model_database.conf.cache_results
+        self.cache_results = cache_results
 
     def _read_lock(self):
         # NOTE Obtain shared (blocking) lock on the entire database
@@ -199,14 +291,15 @@ class LocalModelDirectoryDatabaseTransaction(ModelTransaction):
         self.model = model
 
     def store_model(self):
-        from pharmpy.modeling import read_dataset_from_datainfo, write_csv, write_model
+        from pharmpy.modeling import write_csv, write_model
 
         model = self.model.copy()
         model.update_datainfo()
         datasets_path = self.db.path / DIRECTORY_DATASETS
 
         # NOTE Get the hash of the dataset and list filenames with contents
-        # matching this hash only
+        # matching this hash only. The hash covers columns, index, dtypes and all
+        # values so datasets in the same bucket do not have to be read back and compared.
         h = hash_df_fs(model.dataset)
         h_dir = datasets_path / DIRECTORY_INDEX / h
         h_dir.mkdir(parents=True, exist_ok=True)
@@ -219,14 +312,17 @@ class LocalModelDirectoryDatabaseTransaction(ModelTransaction):
             curdi = DataInfo.read_json(dipath)
             # NOTE paths are not compared here
             if curdi == model.datainfo:
-                df = read_dataset_from_datainfo(curdi)
-                if df.equals(model.dataset):
-                    # NOTE Update datainfo path
-                    model.datainfo = model.datainfo.derive(path=curdi.path)
-                    break
+                # NOTE Update datainfo path
+                model.datainfo = model.datainfo.derive(path=curdi.path)
+                break
         else:
             model_filename = model.name + '.csv'
 
+            # NOTE A dataset stored earlier under the same name is overwritten so it must
+            # not be found by its old hash anymore
+            for stale_path in (datasets_path / DIRECTORY_INDEX).glob(f'*/{model_filename}'):
+                stale_path.unlink()
+
             # NOTE Create the index file at .datasets/.hash/<hash>/<model_filename>
             index_path = h_dir / model_filename
             index_path.touch()
@@ -300,7 +396,8 @@ class LocalModelDirectoryDatabaseSnapshot(ModelSnapshot):
             path = root / filename
             try:
                 # NOTE this will guess the model type
-                model = Model.create_model(path)
+                # NOTE results are parsed below
+                model = Model.create_model(path, parse_results=False)
                 break
             except FileNotFoundError as e:
                 errors.append(e)
@@ -311,7 +408,16 @@ class LocalModelDirectoryDatabaseSnapshot(ModelSnapshot):
                 f' Looked up {", ".join(map(lambda e: f"`{e.filename}`", errors))}.'
             )
 
+        if self.db.cache_results:
+            res = _read_cached_modelfit_results(root)
+            if res is not None:
+                model.modelfit_results = res
+                return model
+
         get_modelfit_results(model, path)
+
+        if self.db.cache_results and model.modelfit_results is not None:
+            _write_cached_modelfit_results(root, model.modelfit_results)
         return model
 
     def retrieve_modelfit_results(self):
@@ -1,13 +1,36 @@
-def optimize_task_graph_for_dask_distributed(client, graph):
+def run_in_directory(graph, path):
+    """Run the tasks of a dask graph with a working directory
+
+    The directory is set for the thread of each task with task_directory so that
+    tasks of different runs can share worker processes.
+    """
+    return {key: (_in_directory, str(path), *task) for key, task in graph.items()}
+
+
+def _in_directory(path, function, *args):
+    from pharmpy.internals.fs.cwd import task_directory
+
+    with task_directory(path):
+        return function(*args)
+
+
+def optimize_task_graph_for_dask_distributed(client, graph, registry=None):
+    """Scatter task arguments and fuse tasks of a dask graph
+
+    If a DatasetRegistry is given, the datasets of model arguments are
+    placed in it and the models are scattered with references to them.
+    """
     from dask.distributed import Future
 
-    optimized = {key: _scatter_computation(Future, client, value) for key, value in graph.items()}
+    optimized = {
+        key: _scatter_computation(Future, client, registry, value) for key, value in graph.items()
+    }
     from dask.optimization import fuse
 
     return fuse(optimized)[0]
 
 
-def _scatter_computation(Future, client, computation):
+def _scatter_computation(Future, client, registry, computation):
     # NOTE According to dask's graph spec (https://docs.dask.org/en/stable/spec.html):
     # A computation may be one of the following:
     #  - Any key present in the Dask graph like 'x'
@@ -18,19 +41,25 @@ def _scatter_computation(Future, client, computation):
     if isinstance(computation, tuple):
         return (
             computation[0],
-            *map(lambda c: _scatter_computation(Future, client, c), computation[1:]),
+            *map(lambda c: _scatter_computation(Future, client, registry, c), computation[1:]),
         )
 
     if isinstance(computation, list):
-        return list(map(lambda c: _scatter_computation(Future, client, c), computation))
+        return list(map(lambda c: _scatter_computation(Future, client, registry, c), computation))
 
-    return _scatter_value(Future, client, computation)
+    return _scatter_value(Future, client, registry, computation)
 
 
-def _scatter_value(Future, client, value):
+def _scatter_value(Future, client, registry, value):
     # TODO We could automatically compute whether object size is above
     # threshold with a slight twist on https://stackoverflow.com/a/30316760
     if isinstance(value, (int, str, float, bool, range, Future)) or callable(value):
         return value
-    else:
-        return client.scatter(value)
+
+    if registry is not None:
+        from pharmpy.model import Model
+
+        if isinstance(value, Model):
+            value = registry.detach(value)
+
+    return client.scatter(value)
@@ -13,6 +13,19 @@ class ToolDatabase(ABC):
     def __init__(self, toolname):
         self.toolname = toolname
 
+    @property
+    def dataset_registry(self):
+        """DatasetRegistry of the current workflow run or None
+
+        Set by dispatchers that share datasets between processes so that workflows
+        started from within the run use the same registry.
+        """
+        return self.__dict__.get('_dataset_registry')
+
+    @dataset_registry.setter
+    def dataset_registry(self, value):
+        self._dataset_registry = value
+
     @property
     def model_database(self):
         """ModelDatabase to store results of models run by tool"""
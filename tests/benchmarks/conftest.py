@@ -0,0 +1,89 @@
+import shutil
+
+import pytest
+
+from pharmpy.model import Model
+
+
+def _scaled_model_code(n_thetas, block_size, pk_lines):
+    # NOTE A pheno-like model with n_thetas THETAs, one OMEGA BLOCK(block_size) and a
+    # chain of pk_lines statements feeding into CL
+    assert n_thetas >= 2 and block_size >= 2
+    pk = [
+        'TVCL=THETA(1)*WGT',
+        'TVV=THETA(2)*WGT',
+        'IF(APGR.LT.5) TVV=TVV*(1+THETA(2)/100)',
+    ]
+    for i in range(3, n_thetas + 1):
+        pk.append(f'P{i}=THETA({i})*EXP(ETA({(i - 1) % block_size + 1}))')
+    previous = '0'
+    for i in range(pk_lines):
+        term = f'P{3 + i % (n_thetas - 2)}' if n_thetas > 2 else '1'
+        pk.append(f'Q{i}={previous}+{term}*TIME/(1+WGT)')
+        previous = f'Q{i}'
+    pk += [
+        f'CL=TVCL*EXP(ETA(1))*(1+{previous}/1000)',
+        'V=TVV*EXP(ETA(2))',
+        'S1=V',
+    ]
+
+    thetas = ['(0,0.00469307) ; CL', '(0,1.00916) ; V'] + [
+        f'(0,{0.01 * i}) ; T{i}' for i in range(3, n_thetas + 1)
+    ]
+    omega = []
+    for i in range(block_size):
+        omega.append(' '.join(['0.01'] * i + ['0.1']))
+
+    return '\n'.join(
+        [
+            '$PROBLEM scaled up PHENOBARB model',
+            '$INPUT ID TIME AMT WGT APGR DV FA1 FA2',
+            '$DATA pheno.dta IGNORE=@',
+            '$SUBROUTINE ADVAN1 TRANS2',
+            '$PK',
+            *pk,
+            '$ERROR',
+            'W=F',
+            'Y=F+W*EPS(1)',
+            'IPRED=F',
+            'IRES=DV-IPRED',
+            'IWRES=IRES/W',
+            '$THETA',
+            *thetas,
+            f'$OMEGA BLOCK({block_size})',
+            *omega,
+            '$SIGMA 0.013241',
+            '$ESTIMATION METHOD=1 INTERACTION',
+            '',
+        ]
+    )
+
+
+SCALES = {
+    'small': (10, 4, 20),
+    'medium': (50, 10, 100),
+    'large': (100, 20, 200),
+}
+
+
+@pytest.fixture(scope='session', params=list(SCALES.keys()))
+def scaled_model_path(request, tmp_path_factory, testdata):
+    path = tmp_path_factory.mktemp(f'scaled_{request.param}')
+    shutil.copy2(testdata / 'nonmem' / 'pheno.dta', path)
+    model_path = path / 'run1.mod'
+    model_path.write_text(_scaled_model_code(*SCALES[request.param]))
+    return model_path
+
+
+@pytest.fixture(scope='session')
+def parsed_model():
+    def _parse(path):
+        model = Model.create_model(path)
+        # NOTE Force parsing of everything that would otherwise be parsed lazily
+        model.statements
+        model.parameters
+        model.random_variables
+        model.estimation_steps
+        return model
+
+    return _parse
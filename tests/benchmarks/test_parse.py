@@ -0,0 +1,24 @@
+from pharmpy.model import Model
+from pharmpy.plugins.nonmem import parse_modelfit_results
+
+
+def test_read_model_pheno(benchmark, pheno_path, parsed_model):
+    benchmark(parsed_model, pheno_path)
+
+
+def test_read_model_scaled(benchmark, scaled_model_path, parsed_model):
+    benchmark(parsed_model, scaled_model_path)
+
+
+def test_read_dataset_pheno(benchmark, pheno_path):
+    model = Model.create_model(pheno_path)
+
+    def _read():
+        return model.copy().dataset
+
+    benchmark(_read)
+
+
+def test_parse_modelfit_results_pheno(benchmark, pheno_path, parsed_model):
+    model = parsed_model(pheno_path)
+    benchmark(parse_modelfit_results, model, pheno_path)
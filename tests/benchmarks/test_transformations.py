@@ -0,0 +1,53 @@
+from pharmpy.model import Statements
+from pharmpy.modeling import (
+    add_peripheral_compartment,
+    convert_model,
+    create_joint_distribution,
+    split_joint_distribution,
+)
+
+
+def _copies(model):
+    def _setup():
+        return (model.copy(),), {}
+
+    return _setup
+
+
+def test_convert_model_to_generic(benchmark, scaled_model_path, parsed_model):
+    model = parsed_model(scaled_model_path)
+    benchmark.pedantic(convert_model, setup=lambda: ((model.copy(), 'generic'), {}), rounds=5)
+
+
+def test_add_peripheral_compartment(benchmark, scaled_model_path, parsed_model):
+    model = parsed_model(scaled_model_path)
+    benchmark.pedantic(add_peripheral_compartment, setup=_copies(model), rounds=5)
+
+
+def test_split_and_create_joint_distribution(benchmark, scaled_model_path, parsed_model):
+    model = parsed_model(scaled_model_path)
+
+    def _split_and_join(model):
+        split_joint_distribution(model)
+        create_joint_distribution(model)
+
+    benchmark.pedantic(_split_and_join, setup=_copies(model), rounds=5)
+
+
+def test_full_expression(benchmark, scaled_model_path, parsed_model):
+    model = parsed_model(scaled_model_path)
+    statements = list(model.statements.before_odes)
+
+    def _setup():
+        # NOTE New statements each round so that the memoized expressions are not reused
+        return (Statements(statements),), {}
+
+    def _full_expression(statements):
+        return statements.full_expression('CL')
+
+    benchmark.pedantic(_full_expression, setup=_setup, rounds=5)
+
+
+def test_model_copy(benchmark, scaled_model_path, parsed_model):
+    model = parsed_model(scaled_model_path)
+    benchmark(model.copy)
@@ -0,0 +1,51 @@
+from pharmpy.modeling import (
+    add_peripheral_compartment,
+    set_initial_estimates,
+    write_model,
+)
+
+
+def test_update_source_unchanged(benchmark, scaled_model_path, parsed_model):
+    model = parsed_model(scaled_model_path)
+
+    def _model_code(model):
+        return model.model_code
+
+    benchmark.pedantic(_model_code, setup=lambda: ((model.copy(),), {}), rounds=5)
+
+
+def test_update_source_changed_parameters(benchmark, scaled_model_path, parsed_model):
+    model = parsed_model(scaled_model_path)
+
+    def _setup():
+        m = model.copy()
+        set_initial_estimates(m, {p.name: p.init * 1.1 for p in m.parameters})
+        return (m,), {}
+
+    def _model_code(model):
+        return model.model_code
+
+    benchmark.pedantic(_model_code, setup=_setup, rounds=5)
+
+
+def test_update_source_changed_odes(benchmark, scaled_model_path, parsed_model):
+    model = parsed_model(scaled_model_path)
+
+    def _setup():
+        m = model.copy()
+        add_peripheral_compartment(m)
+        return (m,), {}
+
+    def _model_code(model):
+        return model.model_code
+
+    benchmark.pedantic(_model_code, setup=_setup, rounds=5)
+
+
+def test_write_model(benchmark, tmp_path, scaled_model_path, parsed_model):
+    model = parsed_model(scaled_model_path)
+    benchmark.pedantic(
+        write_model,
+        setup=lambda: ((model.copy(),), {'path': tmp_path / 'out.mod', 'force': True}),
+        rounds=5,
+    )
@@ -0,0 +1,24 @@
+import os
+import threading
+from pathlib import Path
+
+from pharmpy.internals.fs.cwd import task_directory, working_directory
+
+
+def test_task_directory(tmp_path):
+    cwd = os.getcwd()
+    assert working_directory() == Path(cwd)
+    with task_directory(tmp_path / 'a'):
+        assert working_directory() == tmp_path / 'a'
+        with task_directory(tmp_path / 'b'):
+            assert working_directory() == tmp_path / 'b'
+        assert working_directory() == tmp_path / 'a'
+
+        # NOTE Other threads and the process are not affected
+        other = []
+        thread = threading.Thread(target=lambda: other.append(working_directory()))
+        thread.start()
+        thread.join()
+        assert other == [Path(cwd)]
+        assert os.getcwd() == cwd
+    assert working_directory() == Path(cwd)
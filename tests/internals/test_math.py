@@ -124,6 +124,14 @@ def test_nearest_posdef():
             B = nearest_postive_semidefinite(A)
             assert is_positive_semidefinite(B)
 
+    A = np.random.randn(10, 4, 4)
+    A[0] = np.eye(4)
+    B = nearest_postive_semidefinite(A)
+    assert is_positive_semidefinite(B).all()
+    assert np.array_equal(B[0], np.eye(4))
+    for i in range(10):
+        assert np.array_equal(B[i], nearest_postive_semidefinite(A[i]))
+
 
 def test_conditional_joint_normal():
     sigma = [
@@ -169,3 +177,32 @@ def test_conditional_joint_normal_lambda():
 
     assert (mu_1 == mu_2).all()
     assert (sigma_1 == sigma_2).all()
+
+
+def test_conditional_joint_normal_stacked():
+    sigma = np.array(
+        [
+            [0.0419613930249351, 0.0194493895550238, 0.0943578658777171],
+            [0.0194493895550238, 0.0296333601234358, 0.0353748349332184],
+            [0.0943578658777171, 0.0353748349332184, 0.887220758887173],
+        ]
+    )
+    sigmas = np.stack((sigma, 2 * sigma, 0.5 * sigma))
+    mu = np.array([0, 0, 1.52542372881356])
+    a = np.array([0.7])
+
+    mu_bars, sigma_bars = conditional_joint_normal(mu, sigmas, a)
+    assert mu_bars.shape == (3, 2)
+    assert sigma_bars.shape == (3, 2, 2)
+    for i in range(3):
+        mu_bar, sigma_bar = conditional_joint_normal(mu, sigmas[i], a)
+        assert (mu_bars[i] == mu_bar).all()
+        assert (sigma_bars[i] == sigma_bar).all()
+
+    rows = np.array([[0.7], [1.2], [np.nan]])
+    mu_bars, _ = conditional_joint_normal_lambda(mu, sigmas, 2)(rows)
+    assert mu_bars.shape == (3, 3, 2)
+    for i, j in np.ndindex(3, 2):
+        mu_bar, _ = conditional_joint_normal(mu, sigmas[i], rows[j])
+        assert (mu_bars[i, j] == mu_bar).all()
+    assert np.isnan(mu_bars[:, 2]).all()
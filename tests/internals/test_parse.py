@@ -130,3 +130,24 @@ def test_tree_create_abuse():
         └─ _LEAF_ " (nope, here!)"
     """
     assert_create(out, 'root', inp)
+
+
+def test_load_grammar_cache(tmp_path):
+    from pharmpy.internals.parse import GenericParser
+    from pharmpy.internals.parse.grammar import load_grammar
+    from pharmpy.plugins.nonmem.records.parsers import grammar_root
+
+    path = grammar_root / 'theta_record.lark'
+    options = {**GenericParser.lark_options, 'propagate_positions': True}
+    code = '$THETA (0,0.00469307) ; CL\n'
+
+    parser = load_grammar(path, options, cache_dir=tmp_path)
+    (cache_file,) = tmp_path.iterdir()
+    cached = load_grammar(path, options, cache_dir=tmp_path)
+    assert list(tmp_path.iterdir()) == [cache_file]
+    assert cached.parse(code) == parser.parse(code)
+
+    cache_file.write_bytes(b'broken')
+    rebuilt = load_grammar(path, options, cache_dir=tmp_path)
+    assert rebuilt.parse(code) == parser.parse(code)
+    assert cache_file.read_bytes() != b'broken'
@@ -0,0 +1,40 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from pharmpy.config import ConfigurationContext
+from pharmpy.internals import pool
+from pharmpy.workflows.dispatchers import conf
+
+
+def test_run_in_pool_configuration():
+    try:
+        with ConfigurationContext(conf, pool_workers=2):
+            assert pool.run_in_pool(pool.pool_size) == 2
+        with ConfigurationContext(conf, pool_workers=3):
+            # NOTE The options of the caller are used also in an already started worker
+            assert pool.run_in_pool(pool.pool_size) == 3
+            assert pool.run_in_pool(os.getpid) != os.getpid()
+    finally:
+        pool.shutdown()
+
+
+def test_run_in_pool_disabled():
+    assert pool.pool_size() == 0
+    assert pool.run_in_pool(os.getpid) == os.getpid()
+
+
+def test_run_in_pool_broken(monkeypatch):
+    def submit(*args):
+        raise BrokenProcessPool('cannot start')
+
+    monkeypatch.setattr(pool.ProcessPoolExecutor, 'submit', submit)
+    monkeypatch.setattr(pool, '_broken', False)
+    try:
+        with ConfigurationContext(conf, pool_workers=2):
+            with pytest.warns(UserWarning, match='cannot start'):
+                assert pool.run_in_pool(os.getpid) == os.getpid()
+            assert pool._get_pool() is None
+    finally:
+        pool.shutdown()
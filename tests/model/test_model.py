@@ -57,3 +57,28 @@ def test_model_equality():
     assert pheno1 != pheno_linear2
     assert pheno2 != pheno_linear1
     assert pheno2 != pheno_linear2
+
+
+def test_copy(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+    df = model.dataset
+    state = dict(model.__dict__)
+    model_copy = model.copy()
+    assert model.__dict__ == state
+
+    assert model_copy == model
+    assert model_copy.parent_model == model.name
+    assert model_copy.statements is model.statements
+    assert model_copy.parameters is model.parameters
+    assert model_copy.internals.control_stream is not model.internals.control_stream
+
+    assert model_copy.dataset is not df
+    assert model_copy.dataset.equals(df)
+    model_copy.dataset['WGT'] = 0.0
+    model_copy.dataset.loc[0, 'DV'] = 99.0
+    assert model.dataset is df
+    assert df.loc[0, 'WGT'] == 1.4
+    assert df.loc[0, 'DV'] == 0.0
+
+    model.dataset.loc[0, 'WGT'] = 2.0
+    assert model_copy.dataset.loc[0, 'WGT'] == 0.0
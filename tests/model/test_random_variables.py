@@ -1,5 +1,6 @@
 import pickle
 
+import pandas as pd
 import pytest
 import sympy
 from sympy import Symbol as symbol
@@ -333,6 +334,11 @@ def test_nearest_valid_parameters():
     new = rvs.nearest_valid_parameters(values)
     assert new == {'x': 1.0500000000000005, 'y': 1.0500000000000003, 'z': 1.050000000000001}
 
+    df = pd.DataFrame([{'x': 1, 'y': 0.1, 'z': 2}, values])
+    new = rvs.nearest_valid_parameters(df)
+    assert list(new.iloc[0]) == [1, 0.1, 2]
+    assert list(new.iloc[1]) == [1.0500000000000005, 1.0500000000000003, 1.050000000000001]
+
     dist2 = NormalDistribution.create('ETA(3)', 'iiv', 2, 1)
     rvs = RandomVariables.create([dist2])
     values = {symbol('ETA(3)'): 5}
@@ -357,6 +363,13 @@ def test_validate_parameters():
     with pytest.raises(TypeError):
         rvs.validate_parameters({})
 
+    df = pd.DataFrame([params, params2], index=[3, 5])
+    valid = rvs.validate_parameters(df)
+    assert list(valid) == [True, False]
+    assert list(valid.index) == [3, 5]
+    with pytest.raises(TypeError):
+        rvs.validate_parameters(df[['a', 'b']])
+
 
 def test_sample():
     dist = JointNormalDistribution.create(
@@ -241,6 +241,20 @@ def test_full_expression(load_model_for_test, pheno_path):
     with pytest.raises(ValueError):
         model.statements.full_expression("Y")
 
+    stats = Statements(
+        [
+            Assignment(S('X'), S('A') + 1),
+            Assignment(S('K'), S('CL') / S('V')),
+            Assignment(S('S1'), S('V')),
+            Assignment(S('V'), S('X') * 2),
+            Assignment(S('Y'), S('K') * S('S1')),
+        ]
+    )
+    assert stats.full_expression('Y') == S('CL')
+    assert stats.full_expression('V') == 2 * S('A') + 2
+    assert stats.full_expression(S('Y')) is stats.full_expression('Y')
+    assert Statements(stats).full_expression('Y') == S('CL')
+
 
 def test_to_explicit_ode_system(load_model_for_test, pheno_path):
     model = load_model_for_test(pheno_path)
@@ -296,6 +310,24 @@ def test_direct_dependencies(load_model_for_test, pheno_path):
     assert deps[1].symbol.name == "V"
 
 
+def test_dependency_graph():
+    s1 = Assignment(S('X'), S('THETA(1)'))
+    s2 = Assignment(S('X'), S('X') + 1)
+    s3 = Assignment(S('Y'), S('X') * S('Z'))
+    s4 = Assignment(S('Z'), S('Y'))
+    s5 = Assignment(S('W'), S('THETA(2)'))
+    stats = Statements([s1, s2, s3, s4, s5])
+    graph = stats._create_dependency_graph()
+    assert set(graph.edges) == {(1, 0), (2, 0), (2, 1), (3, 2)}
+    assert 4 not in graph
+    assert stats._create_dependency_graph() is graph
+    assert Statements(stats)._create_dependency_graph() is graph
+    assert stats.find_assignment_index('X') == 1
+    assert stats.find_assignment('Y') == s3
+    assert stats.find_assignment('Q') is None
+    assert stats.dependencies('Z') == {S('THETA(1)'), S('Z')}
+
+
 def test_dependencies(load_model_for_test, pheno_path):
     model = load_model_for_test(pheno_path)
     depsy = model.statements.dependencies(S('Y'))
@@ -2,6 +2,7 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from pharmpy.model import ColumnInfo, DataInfo, Model
 from pharmpy.modeling import (
     add_time_after_dose,
     check_dataset,
@@ -310,6 +311,46 @@ def test_expand_additional_doses(load_model_for_test, testdata):
     assert not df.loc[4, 'EXPANDED']
 
 
+def test_dosing_events_with_reset_and_additional_doses():
+    df = pd.DataFrame(
+        {
+            'ID': [1, 1, 1, 1, 1, 2, 2, 2, 2, 2],
+            'TIME': [0.0, 0.0, 6.0, 12.0, 12.0, 0.0, 2.0, 0.0, 0.0, 3.0],
+            'AMT': [10.0, 0.0, 0.0, 10.0, 0.0, 5.0, 0.0, 5.0, 0.0, 0.0],
+            'ADDL': [1.0, 0.0, 0.0, 0.0, 0.0, 2.0, 0.0, 0.0, 0.0, 0.0],
+            'II': [12.0, 0.0, 0.0, 0.0, 0.0, 1.5, 0.0, 0.0, 0.0, 0.0],
+            'EVID': [1.0, 0.0, 0.0, 1.0, 0.0, 1.0, 0.0, 4.0, 0.0, 0.0],
+            'DV': [0.0, 1.0, 2.0, 0.0, 3.0, 0.0, 4.0, 0.0, 5.0, 6.0],
+        }
+    )
+    types = ['id', 'idv', 'dose', 'additional', 'ii', 'event', 'dv']
+    di = DataInfo([ColumnInfo(col, type=t) for col, t in zip(df.columns, types)])
+    model = Model(name='events', dataset=df, datainfo=di)
+
+    assert list(get_doseid(model)) == [1, 1, 1, 2, 1, 1, 1, 2, 1, 2]
+
+    expanded = expand_additional_doses(model.copy(), flag=True).dataset
+    assert list(expanded['TIME']) == [0, 0, 6, 12, 12, 12, 0, 1.5, 2, 3, 0, 0, 3]
+    assert list(expanded['EXPANDED']) == [
+        False,
+        False,
+        False,
+        True,
+        False,
+        False,
+        False,
+        True,
+        False,
+        True,
+        False,
+        False,
+        False,
+    ]
+
+    tad = add_time_after_dose(model.copy()).dataset['TAD']
+    assert list(tad.iloc[0:7]) == [0.0, 0.0, 6.0, 0.0, 0.0, 0.0, 0.5]
+
+
 def test_deidentify_data():
     np.random.seed(23)
 
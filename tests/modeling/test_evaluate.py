@@ -1,16 +1,23 @@
 from io import StringIO
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from pharmpy.modeling import (
+    add_lag_time,
+    create_model_evaluator,
+    evaluate_amounts,
     evaluate_epsilon_gradient,
     evaluate_eta_gradient,
     evaluate_expression,
     evaluate_individual_prediction,
     evaluate_population_prediction,
     evaluate_weighted_residuals,
+    set_first_order_absorption,
+    set_michaelis_menten_elimination,
+    set_zero_order_absorption,
 )
 from pharmpy.plugins.nonmem.dataset import read_nonmem_dataset
 
@@ -63,6 +70,154 @@ def test_evaluate_individual_prediction(load_model_for_test, testdata):
     pd.testing.assert_series_equal(lincorrect['CIPREDI'], pred, rtol=1e-4, check_names=False)
 
 
+def test_evaluate_prediction_ode(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+    res = model.modelfit_results
+    pe = dict(res.parameter_estimates)
+
+    pred = evaluate_population_prediction(model, parameters=pe)
+    np.testing.assert_allclose(pred, res.predictions['PRED'], rtol=1e-4)
+
+    ipred = evaluate_individual_prediction(model, parameters=pe, etas=res.individual_estimates)
+    np.testing.assert_allclose(ipred, res.predictions['IPRED'], rtol=1e-4)
+
+
+def _amounts_dataset():
+    return pd.DataFrame(
+        {
+            'ID': [1, 1, 1, 1, 1, 2, 2, 2],
+            'TIME': [0.0, 0.5, 1.0, 2.0, 5.0, 0.0, 3.0, 8.0],
+            'AMT': [100.0, 0.0, 0.0, 0.0, 0.0, 50.0, 0.0, 0.0],
+            'WGT': [1.4] * 5 + [2.0] * 3,
+            'APGR': 7.0,
+            'DV': [0.0, 1.0, 1.0, 1.0, 1.0, 0.0, 1.0, 1.0],
+            'FA1': 0.0,
+            'FA2': 0.0,
+        }
+    )
+
+
+def test_evaluate_amounts(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+    df = _amounts_dataset()
+    dose = np.where(df['ID'] == 1, 100.0, 50.0)
+    t = df['TIME'].to_numpy()
+    inits = model.parameters.inits
+    k = inits['THETA(1)'] / inits['THETA(2)']
+
+    amounts = evaluate_amounts(model, dataset=df)
+    assert list(amounts.columns) == ['A_CENTRAL', 'A_OUTPUT']
+    np.testing.assert_allclose(amounts['A_CENTRAL'], dose * np.exp(-k * t))
+    np.testing.assert_allclose(amounts.sum(axis=1), dose)
+
+    set_first_order_absorption(model)
+    add_lag_time(model)
+    inits = model.parameters.inits
+    ka = 1 / inits['POP_MAT']
+    tad = np.maximum(t - inits['POP_MDT'], 0)
+    amounts = evaluate_amounts(model, dataset=df)
+    expected = dose * ka / (ka - k) * (np.exp(-k * tad) - np.exp(-ka * tad))
+    np.testing.assert_allclose(amounts['A_CENTRAL'], expected, atol=1e-10)
+
+
+def test_evaluate_amounts_infusion(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+    set_zero_order_absorption(model)
+    df = _amounts_dataset()
+    dose = np.where(df['ID'] == 1, 100.0, 50.0)
+    t = df['TIME'].to_numpy()
+    inits = model.parameters.inits
+    k = inits['THETA(1)'] / inits['THETA(2)']
+    duration = 2 * inits['POP_MAT']
+
+    amounts = evaluate_amounts(model, dataset=df)
+    end = dose / duration / k * (1 - np.exp(-k * np.minimum(t, duration)))
+    expected = end * np.exp(-k * np.maximum(t - duration, 0))
+    np.testing.assert_allclose(amounts['A_CENTRAL'], expected, atol=1e-10)
+
+    # NOTE Doses with a rate of 0 are boluses
+    df['RATE'] = np.where(df['ID'] == 1, -2.0, 0.0)
+    model.dataset = df
+    model.datainfo = model.datainfo.set_column(model.datainfo['RATE'].derive(type='rate'))
+    amounts = evaluate_amounts(model)
+    expected = np.where(df['ID'] == 1, expected, dose * np.exp(-k * t))
+    np.testing.assert_allclose(amounts['A_CENTRAL'], expected, atol=1e-10)
+
+
+def test_evaluate_amounts_nonlinear(load_model_for_test, testdata):
+    from scipy.integrate import solve_ivp
+
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+    set_michaelis_menten_elimination(model)
+    df = _amounts_dataset()
+    inits = model.parameters.inits
+    km = inits['POP_KM']
+
+    amounts = evaluate_amounts(model, dataset=df)
+    for id, dose, wgt in ((1, 100.0, 1.4), (2, 50.0, 2.0)):
+        clmm, v = inits['THETA(1)'] * wgt, inits['THETA(2)'] * wgt
+        t = df.loc[df['ID'] == id, 'TIME'].to_numpy()
+        sol = solve_ivp(
+            lambda _, a: -clmm * km / (v * (km + a / v)) * a,
+            (0, t[-1]),
+            [dose],
+            t_eval=t,
+            rtol=1e-12,
+            atol=1e-12,
+        )
+        np.testing.assert_allclose(amounts.loc[df['ID'] == id, 'A_CENTRAL'], sol.y[0], rtol=1e-6)
+
+
+def test_evaluate_amounts_events(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+    model.dataset = pd.DataFrame(
+        {
+            'ID': 1,
+            'TIME': [0.0, 10.0, 12.0, 24.0, 30.0],
+            'AMT': [10.0, 0.0, 10.0, 10.0, 0.0],
+            'WGT': 1.4,
+            'APGR': 7.0,
+            'DV': [0.0, 1.0, 0.0, 0.0, 1.0],
+        }
+    )
+    expected = evaluate_amounts(model)
+
+    model.dataset = pd.DataFrame(
+        {
+            'ID': 1,
+            'TIME': [0.0, 10.0, 30.0],
+            'AMT': [10.0, 0.0, 0.0],
+            'WGT': 1.4,
+            'APGR': 7.0,
+            'DV': [0.0, 1.0, 1.0],
+            'ADDL': [2, 0, 0],
+            'II': [12.0, 0.0, 0.0],
+        }
+    )
+    model.datainfo = model.datainfo.set_types(
+        ['id', 'idv', 'dose', 'covariate', 'covariate', 'dv', 'additional', 'ii']
+    )
+    amounts = evaluate_amounts(model)
+    np.testing.assert_allclose(amounts, expected.iloc[[0, 1, 4]])
+
+    model.dataset = pd.DataFrame(
+        {
+            'ID': 1,
+            'TIME': [0.0, 10.0, 20.0, 30.0],
+            'AMT': [10.0, 0.0, 5.0, 0.0],
+            'WGT': 1.4,
+            'APGR': 7.0,
+            'DV': [0.0, 1.0, 0.0, 1.0],
+            'EVID': [1, 0, 4, 0],
+        }
+    )
+    model.datainfo = model.datainfo.set_types(
+        ['id', 'idv', 'dose', 'covariate', 'covariate', 'dv', 'event']
+    )
+    amounts = evaluate_amounts(model)
+    np.testing.assert_allclose(amounts.iloc[2:], expected.iloc[:2] / 2)
+
+
 def test_evaluate_eta_gradient(load_model_for_test, testdata):
     path = testdata / 'nonmem' / 'minimal.mod'
     model = load_model_for_test(path)
@@ -99,3 +254,39 @@ def test_evaluate_weighted_residuals(load_model_for_test, testdata):
         linmod, parameters=dict(linmod.modelfit_results.parameter_estimates)
     )
     pd.testing.assert_series_equal(lincorrect['WRES'], wres, rtol=1e-4, check_names=False)
+
+
+def test_create_model_evaluator(load_model_for_test, testdata):
+    linpath = testdata / 'nonmem' / 'pheno_real_linbase.mod'
+    linmod = load_model_for_test(linpath)
+    evaluator = create_model_evaluator(linmod)
+
+    pred = evaluator.population_prediction()
+    pd.testing.assert_series_equal(lincorrect['PRED'], pred, rtol=1e-4, check_names=False)
+
+    etas = linmod.modelfit_results.individual_estimates
+    ipred = evaluator.individual_prediction(etas=etas)
+    pd.testing.assert_series_equal(
+        evaluate_individual_prediction(linmod, etas=etas), ipred, check_names=False
+    )
+
+    pd.testing.assert_frame_equal(
+        evaluate_eta_gradient(linmod, etas=etas), evaluator.eta_gradient(etas=etas)
+    )
+    pd.testing.assert_frame_equal(
+        evaluate_epsilon_gradient(linmod, etas=etas), evaluator.epsilon_gradient(etas=etas)
+    )
+
+    pe = linmod.modelfit_results.parameter_estimates
+    params = pd.DataFrame([pe, pe * 1.1, pe * 0.9])
+    preds = evaluator.population_prediction(params)
+    assert preds.shape == (3, 155)
+    for i, (_, row) in enumerate(params.iterrows()):
+        expected = evaluate_population_prediction(linmod, parameters=dict(row))
+        np.testing.assert_allclose(preds[i], expected.to_numpy())
+
+    grads = evaluator.eta_gradient(params.to_numpy(), etas=etas)
+    assert grads.shape == (3, 155, 2)
+
+    with pytest.raises(ValueError):
+        evaluator.population_prediction(np.zeros((2, 1)))
@@ -109,3 +109,14 @@ def test_resampler_anonymization(testdata):
         df_oldid.reset_index(inplace=True, drop=True)
         df_newid['ID'] = old_id
         pandas.testing.assert_frame_equal(df_newid, df_oldid)
+
+
+def test_create_resampled_dataset(df):
+    groups, order, offsets = iters.group_row_positions(df, 'ID')
+    assert list(groups) == list(df['ID'].unique())
+    new_df = iters.create_resampled_dataset(df, 'ID', order, offsets, [2, 0, 2])
+    assert list(new_df['ID'].unique()) == [1, 2, 3]
+    assert list(new_df.index) == list(range(len(new_df)))
+    third = df[df['ID'] == groups[2]].drop(columns='ID').reset_index(drop=True)
+    first = new_df[new_df['ID'] == 1].drop(columns='ID').reset_index(drop=True)
+    pd.testing.assert_frame_equal(first, third)
@@ -2724,6 +2724,28 @@ def test_update_inits(load_model_for_test, testdata, etas_file, force, file_exis
         assert (os.path.isfile('run1_input.phi')) is file_exists
 
 
+def test_update_inits_etas_by_name(load_model_for_test, testdata, tmp_path):
+    shutil.copy(testdata / 'nonmem/pheno.mod', tmp_path / 'run1.mod')
+    shutil.copy(testdata / 'nonmem/pheno.phi', tmp_path / 'run1.phi')
+    shutil.copy(testdata / 'nonmem/pheno.ext', tmp_path / 'run1.ext')
+    shutil.copy(testdata / 'nonmem/pheno.dta', tmp_path / 'pheno.dta')
+
+    with chdir(tmp_path):
+        model = load_model_for_test('run1.mod')
+        ie = model.modelfit_results.individual_estimates
+        remove_iiv(model, ['CL'])
+        add_iiv(model, 'S1', 'exp')
+        update_initial_individual_estimates(model, ie)
+        model.update_source()
+        model.update_source()
+
+        assert '$ETAS FILE=run1_input.phi' in model.model_code
+        phi = pd.read_csv('run1_input.phi', skiprows=1, delim_whitespace=True)
+        assert list(phi.columns) == ['SUBJECT_NO', 'ID', 'ETA(1)', 'ETA(2)']
+        assert list(phi['ETA(1)']) == pytest.approx(list(ie['ETA(2)']), rel=1e-5)
+        assert (phi['ETA(2)'] == 0).all()
+
+
 def test_update_inits_move_est(load_model_for_test, pheno_path):
     model = load_model_for_test(pheno_path)
     res = model.modelfit_results
@@ -2,6 +2,7 @@ import numpy as np
 import pandas as pd
 import pytest
 
+import pharmpy.modeling.parameter_sampling as parameter_sampling
 from pharmpy.modeling import (
     create_rng,
     load_example_model,
@@ -81,3 +82,14 @@ def test_sample_individual_estimates(load_model_for_test, testdata):
     assert len(restricted) == 59
     assert restricted.columns == ['ETA(2)']
     assert pytest.approx(restricted.iloc[0]['ETA(2)'], 1e-5) == 0.06399039578129821
+
+
+def test_sample_individual_estimates_in_chunks(load_model_for_test, testdata, monkeypatch):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+    ie = model.modelfit_results.individual_estimates
+    iec = model.modelfit_results.individual_estimates_covariance
+    samples = sample_individual_estimates(model, ie, iec, samples_per_id=25, rng=23)
+    monkeypatch.setattr(parameter_sampling, '_SAMPLE_CHUNK_SIZE', 10)
+    chunked = sample_individual_estimates(model, ie, iec, samples_per_id=25, rng=23)
+    pd.testing.assert_frame_equal(samples, chunked)
+    assert list(chunked.index[:2]) == [(1, 0), (1, 1)]
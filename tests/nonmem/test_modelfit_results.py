@@ -214,6 +214,38 @@ def test_predictions(testdata, load_model_for_test):
     assert df['PRED'][1.0, 0.0] == 18.143
 
 
+def test_derivatives(tmp_path, testdata, load_model_for_test):
+    path = testdata / 'nonmem' / 'linearize' / 'linearize_dir1' / 'scm_dir1'
+    for suffix in ['.mod', '.ext', '.lst', '.phi']:
+        shutil.copy2(path / f'derivatives{suffix}', tmp_path)
+    shutil.copy2(testdata / 'nonmem' / 'qa' / 'pheno_linbase.dta', tmp_path)
+    model = load_model_for_test(tmp_path / 'derivatives.mod')
+    res = model.modelfit_results
+    df = res.derivatives
+    assert len(df) == 744
+    assert list(df.columns) == ['EPS(1)', 'ETA(1)', 'ETA(2)', 'EPS(1);ETA(1)', 'EPS(1);ETA(2)']
+    assert df['ETA(2)'][1, 2.0] == pytest.approx(-17.271220)
+    assert df['EPS(1);ETA(1)'][1, 2.0] == pytest.approx(-0.133745)
+    assert res.predictions['CIPREDI'][1, 2.0] == pytest.approx(17.404965)
+
+
+def test_derivatives_of_missing_random_variables():
+    from pharmpy.plugins.nonmem.results import _parse_derivatives
+
+    df = pd.DataFrame(
+        {
+            'ID': [1],
+            'TIME': [0.0],
+            'G011': [1.0],
+            'G031': [2.0],
+            'H021': [3.0],
+            'D_EPSETA1_3': [4.0],
+        }
+    )
+    derivatives = _parse_derivatives(df, ['ETA(1)', 'ETA(2)'], ['EPS(1)'])
+    assert list(derivatives.columns) == ['ETA(1)']
+
+
 def test_runtime_total(testdata, load_model_for_test):
     model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
     runtime = model.modelfit_results.runtime_total
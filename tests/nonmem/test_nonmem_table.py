@@ -2,7 +2,13 @@ import pandas as pd
 import pytest
 
 from pharmpy.internals.fs.cwd import chdir
-from pharmpy.plugins.nonmem.table import CovTable, ExtTable, NONMEMTableFile, PhiTable
+from pharmpy.plugins.nonmem.table import (
+    CovTable,
+    ExtTable,
+    NONMEMTableFile,
+    PhiTable,
+    iterate_tables,
+)
 
 
 def test_nonmem_table(pheno_ext):
@@ -107,3 +113,43 @@ def test_nonmemtablefile_notitle_github_issues_1251(tmp_path):
 
         assert tuple(df.columns) == ('ID', 'TIME', 'CWRES', 'CIPREDI', 'VC')
         assert len(df) == 2
+
+
+def test_iterate_tables(tmp_path):
+    header = ' ID          TIME        DV          PRED\n'
+    content = ''
+    for sub in range(1, 4):
+        content += f'TABLE NO.  1\n{header}'
+        for i in range(5):
+            content += f'  {i + 1:.4E}  {sub:.4E}  {2.0 * i:.4E}  {3.0 * sub:.4E}\n'
+            if i == 2:
+                content += header
+    path = tmp_path / 'simtab'
+    path.write_text(content)
+
+    tables = list(iterate_tables(path))
+    assert len(tables) == 3
+    assert [table.subproblem for table in tables] == [1, 2, 3]
+    for table, correct in zip(tables, NONMEMTableFile(path)):
+        pd.testing.assert_frame_equal(table.data_frame, correct.data_frame)
+
+    tables = list(iterate_tables(path, columns=['ID', 'DV', 'XYZ'], subproblems=[2]))
+    assert len(tables) == 1
+    assert tables[0].subproblem == 2
+    assert tuple(tables[0].data_frame.columns) == ('ID', 'DV')
+    assert list(tables[0].data_frame['ID']) == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    chunks = list(iterate_tables(path, subproblems=[1, 3], chunksize=2))
+    assert [len(chunk.data_frame) for chunk in chunks] == [2, 2, 1, 2, 2, 1]
+    assert [chunk.subproblem for chunk in chunks] == [1, 1, 1, 3, 3, 3]
+    assert list(chunks[5].data_frame['PRED']) == [9.0]
+
+
+def test_iterate_tables_metadata(pheno_ext):
+    tables = list(iterate_tables(pheno_ext))
+    assert len(tables) == 1
+    table = tables[0]
+    assert table.number == 1
+    assert table.subproblem == 0
+    assert table.method == 'First Order Conditional Estimation with Interaction'
+    pd.testing.assert_frame_equal(table.data_frame, NONMEMTableFile(pheno_ext)[0]._df)
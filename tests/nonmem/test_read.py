@@ -104,6 +104,22 @@ def test_read_small_nonmem_datasets():
     assert list(df.iloc[0]) == [1, 2, 9]
 
 
+def test_read_nonmem_dataset_fast_and_fallback_parsing():
+    abc = ['A', 'B', 'C']
+    df = read_nonmem_dataset(StringIO("1,2,3\n4,1d1,-99\n7,.,1-1"), colnames=abc)
+    assert list(df['A']) == [1, 4, 7]
+    assert list(df['B']) == [2.0, 10.0, 0.0]
+    assert list(df['C'][:1]) == [3.0]
+    assert pd.isna(df['C'][1])
+    assert df['C'][2] == 0.1
+    # Lines with different number of items
+    df = read_nonmem_dataset(StringIO("1 2 3\n4 5\n 6,7,8 "), colnames=abc)
+    assert list(df.iloc[1]) == [4, 5, 0]
+    assert list(df.iloc[2]) == [6, 7, 8]
+    with pytest.raises(DatasetError):
+        read_nonmem_dataset(StringIO("1,2,3\n4,5,x"), colnames=abc)
+
+
 def test_nonmem_dataset_with_nonunique_ids():
     colnames = ['ID', 'DV']
     with pytest.warns(DatasetWarning):
@@ -2,6 +2,7 @@ import pandas as pd
 
 from pharmpy.results import ModelfitResults, read_results
 from pharmpy.tools.bootstrap.results import calculate_results
+from pharmpy.tools.bootstrap.tool import create_workflow, resample_model
 
 
 def test_bootstrap():
@@ -41,3 +42,37 @@ def test_bootstrap():
 
 def test_read_results(testdata):
     read_results(testdata / 'results/bootstrap_results.json')
+
+
+def test_create_workflow(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+    wf = create_workflow(model, resamples=3)
+    resample_tasks = [task for task in wf.tasks if task.name == 'resample']
+    assert len(resample_tasks) == 3
+
+    model, order, offsets, sample, name = resample_tasks[1].task_input
+    assert name == 'bs_2'
+    assert sorted(sample) == list(range(59))
+
+    resampled = resample_model(model, order, offsets, sample, name)
+    assert resampled.name == 'bs_2'
+    df = resampled.dataset
+    assert len(df) == len(model.dataset)
+    assert list(df['ID'].unique()) == list(range(1, 60))
+    ids = model.dataset['ID'].unique()
+    for new_id, group in zip(range(1, 60), sample):
+        original = model.dataset[model.dataset['ID'] == ids[group]]
+        new = df[df['ID'] == new_id]
+        assert list(new['TIME']) == list(original['TIME'])
+
+
+def test_create_workflow_seed(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+
+    def samples(rng):
+        wf = create_workflow(model, resamples=3, rng=rng)
+        return [task.task_input[3] for task in wf.tasks if task.name == 'resample']
+
+    first = samples(1234)
+    assert all((a == b).all() for a, b in zip(first, samples(1234)))
+    assert not all((a == b).all() for a, b in zip(first, samples(4321)))
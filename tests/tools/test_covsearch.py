@@ -1,7 +1,12 @@
+from dataclasses import replace
+
 import pytest
 
+import pharmpy.workflows.dispatchers
+from pharmpy.config import ConfigurationContext
+from pharmpy.internals.fs.cwd import chdir
 from pharmpy.tools.covsearch.tool import create_workflow, validate_input
-from pharmpy.workflows import Workflow
+from pharmpy.workflows import Workflow, execute_workflow
 
 MINIMAL_INVALID_MFL_STRING = ''
 MINIMAL_VALID_MFL_STRING = 'LET(x, 0)'
@@ -17,6 +22,89 @@ def test_create_workflow_with_model(load_model_for_test, testdata):
     assert isinstance(create_workflow(MINIMAL_VALID_MFL_STRING, model=model), Workflow)
 
 
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_speculative_scheduling(load_model_for_test, testdata, tmp_path, monkeypatch):
+    from dask.distributed import rejoin, secede, wait
+
+    from pharmpy.tools.covsearch import tool as covsearch_tool
+    from pharmpy.tools.modelfit import tool
+
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno.mod')
+    results = model.modelfit_results
+    drops = {'POP_CLWGT': 12.0, 'POP_CLAPGR': 2.0, 'POP_VWGT': 8.0, 'POP_VAPGR': 5.0}
+    executed = []
+    speculative = []
+
+    def execute_model(model, context):
+        executed.append(model.name)
+        drop = sum(drops.get(name, 0.0) for name in model.parameters.names)
+        model.modelfit_results = replace(results, name=model.name, ofv=results.ofv - drop)
+        return model
+
+    submit_workflow = covsearch_tool.submit_workflow
+
+    def record_speculative(wf, unique_name, db, priority=0):
+        future = submit_workflow(wf, unique_name, db, priority=priority)
+        if 'speculative' in unique_name:
+            speculative.append(future)
+        return future
+
+    def as_completed(futures):
+        # NOTE Candidates with a larger drop in OFV complete first and the speculative
+        # fits started from the first candidate finish before the others complete
+        futures = list(futures)
+        speculative.clear()
+        secede()
+        try:
+            wait(futures)
+            ordered = sorted(futures, key=lambda future: future.result()[0].modelfit_results.ofv)
+            for i, future in enumerate(ordered):
+                if i > 0:
+                    wait(speculative)
+                yield future
+        finally:
+            rejoin()
+
+    monkeypatch.setattr(tool, 'get_execute_model', lambda _: execute_model)
+    monkeypatch.setattr(covsearch_tool, 'submit_workflow', record_speculative)
+    monkeypatch.setattr(covsearch_tool, 'as_completed', as_completed)
+    effects = [
+        ('CL', 'WGT', 'exp', '*'),
+        ('CL', 'APGR', 'exp', '*'),
+        ('V', 'WGT', 'exp', '*'),
+        ('V', 'APGR', 'exp', '*'),
+    ]
+
+    steps = {}
+    for scheduling in ('barrier', 'speculative'):
+        executed.clear()
+        path = tmp_path / scheduling
+        path.mkdir()
+        with ConfigurationContext(
+            pharmpy.workflows.dispatchers.conf, dask_dispatcher='distributed'
+        ), chdir(path):
+            wf = create_workflow(effects, model=model, scheduling=scheduling)
+            steps[scheduling] = execute_workflow(wf).steps
+
+    assert steps['speculative'].equals(steps['barrier'])
+    assert any(name.startswith('covsearch_speculative') for name in executed)
+    # NOTE Candidates of the second step reuse the speculative fits
+    assert 'covsearch_run5' not in executed
+
+
+def test_speculative_scheduling_in_worker_process(tmp_path, monkeypatch):
+    from pharmpy.tools.covsearch import tool as covsearch_tool
+    from pharmpy.tools.modelfit import conf
+
+    assert covsearch_tool._check_scheduling('speculative') == 'speculative'
+    monkeypatch.setattr(covsearch_tool, '_in_worker_process', lambda: True)
+    with pytest.warns(UserWarning, match='Falling back to barrier'):
+        assert covsearch_tool._check_scheduling('speculative') == 'barrier'
+    with ConfigurationContext(conf, fit_cache=True, fit_cache_path=str(tmp_path)):
+        assert covsearch_tool._check_scheduling('speculative') == 'speculative'
+    assert covsearch_tool._check_scheduling('barrier') == 'barrier'
+
+
 def test_validate_input():
     validate_input(MINIMAL_VALID_MFL_STRING)
 
@@ -137,6 +225,12 @@ def test_validate_input_with_model(load_model_for_test, testdata, model_path):
             TypeError,
             'Invalid `model`',
         ),
+        (
+            None,
+            dict(scheduling='eager'),
+            ValueError,
+            'Invalid `scheduling`',
+        ),
     ],
 )
 def test_validate_input_raises(
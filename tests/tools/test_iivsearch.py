@@ -1,3 +1,7 @@
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
 import pytest
 
 from pharmpy.modeling import (
@@ -5,10 +9,13 @@ from pharmpy.modeling import (
     add_peripheral_compartment,
     add_pk_iiv,
     create_joint_distribution,
+    fix_parameters,
 )
 from pharmpy.tools.iivsearch.algorithms import (
+    _block_structure_key,
     _create_param_dict,
     _is_rv_block_structure,
+    _rank_block_structures,
     _rv_block_structures,
     brute_force_block_structure,
     brute_force_no_of_etas,
@@ -53,6 +60,57 @@ def test_brute_force_block_structure(
     assert len(fit_tasks) == no_of_models
 
 
+def test_brute_force_block_structure_reduced(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'models' / 'mox2.mod')
+    add_peripheral_compartment(model)
+    add_iiv(model, ['QP1'], 'add')
+
+    def no_of_models(*args):
+        wf = brute_force_block_structure(model, 0, *args)
+        return len([task.name for task in wf.tasks if task.name.startswith('run')])
+
+    assert no_of_models([['ETA(1)', 'ETA(2)']]) == 2
+    assert no_of_models([['ETA(3)'], ['ETA_QP1']]) == 1
+    assert no_of_models([['ETA_QP1']]) == 4
+    assert no_of_models(None, 3) == 3
+
+    block_structures_so_far = {_block_structure_key((('ETA(1)', 'ETA(2)', 'ETA(3)', 'ETA_QP1'),))}
+    assert no_of_models(None, None, block_structures_so_far) == 13
+    assert len(block_structures_so_far) == 14
+
+    fix_parameters(model, ['IIV_QP1'])
+    assert no_of_models() == 4
+
+
+def test_rank_block_structures(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'models' / 'mox2.mod')
+    add_peripheral_compartment(model)
+
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=(100, 3))
+    x[:, 1] += 2 * x[:, 0]
+    ie = pd.DataFrame(x, columns=['ETA(1)', 'ETA(2)', 'ETA(3)'])
+    model.modelfit_results = replace(model.modelfit_results, individual_estimates=ie)
+
+    block_structures = list(_rv_block_structures(model.random_variables.iiv))
+    ranked = _rank_block_structures(model, block_structures)
+    assert ranked[0] == (('ETA(3)',), ('ETA(1)', 'ETA(2)'))
+    assert ranked[1] == (('ETA(1)', 'ETA(2)', 'ETA(3)'),)
+
+
+def test_rv_block_structures_kept(load_model_for_test, pheno_path):
+    model = load_model_for_test(pheno_path)
+    add_iiv(model, ['TVCL', 'TVV'], 'exp')
+
+    kept = [('ETA(1)', 'ETA(2)')]
+    block_structures = list(_rv_block_structures(model.random_variables.iiv, kept))
+
+    assert block_structures == [
+        (('ETA(1)', 'ETA(2)'), ('ETA_TVCL', 'ETA_TVV')),
+        (('ETA_TVCL',), ('ETA_TVV',), ('ETA(1)', 'ETA(2)')),
+    ]
+
+
 def test_rv_block_structures_4_etas(load_model_for_test, pheno_path):
     model = load_model_for_test(pheno_path)
     add_iiv(model, ['TVCL', 'TVV'], 'exp')
@@ -184,6 +242,20 @@ def test_validate_input_with_model(load_model_for_test, testdata):
         (None, dict(iiv_strategy=['no_add']), TypeError, 'Invalid `iiv_strategy`'),
         (None, dict(iiv_strategy='diagonal'), ValueError, 'Invalid `iiv_strategy`'),
         (None, dict(cutoff='1'), TypeError, 'Invalid `cutoff`'),
+        (None, dict(max_block_candidates=0), ValueError, 'Invalid `max_block_candidates`'),
+        (None, dict(keep_blocks='ETA(1)'), TypeError, 'Invalid `keep_blocks`'),
+        (
+            None,
+            dict(keep_blocks=[['ETA(1)', 'ETA(2)'], ['ETA(2)']]),
+            ValueError,
+            'Invalid `keep_blocks`',
+        ),
+        (
+            ('nonmem', 'pheno.mod'),
+            dict(keep_blocks=[['ETA(1)', 'ETA(3)']]),
+            ValueError,
+            'Invalid `keep_blocks`',
+        ),
         (
             None,
             dict(model=1),
@@ -1,10 +1,17 @@
+import shutil
+from dataclasses import replace
 from io import StringIO
 
 import pandas as pd
 import pytest
 
+from pharmpy.tools.linearize.estimation import estimate
 from pharmpy.tools.linearize.results import calculate_results, psn_linearize_results
-from pharmpy.tools.linearize.tool import create_linearized_model
+from pharmpy.tools.linearize.tool import (
+    _create_dataset,
+    create_linearized_model,
+    start_linearize,
+)
 from pharmpy.tools.psn_helpers import create_results
 
 
@@ -109,4 +116,42 @@ def test_create_linearized_model(load_model_for_test, testdata):
     path = testdata / 'nonmem' / 'pheno_real.mod'
     model = load_model_for_test(path)
     linbase = create_linearized_model(model)
-    assert len(linbase.statements) == 8
+    assert len(linbase.statements) == 9
+    assert linbase.statements[-1].symbol == model.dependent_variable
+    assert linbase.parameters.names == ['OMEGA(1,1)', 'OMEGA(2,2)', 'SIGMA(1,1)']
+
+
+def test_estimate(load_model_for_test, testdata):
+    lin = load_model_for_test(testdata / 'nonmem' / 'qa' / 'pheno_linbase.mod')
+    res = estimate(lin)
+    assert res.minimization_successful
+    assert res.ofv_iterations.iloc[0] == pytest.approx(730.894727, abs=1e-5)
+    assert res.ofv == pytest.approx(730.847272, abs=1e-4)
+    pd.testing.assert_series_equal(
+        res.parameter_estimates, lin.modelfit_results.parameter_estimates, rtol=1e-3
+    )
+    pd.testing.assert_series_equal(
+        res.individual_ofv, lin.modelfit_results.individual_ofv, atol=1e-2, check_names=False
+    )
+
+
+def test_start_linearize(load_model_for_test, tmp_path, testdata):
+    path = testdata / 'nonmem' / 'linearize' / 'linearize_dir1' / 'scm_dir1'
+    run_path = tmp_path / 'linearize_dir1' / 'scm_dir1'
+    run_path.mkdir(parents=True)
+    for suffix in ['.mod', '.ext', '.lst', '.phi']:
+        shutil.copy2(path / f'derivatives{suffix}', run_path)
+    shutil.copy2(testdata / 'nonmem' / 'qa' / 'pheno_linbase.dta', run_path)
+    shutil.copy2(testdata / 'nonmem' / 'pheno.dta', tmp_path)
+    model = load_model_for_test(run_path / 'derivatives.mod')
+    res = start_linearize(model)
+    assert res.ofv['ofv']['base'] == pytest.approx(730.894727)
+    assert res.ofv['ofv']['lin_evaluated'] == pytest.approx(730.894727, abs=1e-3)
+    assert res.ofv['ofv']['lin_estimated'] == pytest.approx(730.847272, abs=1e-3)
+    assert len(res.iofv) == 59
+    assert res.iofv['delta'].abs().max() < 0.2
+
+    mfr = model.modelfit_results
+    model.modelfit_results = replace(mfr, derivatives=mfr.derivatives.iloc[1:])
+    with pytest.raises(ValueError, match='do not match the dataset'):
+        _create_dataset(model)
@@ -1,3 +1,5 @@
+import pandas as pd
+
 from pharmpy.tools.modelfit.results import calculate_results
 
 
@@ -13,3 +15,127 @@ def test_aggregate(load_model_for_test, testdata):
     assert len(pe) == 2
     assert list(pe.index) == ['pheno', 'pheno']
     assert list(pe.columns) == ['THETA(1)', 'THETA(2)', 'OMEGA(1,1)', 'OMEGA(2,2)', 'SIGMA(1,1)']
+
+
+def test_fit_cache(load_model_for_test, create_model_for_test, testdata, tmp_path):
+    from pharmpy.modeling import set_name, update_initial_individual_estimates
+    from pharmpy.tools.modelfit.cache import FitCache, fit_cache_key
+
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+    key = fit_cache_key(model, 'nonmem')
+
+    other = model.copy()
+    set_name(other, 'other')
+    other.description = 'Another description'
+    assert fit_cache_key(other, 'nonmem') == key
+    numbered = model.copy()
+    set_name(numbered, 'run5')
+    assert fit_cache_key(numbered, 'nonmem') == key
+
+    changed = model.copy()
+    changed.parameters = changed.parameters.set_initial_estimates({'THETA(1)': 0.1})
+    assert fit_cache_key(changed, 'nonmem') != key
+
+    ie = model.modelfit_results.individual_estimates
+    warm = model.copy()
+    update_initial_individual_estimates(warm, ie)
+    warm_numbered = numbered.copy()
+    update_initial_individual_estimates(warm_numbered, ie)
+    assert fit_cache_key(warm, 'nonmem') == fit_cache_key(warm_numbered, 'nonmem') != key
+
+    # NOTE The contents of a model specification file are unknown
+    code = model.model_code
+    msfi = create_model_for_test(code.replace('$ESTIMATION', '$MSFI run1.msf\n$ESTIMATION'))
+    assert fit_cache_key(msfi, 'nonmem') is None
+
+    cache = FitCache(tmp_path / 'cache', 10)
+    assert cache.retrieve(key, other) is None
+    cache.store(key, model.modelfit_results)
+    res = cache.retrieve(key, other)
+    assert res.name == 'other'
+    assert res.ofv == model.modelfit_results.ofv
+
+    cache.size = 0
+    cache.evict()
+    assert cache.retrieve(key, other) is None
+
+
+def test_fit_deduplication(load_model_for_test, testdata, monkeypatch):
+    import threading
+    import time
+    from dataclasses import replace
+
+    from pharmpy.modeling import set_name
+    from pharmpy.tools.modelfit import tool
+    from pharmpy.workflows import NullToolDatabase
+
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+    results = model.modelfit_results
+    executed = []
+
+    def execute_model(model, context):
+        executed.append(model.name)
+        time.sleep(0.5)
+        model.modelfit_results = replace(results, name=model.name)
+        return model
+
+    monkeypatch.setattr(tool, 'get_execute_model', lambda _: execute_model)
+    task = tool.retrieve_from_database_or_execute_model_with_tool('nonmem', deduplicate=True)
+    context = NullToolDatabase('modelfit')
+
+    models = []
+    for i in range(1, 4):
+        candidate = model.copy()
+        set_name(candidate, f'run{i}')
+        candidate.modelfit_results = None
+        models.append(candidate)
+    changed = models[2]
+    changed.parameters = changed.parameters.set_initial_estimates({'THETA(1)': 0.1})
+
+    threads = [threading.Thread(target=task, args=(context, m)) for m in models]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(executed) == 2
+    assert 'run3' in executed
+    for m in models:
+        assert m.modelfit_results.name == m.name
+        assert m.modelfit_results.ofv == results.ofv
+
+    later = models[0].copy()
+    set_name(later, 'run4')
+    later.modelfit_results = None
+    task(context, later)
+    assert len(executed) == 2
+    assert later.modelfit_results.name == 'run4'
+
+    task(NullToolDatabase('modelfit'), later)
+    assert len(executed) == 3
+
+    def fit_cache_key(model, tool):
+        raise AssertionError('Key should not be computed')
+
+    # NOTE Without fit cache and deduplication every model is fitted and no key is computed
+    monkeypatch.setattr(tool, 'fit_cache_key', fit_cache_key)
+    task = tool.retrieve_from_database_or_execute_model_with_tool('nonmem')
+    task(context, later)
+    task(context, later)
+    assert len(executed) == 5
+
+
+def test_warm_start_etas(load_model_for_test, testdata):
+    from pharmpy.config import ConfigurationContext
+    from pharmpy.tools.common import update_initial_estimates
+    from pharmpy.tools.modelfit import conf
+
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+    ie = model.modelfit_results.individual_estimates
+
+    update_initial_estimates(model)
+    assert model.initial_individual_estimates is None
+
+    with ConfigurationContext(conf, warm_start_etas=True):
+        update_initial_estimates(model)
+    pd.testing.assert_frame_equal(model.initial_individual_estimates, ie)
@@ -360,3 +360,57 @@ def test_validate_input_raises(
 
     with pytest.raises(exception, match=match):
         validate_input(**kwargs)
+
+
+def test_create_candidate(load_model_for_test, testdata):
+    from pharmpy.internals import pool
+    from pharmpy.tools.modelsearch.algorithms import _build_candidate, _create_candidate
+
+    model = load_model_for_test(testdata / 'nonmem' / 'models' / 'mox2.mod')
+    features = (('ABSORPTION', 'ZO'), ('PERIPHERALS', 1))
+    transformations = [set_zero_order_absorption, add_peripheral_compartment]
+    try:
+        candidate = _create_candidate(
+            'modelsearch_run1', features, False, transformations, 'add_diagonal', model
+        )
+    finally:
+        pool.shutdown()
+
+    expected = _build_candidate(
+        'modelsearch_run1', features, False, transformations, 'add_diagonal', model
+    )
+    assert candidate.name == 'modelsearch_run1'
+    assert candidate.description == 'ABSORPTION(ZO);PERIPHERALS(1)'
+    assert candidate == expected
+    assert candidate.model_code == expected.model_code
+
+
+def test_create_candidate_warm_start(load_model_for_test, testdata):
+    from dataclasses import replace
+
+    import pandas as pd
+
+    from pharmpy.config import ConfigurationContext
+    from pharmpy.internals import pool
+    from pharmpy.modeling import remove_iiv
+    from pharmpy.tools.modelfit import conf
+    from pharmpy.tools.modelsearch.algorithms import _create_candidate
+
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+    ie = model.modelfit_results.individual_estimates
+    # NOTE Results of a parent with named etas for a model with etas named by number
+    renamed = ie.rename(columns={'ETA(1)': 'ETA_CL', 'ETA(2)': 'ETA_V'})
+    model.modelfit_results = replace(model.modelfit_results, individual_estimates=renamed)
+    features = (('IIV', 'CL'),)
+    transformations = [functools.partial(remove_iiv, to_remove=['ETA(1)'])]
+    try:
+        with ConfigurationContext(conf, warm_start_etas=True):
+            candidate = _create_candidate(
+                'modelsearch_run1', features, True, transformations, 'no_add', model
+            )
+    finally:
+        pool.shutdown()
+
+    assert candidate.random_variables.etas.names == ['ETA(2)']
+    pd.testing.assert_series_equal(candidate.initial_individual_estimates['ETA(2)'], ie['ETA(2)'])
+    assert '$ETAS FILE=modelsearch_run1_input.phi' in candidate.model_code
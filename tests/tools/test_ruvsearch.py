@@ -1,10 +1,20 @@
 from dataclasses import replace
 
+import numpy as np
 import pytest
+from scipy.stats import multivariate_normal
 
 from pharmpy.modeling import remove_covariance_step
+from pharmpy.tools.ruvsearch.estimation import estimate
 from pharmpy.tools.ruvsearch.results import psn_resmod_results
-from pharmpy.tools.ruvsearch.tool import create_workflow, validate_input
+from pharmpy.tools.ruvsearch.tool import (
+    _create_base_model,
+    _create_combined_model,
+    _create_iiv_on_ruv_model,
+    create_iteration_workflow,
+    create_workflow,
+    validate_input,
+)
 from pharmpy.workflows import Workflow
 
 
@@ -48,6 +58,58 @@ def test_create_workflow_with_model(load_model_for_test, testdata):
     assert isinstance(create_workflow(model=model), Workflow)
 
 
+def test_create_workflow_with_builtin_estimator(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'ruvsearch' / 'mox3.mod')
+    remove_covariance_step(model)
+    assert isinstance(create_workflow(model=model, cwres_estimator='builtin'), Workflow)
+
+    wf = create_iteration_workflow(model, 4, 3.84, [], 1, cwres_estimator='builtin')
+    run_tasks = [task for task in wf.tasks if task.name.startswith('run')]
+    assert len(run_tasks) == 7
+    assert all(task.function.__name__ == '_estimate_cwres_model' for task in run_tasks)
+
+
+def _exact_ofv(df, theta, omega, sigma):
+    ofv = 0
+    for _, df_id in df.groupby('ID'):
+        n = len(df_id)
+        dist = multivariate_normal(np.full(n, theta), omega + sigma * np.eye(n))
+        ofv += -2 * dist.logpdf(df_id['DV']) - n * np.log(2 * np.pi)
+    return ofv
+
+
+def test_estimate_base_model(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'ruvsearch' / 'mox3.mod')
+    base_model = _create_base_model(model, 1)
+    res = estimate(base_model)
+    assert res.minimization_successful
+    assert list(res.parameter_estimates.index) == ['theta', 'omega', 'sigma']
+    assert len(res.individual_estimates) == base_model.dataset['ID'].nunique()
+
+    # NOTE The model is linear in the etas so the OFV is the exact -2LL
+    estimates = res.parameter_estimates.to_numpy()
+    ofv = _exact_ofv(base_model.dataset, *estimates)
+    assert res.ofv == pytest.approx(ofv, abs=1e-6)
+    for i in range(3):
+        for h in (-1e-3, 1e-3):
+            values = estimates.copy()
+            values[i] += h
+            assert _exact_ofv(base_model.dataset, *values) > ofv
+
+
+def test_estimate_candidate_models(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'ruvsearch' / 'mox3.mod')
+    base_model = _create_base_model(model, 1)
+    base_ofv = estimate(base_model).ofv
+
+    iiv_on_ruv = estimate(_create_iiv_on_ruv_model(base_model, 1))
+    assert iiv_on_ruv.parameter_estimates['IIV_RUV1'] > 0
+    assert iiv_on_ruv.ofv < base_ofv
+
+    combined = estimate(_create_combined_model(base_model, 1))
+    assert combined.ofv <= base_ofv + 1e-6
+
+
 def test_validate_input():
     validate_input()
 
@@ -115,6 +177,12 @@ def test_validate_input_with_model(load_model_for_test, testdata):
             TypeError,
             'Invalid `model`',
         ),
+        (
+            None,
+            dict(cwres_estimator='nonmem'),
+            ValueError,
+            'Invalid `cwres_estimator`',
+        ),
     ],
 )
 def test_validate_input_raises(
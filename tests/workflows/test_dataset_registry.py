@@ -0,0 +1,82 @@
+import pickle
+import subprocess
+import sys
+
+import pandas as pd
+
+from pharmpy.workflows import NullToolDatabase, Task, Workflow, call_workflow, local_dask_pool
+from pharmpy.workflows.dataset_registry import DatasetReference, DatasetRegistry
+
+
+def test_register(tmp_path, load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+    df = model.dataset
+    df2 = df.assign(CAT=pd.Categorical(df['ID'] % 2), TEXT='a')
+
+    with DatasetRegistry(tmp_path) as registry:
+        ref = registry.register(df)
+        assert registry.register(df.copy()) is ref
+        ref2 = registry.register(df2)
+        assert ref2 is not ref
+
+        pd.testing.assert_frame_equal(ref.load(), df)
+        pd.testing.assert_frame_equal(ref2.load(), df2)
+        assert (ref2.path / f'{len(df.columns)}.pickle').is_file()
+        assert not (ref2.path / f'{len(df.columns)}.npy').exists()
+        assert ref() is not df
+        pd.testing.assert_frame_equal(ref(), df)
+
+        detached = registry.detach(model)
+        assert isinstance(detached.__dict__['_dataset'], DatasetReference)
+        assert len(pickle.dumps(detached.__dict__['_dataset'])) < 1000
+        unpickled = pickle.loads(pickle.dumps(detached))
+        pd.testing.assert_frame_equal(unpickled.dataset, df)
+        pd.testing.assert_frame_equal(detached.dataset, df)
+        path = registry.path
+        rebound = pickle.loads(pickle.dumps(ref))
+
+        # NOTE As if in another process of the same run
+        remote = pickle.loads(pickle.dumps(registry))
+        df3 = df.assign(WGT=df['WGT'] * 2)
+        ref3 = remote.register(df3)
+        assert ref3.path.parent == path
+        remote.close()
+        assert path.exists()
+        pd.testing.assert_frame_equal(pickle.loads(pickle.dumps(ref3)).load(), df3)
+
+    assert not path.exists()
+    pd.testing.assert_frame_equal(rebound(), df)
+
+
+def test_remove_stale_registries(tmp_path):
+    process = subprocess.run(
+        [sys.executable, '-c', 'import os; print(os.getpid())'], stdout=subprocess.PIPE
+    )
+    stale = tmp_path / f'pharmpy-datasets-{int(process.stdout)}-abc'
+    stale.mkdir()
+    with DatasetRegistry(tmp_path) as registry:
+        assert not stale.exists()
+        assert registry.path.exists()
+
+
+def _dataset_length(model):
+    return len(model.dataset)
+
+
+def _nested_dataset_length(context, model):
+    assert context.dataset_registry is not None
+    wf = Workflow([Task('results', _dataset_length, model)])
+    return call_workflow(wf, 'nested', context)
+
+
+def test_local_dask_pool_dataset(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+    context = NullToolDatabase('test')
+    try:
+        wf = Workflow([Task('results', _dataset_length, model)])
+        assert local_dask_pool.run(wf) == len(model.dataset)
+        wf = Workflow([Task('results', _nested_dataset_length, context, model)])
+        assert local_dask_pool.run(wf) == len(model.dataset)
+        assert context.dataset_registry is None
+    finally:
+        local_dask_pool.shutdown()
@@ -1,7 +1,37 @@
-from pharmpy.workflows import Task, Workflow, local_dask
+import os
+from pathlib import Path
+
+from pharmpy.internals.fs.cwd import working_directory
+from pharmpy.workflows import Task, Workflow, local_dask, local_dask_pool
 
 
 def test_local_dispatcher():
     wf = Workflow([Task('results', lambda x: x, 'input')])
     res = local_dask.run(wf)
     assert res == 'input'
+
+
+def test_local_dask_pool_dispatcher():
+    try:
+        wf = Workflow([Task('results', lambda x: x, 'input')])
+        res = local_dask_pool.run(wf)
+        assert res == 'input'
+
+        client = local_dask_pool._get_client()
+        assert len(client.scheduler_info()['workers']) == local_dask_pool.available_cores()
+
+        wf = Workflow([Task('results', lambda: os.getpid())])
+        pid = local_dask_pool.run(wf)
+        assert pid != os.getpid()
+        assert local_dask_pool._get_client() is client
+
+        cwd = client.run(os.getcwd)
+        wf = Workflow([Task('results', lambda: (working_directory(), os.getcwd()))])
+        path, worker_cwd = local_dask_pool.run(wf)
+        assert path != Path.cwd()
+        assert not path.exists()
+        # NOTE The working directory of the worker processes is not changed
+        assert worker_cwd in cwd.values()
+        assert client.run(os.getcwd) == cwd
+    finally:
+        local_dask_pool.shutdown()
@@ -4,6 +4,7 @@ import os.path
 import shutil
 from pathlib import Path
 
+import pandas as pd
 import pytest
 
 from pharmpy.internals.fs.cwd import chdir
@@ -96,3 +97,76 @@ def test_store_model(tmp_path, load_model_for_test, testdata):
             assert line == "$PROBLEM PHENOBARB SIMPLE MODEL\n"
             line = fh.readline()
             assert line == f'$DATA ..{sep}.datasets{sep}run2.csv IGNORE=@\n'
+
+
+def test_store_model_dataset(tmp_path, load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+    db = LocalModelDirectoryDatabase(tmp_path / 'database')
+    datasets = tmp_path / 'database' / '.datasets'
+
+    db.store_model(model)
+    stat = (datasets / 'pheno_real.csv').stat()
+
+    # NOTE A model with an identical dataset reuses the stored file
+    db.store_model(copy_model(model, name='run1'))
+    assert not (datasets / 'run1.csv').exists()
+    assert (datasets / 'pheno_real.csv').stat().st_mtime_ns == stat.st_mtime_ns
+    assert db.retrieve_model('run1').datainfo.path.name == 'pheno_real.csv'
+
+    # NOTE A changed dataset under the same name is rewritten
+    changed = model.copy()
+    df = changed.dataset.copy()
+    df['WGT'] = 1.0
+    changed.dataset = df
+    db.store_model(changed)
+    stored = pd.read_csv(datasets / 'pheno_real.csv')
+    assert (stored['WGT'] == 1.0).all()
+
+    # NOTE The original dataset is not found under the overwritten file anymore
+    db.store_model(copy_model(model, name='run2'))
+    stored = pd.read_csv(datasets / 'run2.csv')
+    assert stored['WGT'].equals(model.dataset['WGT'].reset_index(drop=True))
+
+
+def test_cache_results(tmp_path, testdata, monkeypatch):
+    import pharmpy.workflows.model_database.local_directory as local_directory
+
+    source = testdata / 'results' / 'tool_databases' / 'modelsearch' / 'models'
+    shutil.copytree(source, tmp_path / 'models')
+    name = 'modelsearch_run1'
+    metadata_path = tmp_path / 'models' / name / '.pharmpy'
+
+    db = LocalModelDirectoryDatabase(tmp_path / 'models')
+    assert not db.cache_results
+    res = db.retrieve_modelfit_results(name)
+    assert not (metadata_path / 'results.pickle').exists()
+
+    db = LocalModelDirectoryDatabase(tmp_path / 'models', cache_results=True)
+    assert db.retrieve_modelfit_results(name).ofv == res.ofv
+    assert (metadata_path / 'results.pickle').is_file()
+
+    calls = []
+    parse = local_directory.get_modelfit_results
+    monkeypatch.setattr(
+        local_directory,
+        'get_modelfit_results',
+        lambda model, path: calls.append(path) or parse(model, path),
+    )
+
+    cached = db.retrieve_modelfit_results(name)
+    assert calls == []
+    assert cached.ofv == res.ofv
+    pd.testing.assert_series_equal(cached.parameter_estimates, res.parameter_estimates)
+    pd.testing.assert_frame_equal(cached.residuals, res.residuals)
+
+    # NOTE Touching a file without changing contents keeps the cache
+    ext_path = tmp_path / 'models' / name / f'{name}.ext'
+    os.utime(ext_path, ns=(0, 0))
+    db.retrieve_modelfit_results(name)
+    assert calls == []
+
+    ext_path.write_text(ext_path.read_text().replace('-1000000000', '-1000000002'))
+    db.retrieve_modelfit_results(name)
+    assert len(calls) == 1
+    db.retrieve_modelfit_results(name)
+    assert len(calls) == 1